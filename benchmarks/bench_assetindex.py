@@ -0,0 +1,101 @@
+"""Memory and time to load an asset index and feed its objects to the downloader: json dicts vs AssetIndex.
+
+Writes a synthetic N-object index, then in a fresh child process per mode
+loads it and walks every download job the way a sync does:
+
+  json     json.load, then a list of asset_jobs (what the launchers held)
+  compact  AssetIndex.load, then its JobFeed, one job at a time
+  hashes   AssetIndex.load without names (what the delta planner keeps)
+
+Reports the Python heap still held once the jobs were walked (``retained``)
+and at its peak (tracemalloc), and the process's VmHWM (Linux only).
+
+Usage: python benchmarks/bench_assetindex.py [--objects 5000]
+"""
+
+import argparse
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ctlauncher.assetindex import AssetIndex  # noqa: E402
+from ctlauncher.assetsync import asset_jobs  # noqa: E402
+
+MODES = ("json", "compact", "hashes")
+
+
+def write_index(path, count, seed=0):
+    rng = random.Random(seed)
+    objects = {f"minecraft/sounds/synthetic/{i // 100:02d}/{i:05d}.ogg":
+               {"hash": rng.randbytes(20).hex(), "size": rng.randint(512, 64 * 1024)} for i in range(count)}
+    with open(path, "w") as f:
+        json.dump({"objects": objects}, f)
+
+
+def vm_hwm_mb():
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return round(int(line.split()[1]) / 1024, 1)
+    except OSError:
+        pass
+    return None
+
+
+def load(mode, path, objects_dir):
+    """Load ``path`` and walk its jobs; returns what a sync would keep referencing."""
+    if mode == "json":
+        with open(path) as f:
+            objects = json.load(f)["objects"]
+        jobs = list(asset_jobs(objects, objects_dir))
+        for job in jobs:
+            pass
+        return objects, jobs
+    index = AssetIndex.load(path, keep_names=mode == "compact")
+    for job in index.jobs(objects_dir):
+        pass
+    return index
+
+
+def child(mode, path):
+    tracemalloc.start()
+    start = time.perf_counter()
+    held = load(mode, path, os.path.join(tempfile.gettempdir(), "objects"))
+    seconds = time.perf_counter() - start
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del held
+    print(json.dumps({"retained_kb": retained // 1024, "peak_kb": peak // 1024, "seconds": round(seconds, 4),
+                      "vm_hwm_mb": vm_hwm_mb()}))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--objects", type=int, default=5000)
+    parser.add_argument("--child", choices=MODES, help=argparse.SUPPRESS)
+    parser.add_argument("--index", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child:
+        child(args.child, args.index)
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "index.json")
+        write_index(path, args.objects)
+        for mode in MODES:
+            output = subprocess.run([sys.executable, os.path.abspath(__file__), "--child", mode, "--index", path],
+                                    stdout=subprocess.PIPE, check=True, text=True).stdout
+            print(json.dumps(dict({"mode": mode, "objects": args.objects,
+                                   "index_kb": os.path.getsize(path) // 1024}, **json.loads(output))))
+
+
+if __name__ == "__main__":
+    main()
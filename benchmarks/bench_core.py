@@ -0,0 +1,72 @@
+"""Install and launch-preparation times through LauncherCore, the path every front end now shares.
+
+Serves a synthetic version from the loopback CDN and times a cold sync, a warm
+(nothing to do) sync, verify, the first and cached launch plan, and rendering
+the final command.
+
+Usage: python benchmarks/bench_core.py [--objects 3000] [--libraries 80]
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ctlauncher.core import LauncherCore  # noqa: E402
+from localcdn import LocalCDN, add_version  # noqa: E402
+
+
+def timed(name, func, *args, **kwargs):
+    start = time.perf_counter()
+    extra = func(*args, **kwargs) or {}
+    return dict({"step": name, "seconds": round(time.perf_counter() - start, 4)}, **extra)
+
+
+def sync(core, version_id):
+    result = core.sync(version_id)
+    assert result.ok, result.failed
+    return {"downloaded": result.downloaded, "skipped": result.skipped, "bytes": result.bytes}
+
+
+def verify(core, version_id):
+    checked, problems = core.verify(version_id)
+    assert not problems, problems
+    return {"checked": checked}
+
+
+def plan(core, version_id):
+    return {"jvm_args": len(core.launch_plan(version_id)["jvm_args"])}
+
+
+def command(core, version_id):
+    return {"argv": len(core.command(version_id, "Player", 4, "java"))}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--objects", type=int, default=3000)
+    parser.add_argument("--libraries", type=int, default=80)
+    args = parser.parse_args()
+
+    with LocalCDN(tls=False) as cdn, tempfile.TemporaryDirectory() as root:
+        manifest_url = add_version(cdn, "1.21", args.objects, args.libraries)
+        core = LauncherCore(root, manifest_url=manifest_url, assets_url=cdn.base_url)
+        version_id = core.resolve("latest")
+        results = [
+            timed("sync, cold", sync, core, version_id),
+            timed("sync, warm", sync, core, version_id),
+            timed("verify", verify, core, version_id),
+            timed("launch plan, build", plan, core, version_id),
+            timed("launch plan, cached", plan, core, version_id),
+            timed("command", command, core, version_id),
+        ]
+    for result in results:
+        print(json.dumps(result))
+
+
+if __name__ == "__main__":
+    main()
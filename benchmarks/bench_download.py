@@ -0,0 +1,207 @@
+"""Cold-install throughput of every download path against the shaped loopback CDN, as JSON lines.
+
+Serves a synthetic manifest, version JSON, library tree and N-object asset
+index from :class:`localcdn.LocalCDN` with the given latency, bandwidth, error
+and truncation rates, then runs each backend into an empty root in a fresh
+child process (so peak RSS is its own):
+
+  core      LauncherCore.sync, which every front end's download_version_files /
+            download_game_files calls, then launch_game's plan, command and
+            Popen (of a stand-in java that exits at once)
+  cli       python -m ctlauncher sync
+  prefetch  the idle-time Prefetcher, unthrottled (no asset objects)
+  mirror    MirrorBuilder.build (no Java runtimes)
+
+Each line has files/s, MB/s, p50/p99 per-file fetch latency, peak RSS, and the
+connections and TLS handshakes the CDN saw. Faults are seeded, so two runs
+with the same options fail the same requests.
+
+Usage: python benchmarks/bench_download.py [--objects 3000] [--latency-ms 20] [--bandwidth-mbps 50]
+           [--error-rate 0.01] [--truncate-rate 0.01] [--backend core --backend cli ...] [--plain]
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ctlauncher import cli  # noqa: E402
+from ctlauncher.core import LauncherCore  # noqa: E402
+from ctlauncher.mirror import MirrorBuilder  # noqa: E402
+from ctlauncher.net import Downloader  # noqa: E402
+from ctlauncher.prefetch import Prefetcher  # noqa: E402
+from localcdn import CERT_FILE, LocalCDN, add_version  # noqa: E402
+
+try:
+    import resource
+except ImportError:     # Windows
+    resource = None
+
+BACKENDS = ("core", "cli", "prefetch", "mirror")
+FAKE_JAVA = "#!/bin/sh\nexit 0\n"
+
+
+def percentile(values, q):
+    if not values:
+        return None
+    values = sorted(values)
+    return values[min(len(values) - 1, int(q * len(values)))]
+
+
+def peak_rss_mb():
+    # On Linux ru_maxrss survives exec, so a child would report the CDN parent's peak; VmHWM is this process's
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return round(int(line.split()[1]) / 1024, 1)
+    except OSError:
+        pass
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Kilobytes on Linux, bytes on macOS
+    return round(peak / (1 << 20 if sys.platform == "darwin" else 1 << 10), 1)
+
+
+class FetchTimer:
+    """Wraps ``Downloader.fetch`` for the whole process, so every backend is timed at the same point."""
+
+    def __init__(self):
+        self.seconds = []
+        self.bytes = 0
+        self.errors = 0
+        self._lock = threading.Lock()
+        fetch = Downloader.fetch
+
+        def timed_fetch(downloader, *args, **kwargs):
+            start = time.perf_counter()
+            try:
+                size = fetch(downloader, *args, **kwargs)
+            except BaseException:
+                with self._lock:
+                    self.errors += 1
+                raise
+            with self._lock:
+                self.seconds.append(time.perf_counter() - start)
+                self.bytes += size
+            return size
+        Downloader.fetch = timed_fetch
+
+
+def run_core(args, root):
+    core = LauncherCore(root, manifest_url=args.manifest_url, assets_url=args.assets_url)
+    version_id = core.resolve("latest")
+    result = core.sync(version_id)
+    extra = {"failed": len(result.failed), "retries": result.retries}
+    if os.name != "nt":
+        java = os.path.join(root, "java-stub")
+        with open(java, "w") as f:
+            f.write(FAKE_JAVA)
+        os.chmod(java, 0o755)
+        start = time.perf_counter()
+        plan = core.launch_plan(version_id, extra_jvm_args=["-Xms${ram_gb}G"])
+        command = core.command(version_id, "Player", 2, java, plan=plan)
+        process = subprocess.Popen(command, cwd=root, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        extra["launch_ms"] = round((time.perf_counter() - start) * 1000, 2)
+        process.wait()
+    return extra
+
+
+def run_cli(args, root):
+    with contextlib.redirect_stdout(io.StringIO()) as out:
+        code = cli.main(["--root", root, "--manifest-url", args.manifest_url, "--assets-url", args.assets_url,
+                         "sync", "latest"])
+    events = [json.loads(line) for line in out.getvalue().splitlines() if line.startswith("{")]
+    result = next((e for e in events if e.get("event") == "result"), {})
+    return {"failed": len(result.get("failed", [])), "exit": code}
+
+
+def run_prefetch(args, root):
+    core = LauncherCore(root, manifest_url=args.manifest_url, assets_url=args.assets_url)
+    core.version_index = core.index()
+    prefetcher = Prefetcher(core.downloader, core.prefetch_jobs, rate=None, is_current=core.is_current)
+    prefetcher.add(core.resolve("latest"))
+    while not prefetcher.idle:
+        time.sleep(0.01)
+    prefetcher.close()
+    return {}
+
+
+def run_mirror(args, root):
+    builder = MirrorBuilder(Downloader(), root, args.manifest_url, args.assets_url, java_platforms=[])
+    result = builder.build(["latest"])
+    return {"failed": len(result["failed"])}
+
+
+RUNNERS = {"core": run_core, "cli": run_cli, "prefetch": run_prefetch, "mirror": run_mirror}
+
+
+def child(args):
+    timer = FetchTimer()
+    with tempfile.TemporaryDirectory() as root:
+        start = time.perf_counter()
+        extra = RUNNERS[args.child](args, root)
+        seconds = time.perf_counter() - start
+    p50, p99 = percentile(timer.seconds, 0.5), percentile(timer.seconds, 0.99)
+    print(json.dumps(dict({
+        "files": len(timer.seconds), "bytes": timer.bytes, "fetch_errors": timer.errors,
+        "seconds": round(seconds, 3),
+        "files_per_s": round(len(timer.seconds) / seconds, 1),
+        "mb_per_s": round(timer.bytes / seconds / (1 << 20), 2),
+        "p50_ms": None if p50 is None else round(p50 * 1000, 2),
+        "p99_ms": None if p99 is None else round(p99 * 1000, 2),
+        "peak_rss_mb": peak_rss_mb(),
+    }, **extra)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--objects", type=int, default=3000)
+    parser.add_argument("--libraries", type=int, default=80)
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="delay before every response")
+    parser.add_argument("--bandwidth-mbps", type=float, default=0.0,
+                        help="link bandwidth in MB/s shared by all connections (0: unlimited)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of requests answered 503")
+    parser.add_argument("--truncate-rate", type=float, default=0.0, help="fraction of bodies cut short")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--backend", action="append", choices=BACKENDS, help="backends to run (default: all)")
+    parser.add_argument("--plain", action="store_true", help="serve plain HTTP instead of HTTPS")
+    parser.add_argument("--child", choices=BACKENDS, help=argparse.SUPPRESS)
+    parser.add_argument("--manifest-url", help=argparse.SUPPRESS)
+    parser.add_argument("--assets-url", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child:
+        child(args)
+        return
+
+    shaping = {"objects": args.objects, "libraries": args.libraries, "tls": not args.plain,
+               "latency_ms": args.latency_ms, "bandwidth_mbps": args.bandwidth_mbps,
+               "error_rate": args.error_rate, "truncate_rate": args.truncate_rate, "seed": args.seed}
+    env = dict(os.environ, SSL_CERT_FILE=CERT_FILE)
+    for name in ("CTLAUNCHER_STORE", "CTLAUNCHER_MIRROR"):
+        env.pop(name, None)
+    with LocalCDN(tls=not args.plain, latency=args.latency_ms / 1000,
+                  bandwidth=args.bandwidth_mbps * (1 << 20) or None, error_rate=args.error_rate,
+                  truncate_rate=args.truncate_rate, seed=args.seed) as cdn:
+        manifest_url = add_version(cdn, "1.21", args.objects, args.libraries, args.seed)
+        for backend in args.backend or BACKENDS:
+            cdn.reset_counters()
+            output = subprocess.run([sys.executable, os.path.abspath(__file__), "--child", backend,
+                                     "--manifest-url", manifest_url, "--assets-url", cdn.base_url],
+                                    env=env, stdout=subprocess.PIPE, check=True, text=True).stdout
+            result = json.loads(output.splitlines()[-1])
+            print(json.dumps(dict({"backend": backend}, **result, connections=cdn.connections,
+                                  handshakes=cdn.handshakes, **shaping)), flush=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""Handshake count and wall time for a full asset sync: one connection per object vs. the pooled Downloader.
+
+Usage: python benchmarks/bench_pool.py [--objects 4000] [--workers 4]
+"""
+
+import argparse
+import json
+import os
+import ssl
+import sys
+import tempfile
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ctlauncher.net import Downloader  # noqa: E402
+from localcdn import CERT_FILE, LocalCDN, add_asset_index  # noqa: E402
+
+
+def sync_per_request(cdn, objects, dest, workers):
+    """The old path: a fresh SSL context and connection for every object."""
+    def fetch(hash_):
+        context = ssl.create_default_context(cafile=CERT_FILE)
+        req = urllib.request.Request(cdn.url(f"/{hash_[:2]}/{hash_}"), headers={'User-Agent': 'CTLauncher/1.0'})
+        with urllib.request.urlopen(req, context=context) as response:
+            with open(os.path.join(dest, hash_), "wb") as f:
+                f.write(response.read())
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        list(pool.map(fetch, (o["hash"] for o in objects.values())))
+
+
+def sync_pooled(cdn, objects, dest, workers):
+    downloader = Downloader(cafile=CERT_FILE)
+
+    def fetch(hash_):
+        with downloader.open(cdn.url(f"/{hash_[:2]}/{hash_}")) as response:
+            with open(os.path.join(dest, hash_), "wb") as f:
+                for chunk in response.iter_content():
+                    f.write(chunk)
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        list(pool.map(fetch, (o["hash"] for o in objects.values())))
+    downloader.close()
+
+
+def run(name, sync, cdn, objects, workers):
+    cdn.reset_counters()
+    with tempfile.TemporaryDirectory() as dest:
+        start = time.perf_counter()
+        sync(cdn, objects, dest, workers)
+        elapsed = time.perf_counter() - start
+    return {"mode": name, "objects": len(objects), "workers": workers,
+            "handshakes": cdn.handshakes, "seconds": round(elapsed, 3),
+            "files_per_s": round(len(objects) / elapsed, 1)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--objects", type=int, default=4000)
+    parser.add_argument("--workers", type=int, default=4)
+    args = parser.parse_args()
+
+    with LocalCDN(tls=True) as cdn:
+        objects = add_asset_index(cdn, args.objects)["objects"]
+        for name, sync in (("per-request", sync_per_request), ("pooled", sync_pooled)):
+            print(json.dumps(run(name, sync, cdn, objects, args.workers)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+"""Rule evaluation per version JSON: re-interpreting every rules dict vs. the RuleEngine.
+
+One pass is what a launch does: filter libraries and flatten arguments.jvm and
+arguments.game, on a JSON parsed just before (parsing is not timed), as every
+launch does. The engine runs without a digest (nothing remembered) and with
+the file's SHA-1, which the sync and the launch plan of one version share. Pass real version JSONs with --json (e.g.
+~/.ctlauncher/versions/1.21/1.21.json); without any, a synthetic JSON with the
+shape of 1.21 (LWJGL natives per OS/arch, feature-gated game arguments) is used.
+
+Usage: python benchmarks/bench_rules.py [--json PATH ...] [--passes 2000]
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import platform
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ctlauncher.rules import RuleEngine, os_name  # noqa: E402
+
+LWJGL = ("lwjgl", "lwjgl-freetype", "lwjgl-glfw", "lwjgl-jemalloc", "lwjgl-openal", "lwjgl-opengl",
+         "lwjgl-stb", "lwjgl-tinyfd")
+NATIVES = (("natives-linux", {"name": "linux"}), ("natives-macos", {"name": "osx"}),
+           ("natives-macos-arm64", {"name": "osx"}), ("natives-windows", {"name": "windows"}),
+           ("natives-windows-arm64", {"name": "windows"}), ("natives-windows-x86", {"name": "windows", "arch": "x86"}))
+
+
+def _artifact(path):
+    return {"downloads": {"artifact": {"path": path, "sha1": "0" * 40, "size": 1, "url": "https://x/" + path}}}
+
+
+def synthetic_1_21():
+    """A version JSON with the rules layout of 1.21 (plain libraries, per-OS LWJGL natives, feature flags)."""
+    libraries = [dict(_artifact(f"com/example/lib{i}/1.0/lib{i}-1.0.jar"), name=f"com.example:lib{i}:1.0")
+                 for i in range(40)]
+    for module in LWJGL:
+        libraries.append(dict(_artifact(f"org/lwjgl/{module}/3.3.3/{module}-3.3.3.jar"),
+                              name=f"org.lwjgl:{module}:3.3.3"))
+        for classifier, os_rule in NATIVES:
+            libraries.append(dict(_artifact(f"org/lwjgl/{module}/3.3.3/{module}-3.3.3-{classifier}.jar"),
+                                  name=f"org.lwjgl:{module}:3.3.3:{classifier}",
+                                  rules=[{"action": "allow", "os": dict(os_rule)}]))
+    features = ("is_demo_user", "has_custom_resolution", "has_quick_plays_support", "is_quick_play_singleplayer",
+                "is_quick_play_multiplayer", "is_quick_play_realms")
+    game = ["--username", "${auth_player_name}", "--version", "${version_name}", "--gameDir", "${game_directory}",
+            "--assetsDir", "${assets_root}", "--assetIndex", "${assets_index_name}", "--uuid", "${auth_uuid}"]
+    game += [{"rules": [{"action": "allow", "features": {flag: True}}], "value": [f"--{flag}", f"${{{flag}}}"]}
+             for flag in features]
+    jvm = [{"rules": [{"action": "allow", "os": {"name": "osx"}}], "value": ["-XstartOnFirstThread"]},
+           {"rules": [{"action": "allow", "os": {"name": "windows"}}],
+            "value": "-XX:HeapDumpPath=MojangTricksIntelDriversForPerformance_javaw.exe_minecraft.exe.heapdump"},
+           {"rules": [{"action": "allow", "os": {"name": "windows", "version": "^10\\."}}],
+            "value": ["-Dos.name=Windows 10", "-Dos.version=10.0"]},
+           {"rules": [{"action": "allow", "os": {"arch": "x86"}}], "value": "-Xss1M"},
+           "-Djava.library.path=${natives_directory}", "-cp", "${classpath}"]
+    return {"id": "1.21-synthetic", "libraries": libraries, "arguments": {"game": game, "jvm": jvm}}
+
+
+def interpreted_allow(rules, features=None):
+    """What every variant did before: re-read each rules dict and re-query the platform per call."""
+    if not rules:
+        return True
+    allowed = False
+    for rule in rules:
+        os_rule = rule.get("os", {})
+        if os_rule.get("name") and os_rule["name"] != os_name():
+            continue
+        if os_rule.get("arch") and os_rule["arch"] != ("x86" if platform.machine().endswith("86") else "x64"):
+            continue
+        if os_rule.get("version") and not re.search(os_rule["version"], platform.release()):
+            continue
+        if any(bool((features or {}).get(name)) != value for name, value in rule.get("features", {}).items()):
+            continue
+        allowed = rule.get("action", "allow") == "allow"
+    return allowed
+
+
+def interpreted_pass(data):
+    libraries = [lib for lib in data.get("libraries", []) if interpreted_allow(lib.get("rules"))]
+    args = []
+    for entries in (data["arguments"].get("jvm", []), data["arguments"].get("game", [])):
+        for entry in entries:
+            if isinstance(entry, str):
+                args.append(entry)
+            elif interpreted_allow(entry.get("rules")):
+                args.extend([entry["value"]] if isinstance(entry["value"], str) else entry["value"])
+    return len(libraries), len(args)
+
+
+def engine_pass(engine, data, digest=None):
+    libraries = engine.libraries(data, digest)
+    args = list(engine.arguments(data["arguments"].get("jvm", []), digest, "jvm"))
+    args += engine.arguments(data["arguments"].get("game", []), digest, "game")
+    return len(libraries), len(args)
+
+
+def load(text):
+    data = json.loads(text)
+    data.setdefault("arguments", {})    # pre-1.13 JSONs have minecraftArguments only
+    return data
+
+
+def fresh_copies(text, passes):
+    """One parse per pass, made before timing: every launch evaluates a JSON it just parsed."""
+    return iter([load(text) for _ in range(passes)])
+
+
+def timed(name, passes, func):
+    start = time.perf_counter()
+    for _ in range(passes):
+        counts = func()
+    elapsed = time.perf_counter() - start
+    return {"mode": name, "passes": passes, "us_per_pass": round(elapsed / passes * 1e6, 2),
+            "libraries": counts[0], "arguments": counts[1]}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--json", nargs="*", default=[], help="version JSON files to evaluate")
+    parser.add_argument("--passes", type=int, default=2000)
+    args = parser.parse_args()
+
+    documents = []
+    for path in args.json:
+        with open(path) as f:
+            documents.append((os.path.basename(path), f.read()))
+    if not documents:
+        documents.append(("1.21-synthetic", json.dumps(synthetic_1_21())))
+
+    for name, text in documents:
+        engine = RuleEngine()
+        digest = hashlib.sha1(text.encode()).hexdigest()
+        copies = [fresh_copies(text, args.passes) for _ in range(3)]
+        results = [
+            timed("interpreted (before)", args.passes, lambda: interpreted_pass(next(copies[0]))),
+            timed("engine, no digest", args.passes, lambda: engine_pass(engine, next(copies[1]))),
+            # The sync and the launch plan of one file share its SHA-1, so the second pass is lookups only
+            timed("engine, by digest", args.passes, lambda: engine_pass(engine, next(copies[2]), digest)),
+        ]
+        assert len({(r["libraries"], r["arguments"]) for r in results}) == 1, results
+        for result in results:
+            print(json.dumps(dict(result, version=name)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""Warm-launch preparation time: re-hashing every file vs. the persistent verified-file index.
+
+Builds a synthetic libraries + assets tree, then times the existence/SHA-1 pass
+that download_version_files/download_assets run before every launch.
+
+Usage: python benchmarks/bench_verify.py [--assets 4000] [--library-mb 200]
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ctlauncher.verifyindex import VerifiedIndex  # noqa: E402
+
+
+def build_tree(root, assets, library_mb, seed=0):
+    rng = random.Random(seed)
+    files = []
+    sizes = [rng.randint(512, 16 * 1024) for _ in range(assets)]
+    sizes += [1 << 20] * library_mb
+    for i, size in enumerate(sizes):
+        data = rng.randbytes(size)
+        path = os.path.join(root, f"{i % 256:02x}", f"{i:06d}")
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "wb") as f:
+            f.write(data)
+        files.append((path, hashlib.sha1(data).hexdigest()))
+    return files
+
+
+def verify_rehash(files):
+    """What verify_file did before the index: read and hash every file in full."""
+    for path, sha1 in files:
+        with open(path, "rb") as f:
+            assert hashlib.sha1(f.read()).hexdigest() == sha1
+
+
+def verify_indexed(files, db_path, deep=False):
+    index = VerifiedIndex(db_path, deep=deep)
+    for path, sha1 in files:
+        assert index.verify(path, sha1)
+    index.close()
+    return {"hits": index.hits, "hashed": index.hashed}
+
+
+def timed(name, func, *args, **kwargs):
+    start = time.perf_counter()
+    extra = func(*args, **kwargs) or {}
+    return dict({"mode": name, "seconds": round(time.perf_counter() - start, 3)}, **extra)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--assets", type=int, default=4000)
+    parser.add_argument("--library-mb", type=int, default=200)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as root:
+        files = build_tree(os.path.join(root, "tree"), args.assets, args.library_mb)
+        db_path = os.path.join(root, "verified.sqlite3")
+        results = [
+            timed("rehash (before)", verify_rehash, files),
+            timed("index, first run", verify_indexed, files, db_path),
+            timed("index, warm", verify_indexed, files, db_path),
+            timed("index, --deep-verify", verify_indexed, files, db_path, deep=True),
+        ]
+    for result in results:
+        print(json.dumps(dict(result, files=len(files))))
+
+
+if __name__ == "__main__":
+    main()
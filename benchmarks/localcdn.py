@@ -0,0 +1,258 @@
+"""Loopback HTTP(S) stand-in for the Mojang CDNs, used by the benchmarks.
+
+Besides the explicit ``fail`` / ``drop_after`` tables, a :class:`LocalCDN` can
+shape every response: a fixed delay before the headers, a shared link of a
+given bandwidth, and a rate of 503s and truncated bodies. Which requests fail
+is decided by ``seed``, the path and how often that path was asked for, so a
+run is reproducible however the client orders its requests.
+"""
+
+import hashlib
+import json
+import os
+import random
+import ssl
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+CERT_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "localhost.pem")
+CHUNK = 16 * 1024   # bandwidth is paced per chunk written
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True  # headers and body go out as separate writes
+
+    def do_GET(self):
+        cdn = self.server.cdn
+        path = self.path.split("?", 1)[0]
+        with cdn.lock:
+            failures = cdn.fail.get(path)
+            status, retry_after = failures.pop(0) if failures else (None, None)
+            attempt = cdn.requests[path] = cdn.requests.get(path, 0) + 1
+        if cdn.latency:
+            time.sleep(cdn.latency)
+        if status is None and cdn.error_rate and cdn.roll("error", path, attempt) < cdn.error_rate:
+            status = 503
+        if status is not None:
+            self.send_response(status)
+            if retry_after is not None:
+                self.send_header("Retry-After", str(retry_after))
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        body = cdn.files.get(path)
+        if body is None:
+            self.send_response(404)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        etag = '"%s"' % hashlib.sha1(body).hexdigest()
+        if self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        start = 0
+        range_header = self.headers.get("Range")
+        if range_header and self.headers.get("If-Range", etag) == etag:
+            start = int(range_header.split("=", 1)[1].split("-", 1)[0])
+            if start >= len(body):
+                self.send_response(416)
+                self.send_header("Content-Range", f"bytes */{len(body)}")
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+        self.send_response(206 if start else 200)
+        self.send_header("ETag", etag)
+        self.send_header("Accept-Ranges", "bytes")
+        if start:
+            self.send_header("Content-Range", f"bytes {start}-{len(body) - 1}/{len(body)}")
+        self.send_header("Content-Length", str(len(body) - start))
+        self.end_headers()
+        with cdn.lock:
+            cut = cdn.drop_after.pop(path, None)
+        if cut is None and cdn.truncate_rate and cdn.roll("truncate", path, attempt) < cdn.truncate_rate:
+            cut = int((len(body) - start) * cdn.roll("cut", path, attempt))
+        with cdn.lock:
+            cdn.bytes_sent += len(body) - start if cut is None else min(cut, len(body) - start)
+        if cut is not None:
+            # Simulate a link dying mid-transfer.
+            self._send(body[start:start + cut])
+            self.close_connection = True
+            return
+        self._send(body[start:])
+
+    def _send(self, data):
+        cdn = self.server.cdn
+        if not cdn.bandwidth:
+            self.wfile.write(data)
+            return
+        for offset in range(0, len(data), CHUNK):
+            chunk = data[offset:offset + CHUNK]
+            self.wfile.write(chunk)
+            cdn.pace(len(chunk))
+
+    def log_message(self, format, *args):
+        pass
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, cdn, ssl_context):
+        super().__init__(("127.0.0.1", 0), _Handler)
+        self.cdn = cdn
+        self.ssl_context = ssl_context
+
+    def get_request(self):
+        sock, addr = super().get_request()
+        with self.cdn.lock:
+            self.cdn.connections += 1
+        if self.ssl_context:
+            # Handshake happens lazily in the handler thread, not the accept loop.
+            sock = self.ssl_context.wrap_socket(sock, server_side=True, do_handshake_on_connect=False)
+        return sock, addr
+
+
+class LocalCDN:
+    """Serve an in-memory path -> bytes mapping over loopback and count connections.
+
+    ``latency`` (seconds) delays every response; ``bandwidth`` (bytes per
+    second) is shared by all connections, like the client's link;
+    ``error_rate`` and ``truncate_rate`` are the fractions of requests answered
+    with a 503 and of bodies cut short.
+    """
+
+    def __init__(self, tls=True, latency=0.0, bandwidth=None, error_rate=0.0, truncate_rate=0.0, seed=0):
+        self.tls = tls
+        self.latency = latency
+        self.bandwidth = bandwidth
+        self.error_rate = error_rate
+        self.truncate_rate = truncate_rate
+        self.seed = seed
+        self.files = {}
+        self.drop_after = {}    # path -> bytes to send before dropping the next response
+        self.fail = {}          # path -> [(status, retry_after or None), ...] answered before the real file
+        self.requests = {}      # path -> times asked for
+        self.connections = 0
+        self.bytes_sent = 0
+        self.lock = threading.Lock()
+        self._link_free = 0.0
+        self._server = None
+        self._thread = None
+
+    @property
+    def handshakes(self):
+        return self.connections if self.tls else 0
+
+    @property
+    def base_url(self):
+        scheme = "https" if self.tls else "http"
+        return f"{scheme}://localhost:{self._server.server_address[1]}"
+
+    def url(self, path):
+        return self.base_url + path
+
+    def add(self, path, data):
+        self.files[path] = data
+        return self.url(path) if self._server else path
+
+    def roll(self, kind, path, attempt):
+        """A number in [0, 1) fixed by the seed, the path and the request's attempt number."""
+        digest = hashlib.sha1(f"{self.seed}:{kind}:{path}:{attempt}".encode()).digest()
+        return int.from_bytes(digest[:8], "big") / 2 ** 64
+
+    def pace(self, size):
+        """Hold the calling handler until ``size`` more bytes fit through the shared link."""
+        with self.lock:
+            now = time.monotonic()
+            self._link_free = max(self._link_free, now) + size / self.bandwidth
+            wait = self._link_free - now
+        if wait > 0:
+            time.sleep(wait)
+
+    def reset_counters(self):
+        with self.lock:
+            self.connections = 0
+            self.bytes_sent = 0
+            self.requests.clear()
+
+    def start(self):
+        context = None
+        if self.tls:
+            context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+            context.load_cert_chain(CERT_FILE)
+        self._server = _Server(self, context)
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def add_asset_index(cdn, count, seed=0, min_size=512, max_size=16 * 1024):
+    """Register ``count`` random asset objects and return a Mojang-style index dict."""
+    rng = random.Random(seed)
+    objects = {}
+    for i in range(count):
+        data = rng.randbytes(rng.randint(min_size, max_size))
+        digest = hashlib.sha1(data).hexdigest()
+        cdn.files[f"/{digest[:2]}/{digest}"] = data
+        objects[f"minecraft/synthetic/{i:05d}.ogg"] = {"hash": digest, "size": len(data)}
+    return {"objects": objects}
+
+
+def _download(cdn, path, data):
+    return {"url": cdn.add(path, data), "sha1": hashlib.sha1(data).hexdigest(), "size": len(data)}
+
+
+def add_version(cdn, version_id="1.21", objects=3000, libraries=80, seed=0):
+    """Register a synthetic version (client, libraries, asset index, objects) and a manifest for it.
+
+    Returns the manifest URL; the CDN must already be started.
+    """
+    rng = random.Random(seed)
+    index = json.dumps(add_asset_index(cdn, objects, seed)).encode()
+    libs = []
+    for i in range(libraries):
+        data = rng.randbytes(rng.randint(16 * 1024, 256 * 1024))
+        path = f"org/synthetic/lib{i:03d}/1.0/lib{i:03d}-1.0.jar"
+        lib = {"name": f"org.synthetic:lib{i:03d}:1.0",
+               "downloads": {"artifact": dict(_download(cdn, f"/libraries/{path}", data), path=path)}}
+        if i % 10 == 9:     # a sprinkling of OS-specific libraries, like the real manifests
+            lib["rules"] = [{"action": "allow", "os": {"name": ("windows", "osx", "linux")[i % 3]}}]
+        libs.append(lib)
+    version = {
+        "id": version_id, "type": "release", "mainClass": "net.minecraft.client.main.Main",
+        "javaVersion": {"majorVersion": 21},
+        "assetIndex": dict(_download(cdn, f"/indexes/{version_id}.json", index), id=version_id),
+        "downloads": {"client": _download(cdn, f"/versions/{version_id}/client.jar", rng.randbytes(1 << 20))},
+        "libraries": libs,
+        "arguments": {
+            "game": ["--username", "${auth_player_name}", "--version", "${version_name}",
+                     "--gameDir", "${game_directory}", "--assetsDir", "${assets_root}",
+                     "--uuid", "${auth_uuid}", "--accessToken", "${auth_access_token}",
+                     {"rules": [{"action": "allow", "features": {"is_demo_user": True}}], "value": "--demo"}],
+            "jvm": [{"rules": [{"action": "allow", "os": {"name": "osx"}}], "value": ["-XstartOnFirstThread"]},
+                    "-Djava.library.path=${natives_directory}", "-cp", "${classpath}"],
+        },
+    }
+    version_url = cdn.add(f"/versions/{version_id}.json", json.dumps(version).encode())
+    manifest = {"latest": {"release": version_id, "snapshot": version_id},
+                "versions": [{"id": version_id, "type": "release", "url": version_url,
+                              "releaseTime": "2024-06-13T08:24:03+00:00"}]}
+    return cdn.add("/mc/game/version_manifest_v2.json", json.dumps(manifest).encode())
@@ -1,21 +1,18 @@
 import os
 import sys
 import subprocess
-import platform
-import urllib.request
-import zipfile
 import json
 import shutil
 import re
-import hashlib
-import ssl
-import time
-import requests
 import threading
-import tarfile  # For Linux/macOS extraction
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox, scrolledtext, simpledialog
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from ctlauncher.core import LauncherCore
+from ctlauncher.logview import LogView
+from ctlauncher.manifest import VersionIndex
+from ctlauncher.net import DownloadError
+from ctlauncher.prefetch import Prefetcher, RecentVersions
+from ctlauncher.progress import ProgressBus, rotating_log
 
 # -------------------------
 # Constants / Directories
@@ -26,6 +23,7 @@ JAVA_DIR = os.path.join(CTLAUNCHER_DIR, "java")
 ASSETS_DIR = os.path.join(CTLAUNCHER_DIR, "assets")
 LIBRARIES_DIR = os.path.join(CTLAUNCHER_DIR, "libraries")
 PROFILES_DIR = os.path.join(CTLAUNCHER_DIR, "profiles")
+LOG_FILE = os.path.join(CTLAUNCHER_DIR, "logs", "launcher.log")
 VERSION_MANIFEST_URL = "https://launchermeta.mojang.com/mc/game/version_manifest.json"
 ASSETS_BASE_URL = "https://resources.download.minecraft.net"
 
@@ -37,11 +35,19 @@ FABRIC_INSTALLER_URL = "https://maven.fabricmc.net/net/fabricmc/fabric-installer
 # Meta
 # -------------------------
 LAUNCHER_VERSION = "V0.5.1 Enhanced TLauncher-Like Cracked Edition (2025 Optimized - No Malware)"
-MAX_RETRIES = 3
-RETRY_DELAY = 1
 DOWNLOAD_TIMEOUT = 30
-MAX_WORKERS = 4
-CACHE_SIZE = 100  # From optimized version
+PREFETCH_RATE = 512 * 1024  # Bytes/s for idle background prefetch (None = no cap)
+# Re-hash every file instead of trusting the verified-file index
+DEEP_VERIFY = "--deep-verify" in sys.argv
+# Heap floor and GC tuning on top of the version's own JVM arguments
+JVM_FLAGS = [
+    '-Xms${min_ram_gb}G',
+    '-XX:+UseG1GC',
+    '-XX:MaxGCPauseMillis=20',
+    '-XX:G1HeapRegionSize=32M',
+    '-XX:-OmitStackTraceInFastThrow',
+    '-XX:+AlwaysPreTouch'
+]
 
 THEME = {
     'bg': '#ffffff',          # White background
@@ -58,277 +64,147 @@ THEME = {
 # ==============================================================
 
 class MinecraftLauncher:
-    def __init__(self, log_callback=None):
+    def __init__(self, log_callback=None, bus=None):
         self.setup_directories()
         self.version_manifest = None
+        self.version_index = VersionIndex({})
         self.selected_version = None
         self.profiles = self.load_profiles()
-        self.log_callback = log_callback or print
-        self.version_cache = {}  # Cache for version data
-        self.asset_cache = {}    # Cache for assets
-        self.thread_pool = ThreadPoolExecutor(max_workers=MAX_WORKERS)
+        self.bus = bus  # ProgressBus when driven by the GUI
+        self.log_callback = log_callback or (bus.log if bus else print)
+        # Downloads, rules, caches and the command line are shared with the other launchers and the CLI
+        self.core = LauncherCore(CTLAUNCHER_DIR, log=self.log, timeout=DOWNLOAD_TIMEOUT, deep_verify=DEEP_VERIFY,
+                                 manifest_url=VERSION_MANIFEST_URL, assets_url=ASSETS_BASE_URL,
+                                 on_progress=lambda progress: self.report(progress.done, progress.total,
+                                                                          progress.bytes, len(progress.failed)))
+        self.recent_versions = RecentVersions(os.path.join(CTLAUNCHER_DIR, "cache", "recent_versions.json"))
+        self.prefetcher = Prefetcher(self.core.downloader, self.core.prefetch_jobs, rate=PREFETCH_RATE,
+                                     is_current=self.core.is_current, log=lambda msg: self.log(f"⚠ {msg}"))
 
     def log(self, msg):
         self.log_callback(msg)
 
+    def detail(self, msg):
+        """Per-file chatter: the rotating log file under the GUI, the console otherwise."""
+        if self.bus:
+            self.bus.detail(msg)
+        else:
+            self.log(msg)
+
+    def report(self, done, total, nbytes=0, failed=0):
+        if self.bus:
+            self.bus.progress(done, total, nbytes, failed)  # rendered by the GUI at ~10 Hz
+        elif done % 100 == 0 or done == total:
+            self.log(f"  Progress: {done}/{total} files ({nbytes >> 20} MB)")
+
     def setup_directories(self):
         for directory in [CTLAUNCHER_DIR, VERSIONS_DIR, JAVA_DIR, ASSETS_DIR, LIBRARIES_DIR, PROFILES_DIR]:
             os.makedirs(directory, exist_ok=True)
 
-    def get_java_path(self):
-        system = platform.system()
-        local_java_dir = self.get_local_java_dir()
-        if local_java_dir:
-            if system == 'Windows':
-                java_bin = os.path.join(JAVA_DIR, local_java_dir, "bin", "java.exe")
-            else:
-                java_bin = os.path.join(JAVA_DIR, local_java_dir, "bin", "java")
-            if os.path.exists(java_bin):
-                return java_bin
-        # Fallback to system java
-        return 'java'
-
-    def get_local_java_dir(self):
-        """Find extracted Java directory."""
-        if not os.path.exists(JAVA_DIR):
-            return None
-        for dir_name in os.listdir(JAVA_DIR):
-            if dir_name.startswith("jdk-") and os.path.isdir(os.path.join(JAVA_DIR, dir_name)):
-                return dir_name
-        return None
-
-    def get_latest_java_url(self):
-        """Fetch latest OpenJDK URL dynamically."""
-        try:
-            response = requests.get("https://api.adoptium.net/v3/assets/latest/21/hotspot", timeout=10)
-            response.raise_for_status()
-            releases = response.json()
-            system = platform.system()
-            arch = "x64"
-            os_map = {"Windows": "windows", "Linux": "linux", "Darwin": "mac"}
-            os_name = os_map.get(system)
-            if not os_name:
-                return None, None
-            for release in releases:
-                if release["binary"]["os"] == os_name and release["binary"]["architecture"] == arch:
-                    return release["binary"]["package"]["link"], release["version"]["openjdk_version"]
-            return None, None
-        except Exception as e:
-            self.log(f"✗ Failed to fetch Java: {e}")
-            return None, None
-
-    def download_java(self):
-        system = platform.system()
-        if system not in ['Windows', 'Linux', 'Darwin']:
-            self.log(f"✗ Unsupported OS: {system}")
-            return False
-
-        java_url, java_version = self.get_latest_java_url()
-        if not java_url:
-            self.log("✗ Failed to fetch Java URL")
-            return False
-
-        self.log(f"Downloading Java {java_version} for {system}...")
-        archive_ext = 'zip' if system == 'Windows' else 'tar.gz'
-        archive_path = os.path.join(JAVA_DIR, f"java_{java_version}_{system.lower()}.{archive_ext}")
-
-        if not self.download_file(java_url, archive_path, f"Java {java_version}"):
-            return False
+    def get_java_path(self, major=21):
+        # Installed runtimes are indexed by major version: a dict lookup, no directory scan
+        return self.core.runtimes.find(major) or 'java'
 
+    def download_java(self, major=21):
         try:
-            if system == 'Windows':
-                with zipfile.ZipFile(archive_path, 'r') as zip_ref:
-                    zip_ref.extractall(JAVA_DIR)
-            else:
-                with tarfile.open(archive_path, 'r:gz') as tar_ref:
-                    tar_ref.extractall(JAVA_DIR)
-            os.remove(archive_path)
-            self.log(f"✓ Java {java_version} downloaded and extracted")
+            self.core.runtimes.install(major, log=self.log)
+            self.log(f"✓ Java {major} downloaded and extracted")
             return True
         except Exception as e:
-            self.log(f"✗ Failed to extract Java: {e}")
+            self.log(f"✗ Failed to install Java {major}: {e}")
             return False
 
-    def check_java(self):
-        java_path = self.get_java_path()
-        try:
-            result = subprocess.run([java_path, '-version'], capture_output=True, text=True, timeout=10)
-            if result.returncode == 0 and '21.' in result.stderr:
-                self.log("✓ Compatible Java 21 is available")
-                return True
-            else:
-                self.log("⚠ System Java is not version 21; attempting to use bundled or download")
-        except (FileNotFoundError, subprocess.TimeoutExpired):
-            pass
-
-        # Download if bundled not present
-        local_java_dir = self.get_local_java_dir()
-        if not local_java_dir:
-            if not self.download_java():
-                self.log("✗ Failed to download Java 21. Please install manually from https://adoptium.net/")
-                return False
-
-        # Recheck
-        java_path = self.get_java_path()
-        try:
-            result = subprocess.run([java_path, '-version'], capture_output=True, text=True, timeout=10)
-            if result.returncode == 0 and '21.' in result.stderr:
-                self.log("✓ Bundled Java 21 is ready")
-                return True
-        except Exception as e:
-            self.log(f"✗ Java check failed: {e}")
+    def check_java(self, major=21):
+        if self.core.runtimes.find(major):
+            self.log(f"✓ Compatible Java {major} is available")
+            return True
+        self.log(f"⚠ No Java {major} runtime found; downloading one")
+        if not self.download_java(major):
+            self.log(f"✗ Failed to download Java {major}. Please install manually from https://adoptium.net/")
             return False
-        return False
+        return True
 
     def fetch_version_manifest(self):
         try:
             self.log("Fetching version manifest...")
-            response = requests.get(VERSION_MANIFEST_URL, timeout=DOWNLOAD_TIMEOUT)
-            response.raise_for_status()
-            self.version_manifest = response.json()
-            self.log(f"✓ Found {len(self.version_manifest['versions'])} versions")
+            # Conditional GET; falls back to the cached copy when offline
+            self.version_manifest = self.core.manifest_cache.load()
+            self.version_index = self.core.version_index = VersionIndex(self.version_manifest)
+            if self.core.manifest_cache.offline:
+                self.log("⚠ Offline: using cached version manifest")
+            self.log(f"✓ Found {len(self.version_index)} versions")
+            self.start_prefetch()
             return True
         except Exception as e:
             self.log(f"✗ Failed to fetch version manifest: {e}")
             return False
 
+    def load_cached_manifest(self):
+        """Use the on-disk manifest copy, if any, without touching the network."""
+        cached = self.core.manifest_cache.cached()
+        if cached:
+            self.version_manifest = cached
+            self.version_index = self.core.version_index = VersionIndex(cached)
+        return cached is not None
+
     def download_file(self, url, destination, description="file", expected_hash=None):
-        for attempt in range(MAX_RETRIES):
-            try:
-                self.log(f"Downloading {description}... (attempt {attempt + 1}/{MAX_RETRIES})")
-                response = requests.get(url, timeout=DOWNLOAD_TIMEOUT, stream=True)
-                response.raise_for_status()
-
-                total_size = int(response.headers.get('content-length', 0))
-                downloaded = 0
-                with open(destination, 'wb') as f:
-                    for chunk in response.iter_content(chunk_size=8192):
-                        if chunk:
-                            f.write(chunk)
-                            downloaded += len(chunk)
-                            if total_size > 0 and downloaded % (1024 * 1024) == 0:  # Update every MB
-                                progress = (downloaded / total_size) * 100
-                                self.log(f"  Progress: {progress:.1f}%")
-                # Verify hash if provided
-                if expected_hash:
-                    file_hash = hashlib.sha1(open(destination, 'rb').read()).hexdigest()
-                    if file_hash != expected_hash:
-                        self.log(f"✗ Hash mismatch for {description}: expected {expected_hash}, got {file_hash}")
-                        os.remove(destination)
-                        continue
-                self.log(f"✓ Downloaded {description}")
-                return True
-            except Exception as e:
-                self.log(f"✗ Download failed (attempt {attempt + 1}/{MAX_RETRIES}): {e}")
-                if os.path.exists(destination):
-                    os.remove(destination)
-                if attempt < MAX_RETRIES - 1:
-                    time.sleep(RETRY_DELAY * (2 ** attempt))  # Exponential backoff
-        return False
+        # Same scheduler as the game files: retries wait on its timers and honour Retry-After
+        self.detail(f"Downloading {description}...")
+        result = self.core.fetch_file(url, destination, expected_hash, description)
+        if result.failed:
+            self.log(f"✗ Failed to download {description}: {result.failed[0][1]}")
+            return False
+        self.detail(f"✓ Downloaded {description}")
+        return True
 
     def download_version(self, version_id):
+        self.prefetcher.pause()  # foreground downloads get the whole connection
+        try:
+            return self._download_version(version_id)
+        finally:
+            self.prefetcher.resume()
+
+    def _download_version(self, version_id):
         self.log(f"\n=== Downloading Minecraft {version_id} ===")
 
-        version_info = next((v for v in self.version_manifest['versions'] if v['id'] == version_id), None)
-        if not version_info:
+        if version_id not in self.version_index and not self.fetch_version_manifest():
+            return False
+        if version_id not in self.version_index:
             self.log(f"✗ Version {version_id} not found in manifest")
             return False
 
-        version_dir = os.path.join(VERSIONS_DIR, version_id)
-        os.makedirs(version_dir, exist_ok=True)
-
-        version_json_path = os.path.join(version_dir, f"{version_id}.json")
-        if version_id in self.version_cache:
-            with open(version_json_path, 'w') as f:
-                json.dump(self.version_cache[version_id], f)
-        else:
-            if not self.download_file(version_info['url'], version_json_path, f"{version_id}.json"):
-                return False
-            with open(version_json_path, 'r') as f:
-                version_data = json.load(f)
-            self.version_cache[version_id] = version_data
-            if len(self.version_cache) > CACHE_SIZE:
-                self.version_cache.pop(next(iter(self.version_cache)))
-
-        version_data = self.version_cache[version_id]
-
-        client_jar_path = os.path.join(version_dir, f"{version_id}.jar")
-        if not self.download_file(version_data['downloads']['client']['url'], client_jar_path, f"minecraft.jar ({version_id})", version_data['downloads']['client']['sha1']):
+        if not self.download_game_files(version_id):
             return False
 
-        self.download_libraries(version_data['libraries'])
-        self.download_assets(version_data['assetIndex'])
-
         self.selected_version = version_id
         self.log(f"✓ Minecraft {version_id} ready to launch! (Cracked Mode)")
         return True
 
-    def download_libraries(self, libraries):
-        self.log("Downloading libraries...")
-        current_os = platform.system().lower()
-        if current_os == 'darwin':
-            current_os = 'osx'
-        for lib in libraries:
-            if not self.is_library_allowed(lib, current_os):
-                continue
-            if 'downloads' in lib and 'artifact' in lib['downloads']:
-                artifact = lib['downloads']['artifact']
-                lib_path = os.path.join(LIBRARIES_DIR, artifact['path'])
-                os.makedirs(os.path.dirname(lib_path), exist_ok=True)
-                if not os.path.exists(lib_path):
-                    self.download_file(artifact['url'], lib_path, f"library: {artifact['path']}", artifact['sha1'])
-
-    def is_library_allowed(self, lib, current_os):
-        """Check if library is allowed on current OS."""
-        if "rules" not in lib:
-            return True
-        allowed = False
-        for rule in lib["rules"]:
-            if rule["action"] == "allow":
-                if "os" not in rule or (isinstance(rule.get("os"), dict) and rule["os"].get("name") == current_os):
-                    allowed = True
-            elif rule["action"] == "disallow":
-                if "os" in rule and isinstance(rule.get("os"), dict) and rule["os"].get("name") == current_os:
-                    allowed = False
-        return allowed
-
-    def download_assets(self, asset_index_info):
-        asset_index_path = os.path.join(ASSETS_DIR, "indexes", f"{asset_index_info['id']}.json")
-        os.makedirs(os.path.dirname(asset_index_path), exist_ok=True)
-        if not self.download_file(asset_index_info['url'], asset_index_path, "asset index", asset_index_info['sha1']):
-            return
-        with open(asset_index_path, 'r') as f:
-            asset_data = json.load(f)
-        self.log(f"Downloading assets ({len(asset_data['objects'])} objects)...")
-        objects_dir = os.path.join(ASSETS_DIR, "objects")
-        os.makedirs(objects_dir, exist_ok=True)
-        objects = asset_data['objects']
-        total_objects = len(objects)
-        downloaded = 0
-        futures = []
-        for obj_name, obj_info in objects.items():
-            hash_val = obj_info['hash']
-            obj_path = os.path.join(objects_dir, hash_val[:2], hash_val)
-            os.makedirs(os.path.dirname(obj_path), exist_ok=True)
-            if not os.path.exists(obj_path):
-                url = f"{ASSETS_BASE_URL}/{hash_val[:2]}/{hash_val}"
-                future = self.thread_pool.submit(self.download_file, url, obj_path, f"asset: {obj_name}", hash_val)
-                futures.append(future)
-            else:
-                downloaded += 1
-        for future in as_completed(futures):
-            if future.result():
-                downloaded += 1
-            progress = (downloaded / total_objects) * 100
-            self.log(f"  Assets Progress: {progress:.1f}%")
-        self.log(f"✓ All assets downloaded for {asset_index_info['id']}")
+    def start_prefetch(self):
+        """Queue the latest release, recently launched and profile versions for idle prefetch."""
+        self.prefetcher.add(self.version_index.latest.get('release'), *self.recent_versions.list(),
+                            *(profile.get('version') for profile in self.profiles.values()))
+
+    def download_game_files(self, version_id):
+        """Version JSON, client jar, libraries, natives and asset index -> objects as one concurrent job graph."""
+        self.log(f"Downloading {version_id}: client, libraries, natives and assets...")
+        try:
+            result = self.core.sync(version_id)
+        except (DownloadError, OSError, ValueError, KeyError) as e:
+            self.log(f"✗ Failed to download {version_id}: {e}")
+            return False
+        for job, error in result.failed:
+            self.detail(f"✗ Failed {job.name}: {error}")
+        self.log(f"✓ All files downloaded for {version_id}" if result.ok
+                 else f"⚠ {len(result.failed)}/{result.total} files failed for {version_id} (details in {LOG_FILE})")
+        return True
 
     def fetch_forge_version(self, version_id):
         """Dynamically fetch latest Forge version for a MC version (TLauncher-like)."""
         try:
-            response = requests.get(f"{FORGE_MAVEN}index_{version_id}.html", timeout=10)
+            index_html = self.core.downloader.get_text(f"{FORGE_MAVEN}index_{version_id}.html")
             # Parse HTML for latest recommended version using regex
-            match = re.search(rf'href="net/minecraftforge/forge/({re.escape(version_id)}-[^/]+)/"[^>]*>Recommended</a>', response.text)
+            match = re.search(rf'href="net/minecraftforge/forge/({re.escape(version_id)}-[^/]+)/"[^>]*>Recommended</a>', index_html)
             if match:
                 full = match.group(1)
                 forge_version = full.split('-')[-1]
@@ -409,42 +285,29 @@ class MinecraftLauncher:
         self.save_profiles()
         self.log(f"✓ Profile '{name}' added")
 
-    def build_classpath(self, version_id, ram_gb):
+    def loader_jars(self, version_id):
+        """Installed Forge / Fabric jars, in classpath order."""
+        version_dir = os.path.join(VERSIONS_DIR, version_id)
+        return [path for path in (os.path.join(version_dir, f"forge-{version_id}.jar"),
+                                  os.path.join(version_dir, "fabric-loader.jar"))
+                if os.path.exists(path)]
+
+    def installed_loader(self, version_id):
+        """Which mod loaders are installed for a version; part of the launch plan cache key."""
         version_dir = os.path.join(VERSIONS_DIR, version_id)
-        with open(os.path.join(version_dir, f"{version_id}.json"), 'r') as f:
-            version_data = json.load(f)
-
-        classpath_entries = []
-        current_os = platform.system().lower()
-        if current_os == 'darwin':
-            current_os = 'osx'
-        for lib in version_data['libraries']:
-            if self.is_library_allowed(lib, current_os) and 'downloads' in lib and 'artifact' in lib['downloads']:
-                artifact = lib['downloads']['artifact']
-                lib_path = os.path.join(LIBRARIES_DIR, artifact['path'])
-                if os.path.exists(lib_path):
-                    classpath_entries.append(lib_path)
-
-        # Add Forge/Fabric if installed
-        forge_jar = os.path.join(version_dir, f"forge-{version_id}.jar")
-        if os.path.exists(forge_jar):
-            classpath_entries.append(forge_jar)
-
-        fabric_loader = os.path.join(version_dir, "fabric-loader.jar")
-        if os.path.exists(fabric_loader):
-            classpath_entries.append(fabric_loader)
-
-        classpath_entries.append(os.path.join(version_dir, f"{version_id}.jar"))
-        separator = ';' if platform.system() == 'Windows' else ':'
-        return separator.join(classpath_entries)
-
-    def generate_offline_uuid(self, username):
-        """Generate offline UUID."""
-        offline_prefix = "OfflinePlayer:"
-        hash_value = hashlib.md5((offline_prefix + username).encode('utf-8')).hexdigest()
-        return f"{hash_value[:8]}-{hash_value[8:12]}-{hash_value[12:16]}-{hash_value[16:20]}-{hash_value[20:32]}"
+        loaders = [name for name, path in (("forge", os.path.join(version_dir, f"forge-{version_id}.jar")),
+                                           ("fabric", os.path.join(version_dir, "fabric-loader.jar")))
+                   if os.path.exists(path)]
+        return "+".join(loaders) or "vanilla"
 
     def launch_minecraft(self, version_id, username, ram_gb=2):
+        self.prefetcher.pause()  # also covers a Java runtime install
+        try:
+            return self._launch_minecraft(version_id, username, ram_gb)
+        finally:
+            self.prefetcher.resume()
+
+    def _launch_minecraft(self, version_id, username, ram_gb):
         version_dir = os.path.join(VERSIONS_DIR, version_id)
         minecraft_jar = os.path.join(version_dir, f"{version_id}.jar")
 
@@ -454,46 +317,18 @@ class MinecraftLauncher:
                 self.log("✗ Failed to download Minecraft.")
                 return False
 
-        if not self.check_java():
-            return False
-
         self.log("Building classpath...")
-        classpath = self.build_classpath(version_id, ram_gb)
-        with open(os.path.join(version_dir, f"{version_id}.json"), 'r') as f:
-            version_data = json.load(f)
-
-        java_path = self.get_java_path()
-        cmd = [
-            java_path,
-            f'-Xmx{ram_gb}G',
-            f'-Xms{max(1, ram_gb//2)}G',
-            '-XX:+UseG1GC',
-            '-XX:MaxGCPauseMillis=20',
-            '-XX:G1HeapRegionSize=32M',
-            '-XX:-OmitStackTraceInFastThrow',
-            '-XX:+AlwaysPreTouch'
-        ]
-        if platform.system() == 'Darwin':
-            cmd.append('-XstartOnFirstThread')
-
-        natives_dir = os.path.join(version_dir, "natives")
-        cmd.extend([
-            f'-Djava.library.path={natives_dir}',
-            '-cp', classpath,
-            version_data['mainClass'],
-            '--username', username,
-            '--version', version_id,
-            '--gameDir', CTLAUNCHER_DIR,
-            '--assetsDir', ASSETS_DIR,
-            '--assetIndex', version_data['assetIndex']['id'],
-            '--uuid', self.generate_offline_uuid(username),
-            '--accessToken', '0',
-            '--userType', 'legacy',
-            '--versionType', 'release'
-        ])
+        plan = self.core.launch_plan(version_id, loader=self.installed_loader(version_id),
+                                     extra_jvm_args=JVM_FLAGS, extra_classpath=self.loader_jars(version_id))
+        java_major = plan['java_major']
+        if not self.check_java(java_major):
+            return False
+        cmd = self.core.command(version_id, username, ram_gb, self.get_java_path(java_major), plan=plan,
+                                min_ram_gb=max(1, ram_gb // 2))
         self.log(f"🔥 Launching Cracked Minecraft {version_id} as {username} with {ram_gb}GB RAM (Optimized)...")
         try:
             subprocess.Popen(cmd, cwd=CTLAUNCHER_DIR)
+            self.recent_versions.touch(version_id)
             self.log("✓ Minecraft launched successfully! (Offline/Cracked Mode)")
             return True
         except Exception as e:
@@ -516,8 +351,8 @@ class CTLauncherGUI:
         self.root.geometry("900x600")
         self.root.configure(bg=THEME['bg'])
 
-        self.launcher = MinecraftLauncher(log_callback=self.append_log)
-        self.executor = ThreadPoolExecutor(max_workers=2)
+        self.bus = ProgressBus(rotating_log(LOG_FILE))
+        self.launcher = MinecraftLauncher(bus=self.bus)
         self.ram_var = tk.IntVar(value=2)
 
         # Configure ttk styles for light theme
@@ -528,6 +363,9 @@ class CTLauncherGUI:
         self.style.configure('TButton', background=THEME['accent'], foreground='white')
 
         self.create_widgets()
+        self.bus.attach(self.root, self.render_log, lambda text: self.progress_label.config(text=text))
+        if self.launcher.load_cached_manifest():
+            self.show_versions()
         # Initial safety check for TLauncher integration
         threading.Thread(target=self.launcher.check_tlauncher_source_safety, daemon=True).start()
 
@@ -557,6 +395,7 @@ class CTLauncherGUI:
 
         self.version_combo = ttk.Combobox(sidebar, width=25)
         self.version_combo.pack(pady=5)
+        self.version_combo.bind("<KeyRelease>", self.filter_versions)
 
         username_label = tk.Label(sidebar, text="Username:", bg=THEME['sidebar'], fg=THEME['fg'])
         username_label.pack(pady=(15, 0))
@@ -593,10 +432,20 @@ class CTLauncherGUI:
         self.play_button = ttk.Button(sidebar, text="Play (Cracked)", command=self.play_game)
         self.play_button.pack(pady=10)
 
+        # Aggregated download progress, refreshed by the bus
+        self.progress_label = tk.Label(self.root, text="", anchor='w', bg=THEME['bg'], fg=THEME['log_fg'])
+        self.progress_label.pack(fill='x', padx=10, pady=(10, 0))
+
+        # Log search: Enter searches the full history in LOG_FILE, an empty search shows the live tail
+        self.log_search = ttk.Entry(self.root)
+        self.log_search.pack(fill='x', padx=10, pady=(5, 0))
+        self.log_search.bind('<Return>', lambda event: self.log_view.search(self.log_search.get()))
+
         # Log area
         self.log_box = scrolledtext.ScrolledText(self.root, bg=THEME['log_bg'], fg=THEME['log_fg'],
                                                  state='disabled', wrap='word')
         self.log_box.pack(fill='both', expand=True, padx=10, pady=10)
+        self.log_view = LogView(self.log_box, history_path=LOG_FILE)  # bounded ring of recent lines
 
         # Initial Java check
         threading.Thread(target=self.check_initial_java, daemon=True).start()
@@ -652,19 +501,27 @@ class CTLauncherGUI:
             self.java_label.config(fg='red')
 
     def append_log(self, text):
-        self.log_box.configure(state='normal')
-        self.log_box.insert(tk.END, text + "\n")
-        self.log_box.configure(state='disabled')
-        self.log_box.see(tk.END)
-        self.root.update_idletasks()
+        self.bus.log(text)  # safe from any thread; rendered by render_log
+
+    def render_log(self, lines):
+        self.log_view.append(lines)
+
+    def show_versions(self):
+        versions = self.launcher.version_index.ordered
+        self.version_combo.config(values=versions)
+        if versions:
+            self.version_combo.set(versions[0])
+
+    def filter_versions(self, event=None):
+        """Narrow the dropdown to versions starting with what has been typed."""
+        if event is not None and event.keysym in ("Up", "Down", "Return", "Escape", "Tab"):
+            return
+        self.version_combo.config(values=self.launcher.version_index.search(self.version_combo.get().strip()))
 
     def fetch_versions(self):
         def task():
             if self.launcher.fetch_version_manifest():
-                versions = [v['id'] for v in self.launcher.version_manifest['versions'][:50]]
-                self.root.after(0, lambda: self.version_combo.config(values=versions))
-                if versions:
-                    self.root.after(0, lambda: self.version_combo.set(versions[0]))
+                self.root.after(0, self.show_versions)
         threading.Thread(target=task, daemon=True).start()
 
     def play_game(self):
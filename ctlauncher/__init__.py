@@ -0,0 +1,43 @@
+"""Shared, GUI-free backend used by the CTLauncher front ends.
+
+Submodules are imported on first attribute access, so ``python -m ctlauncher
+--help`` does not pay for ssl, sqlite3 and asyncio.
+"""
+
+import importlib
+
+_EXPORTS = {
+    "AssetIndex": "assetindex", "JobFeed": "assetindex",
+    "AssetPlanner": "assetplan",
+    "AssetSync": "assetsync", "DownloadJob": "assetsync", "SyncProgress": "assetsync", "asset_jobs": "assetsync",
+    "LauncherCore": "core", "offline_uuid": "core",
+    "JavaInfo": "javaprobe", "JavaRegistry": "javaprobe",
+    "LaunchPlanCache": "launchplan", "render": "launchplan",
+    "LogView": "logview",
+    "ManifestCache": "manifest", "VersionIndex": "manifest",
+    "Mirror": "mirror", "MirrorBuilder": "mirror", "MirrorServer": "mirror",
+    "NativesCache": "natives",
+    "ChecksumError": "net", "Downloader": "net", "DownloadError": "net", "HTTPError": "net", "sha1_file": "net",
+    "Prefetcher": "prefetch", "RecentVersions": "prefetch",
+    "ProgressBus": "progress", "rotating_log": "progress", "search_history": "progress",
+    "Environment": "rules", "RuleEngine": "rules", "compile_rules": "rules", "rules_allow": "rules",
+    "RuntimeManager": "runtimes", "required_major": "runtimes",
+    "Scheduler": "scheduler",
+    "ContentStore": "store",
+    "VerifiedIndex": "verifyindex",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,232 @@
+"""Asset indexes as compact parallel arrays instead of a dict of dicts.
+
+A 1.21 index lists some 4000 objects; ``json.load`` turns each into a dict
+with two boxed values under a name string, and a job list built from that
+holds a URL and a path string per object on top. :class:`AssetIndex` keeps a
+packed 20-byte SHA-1 and a size per object (names only when asked for),
+filled by a scanner that decodes one object at a time, and hands objects to
+the downloader as jobs made on demand.
+"""
+
+import array
+import json
+import os
+import re
+from collections.abc import ItemsView, Mapping
+from json.decoder import scanstring
+
+from .assetsync import ASSETS_BASE_URL, DownloadJob
+
+HASH_SIZE = 20
+
+_WS = re.compile(r"[ \t\n\r]*")
+_DECODER = json.JSONDecoder()
+# The shape Mojang's indexes always have: ``, "name": {"hash": "<sha1>", "size": n}`` with no escapes.
+# Anything else goes through the general path.
+_ENTRY = re.compile(r'[ \t\n\r]*(,?)[ \t\n\r]*"([^"\\]*)"[ \t\n\r]*:[ \t\n\r]*'
+                    r'\{[ \t\n\r]*"hash"[ \t\n\r]*:[ \t\n\r]*"([0-9a-fA-F]{40})"[ \t\n\r]*,'
+                    r'[ \t\n\r]*"size"[ \t\n\r]*:[ \t\n\r]*(\d+)[ \t\n\r]*\}')
+
+
+def _skip(text, i):
+    return _WS.match(text, i).end()
+
+
+def _expect(text, i, char):
+    i = _skip(text, i)
+    if not text.startswith(char, i):
+        raise json.JSONDecodeError(f"Expecting {char!r}", text, i)
+    return i + 1
+
+
+def _member(text, i, first):
+    """``(key, value_start)`` of the next member of an object, or ``(None, end)`` after its closing brace."""
+    i = _skip(text, i)
+    if text.startswith("}", i):
+        return None, i + 1
+    if not first:
+        i = _skip(text, _expect(text, i, ","))
+    if not text.startswith('"', i):
+        raise json.JSONDecodeError("Expecting property name enclosed in double quotes", text, i)
+    key, i = scanstring(text, i + 1)
+    return key, _skip(text, _expect(text, i, ":"))
+
+
+def iter_objects(text, meta=None):
+    """Yield ``(name, hash, size)`` for each entry of an index's ``objects``, decoding one at a time.
+
+    Other top-level members (``virtual``, ``map_to_resources``) are stored
+    in ``meta``, if given, as they are passed.
+    """
+    i = _expect(text, 0, "{")
+    first = True
+    while True:
+        key, i = _member(text, i, first)
+        first = False
+        if key is None:
+            return
+        if key != "objects":
+            value, i = _DECODER.raw_decode(text, i)
+            if meta is not None:
+                meta[key] = value
+            continue
+        i = _expect(text, i, "{")
+        first_object = True
+        while True:
+            match = _ENTRY.match(text, i)
+            if match and bool(match.group(1)) != first_object:
+                first_object = False
+                i = match.end()
+                yield match.group(2), match.group(3), int(match.group(4))
+                continue
+            name, i = _member(text, i, first_object)
+            first_object = False
+            if name is None:
+                break
+            info, i = _DECODER.raw_decode(text, i)
+            yield name, info["hash"], info.get("size", 0)
+
+
+class JobFeed:
+    """``count`` download jobs made only as they are iterated.
+
+    :class:`~ctlauncher.assetsync.AssetSync` adds ``len()`` of a follow-up
+    to its total, so this keeps the progress bar right without a job list.
+    """
+
+    __slots__ = ("count", "factory")
+
+    def __init__(self, count, factory):
+        self.count = count
+        self.factory = factory
+
+    def __len__(self):
+        return self.count
+
+    def __iter__(self):
+        return iter(self.factory())
+
+
+class AssetIndex:
+    """An asset index's objects: ``digests`` (20 bytes each), ``sizes`` and, unless dropped, ``names``.
+
+    Entry ``i`` is ``digests[20*i:20*i+20]``, ``sizes[i]``, ``names[i]``.
+    ``objects`` is a read-only ``{name: {"hash", "size"}}`` view for code
+    written against the parsed JSON.
+    """
+
+    def __init__(self, keep_names=True):
+        self.digests = bytearray()
+        self.sizes = array.array("q")
+        self.names = [] if keep_names else None
+        self.meta = {}
+
+    @classmethod
+    def parse(cls, text, keep_names=True):
+        index = cls(keep_names)
+        for name, hash_, size in iter_objects(text, index.meta):
+            index.append(name, hash_, size)
+        return index
+
+    @classmethod
+    def load(cls, path, keep_names=True):
+        """Read ``assets/indexes/<id>.json``; raises OSError or ValueError (KeyError for an entry without a hash)."""
+        with open(path, encoding="utf-8") as f:
+            return cls.parse(f.read(), keep_names)
+
+    @classmethod
+    def from_objects(cls, objects, keep_names=True):
+        """Pack an already parsed ``objects`` mapping."""
+        index = cls(keep_names)
+        for name, info in objects.items():
+            index.append(name, info["hash"], info.get("size", 0))
+        return index
+
+    def append(self, name, hash_, size):
+        self.digests += bytes.fromhex(hash_)
+        self.sizes.append(size or 0)
+        if self.names is not None:
+            self.names.append(name)
+
+    def __len__(self):
+        return len(self.sizes)
+
+    def digest(self, i):
+        return bytes(self.digests[i * HASH_SIZE:(i + 1) * HASH_SIZE])
+
+    def hash(self, i):
+        return self.digests[i * HASH_SIZE:(i + 1) * HASH_SIZE].hex()
+
+    def iter_digests(self):
+        view = memoryview(self.digests)
+        for start in range(0, len(view), HASH_SIZE):
+            yield bytes(view[start:start + HASH_SIZE])
+
+    def entries(self):
+        """Yield ``(name, hash, size)``; ``name`` is None when names were dropped."""
+        for i, digest in enumerate(self.iter_digests()):
+            yield (self.names[i] if self.names is not None else None), digest.hex(), self.sizes[i]
+
+    @property
+    def total_size(self):
+        return sum(self.sizes)
+
+    def select(self, exclude=()):
+        """A new index with the first entry of each hash not in ``exclude`` (a set of digests)."""
+        selected = AssetIndex(self.names is not None)
+        seen = set()
+        for i, digest in enumerate(self.iter_digests()):
+            if digest in exclude or digest in seen:
+                continue
+            seen.add(digest)
+            selected.digests += digest
+            selected.sizes.append(self.sizes[i])
+            if selected.names is not None:
+                selected.names.append(self.names[i])
+        return selected
+
+    def jobs(self, objects_dir, base_url=ASSETS_BASE_URL):
+        """A :class:`JobFeed` with a :class:`DownloadJob` per entry, named after the object (or its hash)."""
+        def make():
+            for name, hash_, size in self.entries():
+                yield DownloadJob(f"{base_url}/{hash_[:2]}/{hash_}", os.path.join(objects_dir, hash_[:2], hash_),
+                                  hash_, size, name or hash_)
+        return JobFeed(len(self), make)
+
+    @property
+    def objects(self):
+        return ObjectsView(self)
+
+
+class ObjectsView(Mapping):
+    """``{name: {"hash": ..., "size": ...}}`` over an :class:`AssetIndex`; values are built on access."""
+
+    def __init__(self, index):
+        if index.names is None:
+            raise ValueError("This asset index was loaded without names")
+        self._index = index
+        self._positions = None
+
+    def _info(self, i):
+        return {"hash": self._index.hash(i), "size": self._index.sizes[i]}
+
+    def __getitem__(self, name):
+        if self._positions is None:
+            self._positions = {n: i for i, n in enumerate(self._index.names)}
+        return self._info(self._positions[name])
+
+    def __iter__(self):
+        return iter(self._index.names)
+
+    def __len__(self):
+        return len(self._index)
+
+    def items(self):
+        return _Items(self)
+
+
+class _Items(ItemsView):
+    def __iter__(self):
+        # One pass over the arrays instead of a name lookup per entry
+        for name, hash_, size in self._mapping._index.entries():
+            yield name, {"hash": hash_, "size": size}
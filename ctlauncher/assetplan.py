@@ -0,0 +1,76 @@
+"""Plan asset downloads as a delta against the indexes that are already installed."""
+
+import json
+import os
+
+from .assetindex import AssetIndex
+from .net import _write_atomic
+
+COMPLETE_FILE = "complete_indexes.json"
+
+
+class AssetPlanner:
+    """Diff a new asset index against the objects of fully installed ones.
+
+    Most objects are shared between asset indexes, so only the hashes no
+    complete index lists need a stat (or a download) at all. An index counts
+    as complete once ``mark_complete`` is called after every one of its
+    objects landed. The record keeps the index file's size and mtime, so a
+    re-downloaded index with the same id is not trusted until it completes
+    again. ``deep=True`` trusts nothing and plans every object.
+    """
+
+    def __init__(self, assets_dir, deep=False):
+        self.indexes_dir = os.path.join(assets_dir, "indexes")
+        self.record_path = os.path.join(assets_dir, COMPLETE_FILE)
+        self.deep = deep
+        self._known = None
+
+    def _index_path(self, index_id):
+        return os.path.join(self.indexes_dir, f"{index_id}.json")
+
+    def _load_record(self):
+        try:
+            with open(self.record_path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def known(self):
+        """SHA-1 digests (20 bytes) of every object listed by a complete, unchanged index."""
+        if self._known is None:
+            known = set()
+            for index_id, stamp in ({} if self.deep else self._load_record()).items():
+                path = self._index_path(index_id)
+                try:
+                    st = os.stat(path)
+                    if [st.st_size, st.st_mtime_ns] != stamp:
+                        continue
+                    index = AssetIndex.load(path, keep_names=False)
+                except (OSError, ValueError, KeyError):
+                    continue
+                known.update(index.iter_digests())
+            self._known = known
+        return self._known
+
+    def plan(self, objects):
+        """``(missing, size)``: the objects no complete index has, one name per hash, and their bytes.
+
+        ``objects`` is an :class:`~ctlauncher.assetindex.AssetIndex` (or a
+        parsed ``objects`` mapping); ``missing`` is an ``AssetIndex`` too.
+        """
+        index = objects if isinstance(objects, AssetIndex) else AssetIndex.from_objects(objects)
+        missing = index.select(self.known())
+        return missing, missing.total_size
+
+    def mark_complete(self, index_id):
+        """Record that every object of ``assets/indexes/<index_id>.json`` is on disk."""
+        try:
+            st = os.stat(self._index_path(index_id))
+        except OSError:
+            return
+        record = self._load_record()
+        record[index_id] = [st.st_size, st.st_mtime_ns]
+        os.makedirs(os.path.dirname(self.record_path), exist_ok=True)
+        _write_atomic(self.record_path, json.dumps(record, indent=1, sort_keys=True).encode())
+        self._known = None
@@ -0,0 +1,197 @@
+"""Asyncio bulk download engine: bounded concurrency, adaptive per-host windows, one progress counter."""
+
+import asyncio
+import collections
+import os
+import sqlite3
+import time
+import urllib.parse
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+from .net import DownloadError
+from .scheduler import Scheduler
+
+ASSETS_BASE_URL = "https://resources.download.minecraft.net"
+LIBRARY_BASE_URL = "https://libraries.minecraft.net/"   # for old version JSONs whose artifacts carry no url
+CONCURRENCY = 16      # requests in flight across all hosts (per-host windows adapt below this)
+
+# ``then(job, fetched)``, if set, runs in the worker pool once the file is in place
+# (``fetched`` is False when the copy on disk was already current). It may return
+# further jobs, which are queued straight away: this is how dependent steps such as
+# "asset index -> objects" or "native jar -> extract" are chained into one run.
+DownloadJob = namedtuple("DownloadJob", "url path sha1 size name then", defaults=(None,))
+
+
+def asset_jobs(objects, objects_dir, base_url=ASSETS_BASE_URL):
+    """Yield a :class:`DownloadJob` for every entry of an asset index ``objects`` mapping."""
+    for name, info in objects.items():
+        hash_ = info["hash"]
+        yield DownloadJob(f"{base_url}/{hash_[:2]}/{hash_}",
+                          os.path.join(objects_dir, hash_[:2], hash_),
+                          hash_, info.get("size"), name)
+
+
+def _exists(job):
+    return os.path.exists(job.path)
+
+
+class SyncProgress:
+    """Aggregated counters for one run; only touched on the event loop thread."""
+
+    def __init__(self, total=None):
+        self.total = total
+        self.done = 0
+        self.downloaded = 0
+        self.skipped = 0
+        self.bytes = 0
+        self.retries = 0
+        self.failed = []    # (job, error message)
+
+    @property
+    def ok(self):
+        return not self.failed
+
+
+class AssetSync:
+    """Stream a job graph through a bounded pool of concurrent fetches.
+
+    Jobs are pulled lazily from the iterable through a bounded queue, so a
+    slow network applies backpressure instead of materialising every future.
+    Jobs returned by a finished job's ``then`` are queued as soon as it lands;
+    a job that fails never runs its ``then``. Each path is fetched once per
+    run; later jobs for the same path are dropped from ``total``.
+    Requests per host are limited by the :class:`~ctlauncher.scheduler.Scheduler`'s
+    adaptive window; a failed job goes back on a timer for its retry, so no
+    worker sits out the backoff.
+    ``is_current(job)`` decides whether a file on disk can be kept (a file
+    it raises OSError or sqlite3.Error for is downloaded again) and
+    ``on_fetched(job)`` sees every file just downloaded, both in the worker
+    pool; ``on_progress(progress)`` runs on the calling thread.
+    """
+
+    def __init__(self, downloader, concurrency=CONCURRENCY, scheduler=None, is_current=None, on_progress=None,
+                 on_fetched=None):
+        self.downloader = downloader
+        self.concurrency = concurrency
+        self.scheduler = scheduler or Scheduler(maximum=concurrency)
+        self.is_current = is_current or _exists
+        self.on_progress = on_progress
+        self.on_fetched = on_fetched
+
+    def run(self, jobs, total=None):
+        """Download every job and return the final :class:`SyncProgress`."""
+        if total is None and hasattr(jobs, "__len__"):
+            total = len(jobs)
+        return asyncio.run(self._run(iter(jobs), SyncProgress(total)))
+
+    async def _run(self, jobs, progress):
+        loop = asyncio.get_running_loop()
+        queue = asyncio.Queue(maxsize=self.concurrency * 2)
+        sources = collections.deque([jobs])     # the root iterable, then follow-ups
+        retries = collections.deque()           # (job, attempt) whose backoff has passed
+        landed = asyncio.Event()
+        in_flight = 0                           # queued, running or waiting to be retried
+        seen = set()    # several asset names can share one object; fetch each path once
+
+        def retry(job, attempt):
+            retries.append((job, attempt))
+            landed.set()
+
+        with ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="assetsync") as executor:
+            async def produce():
+                nonlocal in_flight
+                while sources or in_flight:
+                    if retries:
+                        await queue.put(retries.popleft())
+                        continue
+                    job = next(sources[0], None) if sources else None
+                    if job is not None:
+                        if job.path in seen:
+                            if progress.total is not None:
+                                progress.total -= 1
+                            continue
+                        seen.add(job.path)
+                        in_flight += 1
+                        await queue.put((job, 0))
+                    elif sources:
+                        sources.popleft()
+                    else:
+                        # Everything queued so far is in flight; wait for follow-ups, retries or the end
+                        landed.clear()
+                        await landed.wait()
+                for _ in range(self.concurrency):
+                    await queue.put(None)
+
+            async def work():
+                nonlocal in_flight
+                while True:
+                    item = await queue.get()
+                    if item is None:
+                        return
+                    job, attempt = item
+                    delay, follow_ups = await self._process(loop, executor, job, attempt, progress)
+                    if delay is not None:
+                        loop.call_later(delay, retry, job, attempt + 1)
+                        continue
+                    if follow_ups is not None:
+                        if progress.total is not None and hasattr(follow_ups, "__len__"):
+                            progress.total += len(follow_ups)
+                        sources.append(iter(follow_ups))
+                    in_flight -= 1
+                    landed.set()
+                    progress.done += 1
+                    if self.on_progress:
+                        self.on_progress(progress)
+
+            await asyncio.gather(produce(), *(work() for _ in range(self.concurrency)))
+        return progress
+
+    async def _process(self, loop, executor, job, attempt, progress):
+        """Bring one job's file up to date; returns ``(retry_delay, follow_ups)``."""
+        if attempt == 0 and await loop.run_in_executor(executor, self._is_current, job):
+            progress.skipped += 1
+            return None, await self._then(loop, executor, job, False, progress)
+        host = self.scheduler.host(urllib.parse.urlsplit(job.url).netloc)
+        await host.acquire()
+        start = time.monotonic()
+        try:
+            size = await loop.run_in_executor(executor, self._download, job)
+        except (DownloadError, OSError) as e:
+            host.failure(e, start)
+            delay = self.scheduler.retry_in(e, attempt)
+            if delay is None:
+                progress.failed.append((job, str(e)))
+            else:
+                progress.retries += 1
+            return delay, None
+        except BaseException:
+            host.abandon()
+            raise
+        host.success(time.monotonic() - start, size)
+        progress.downloaded += 1
+        progress.bytes += size
+        return None, await self._then(loop, executor, job, True, progress)
+
+    async def _then(self, loop, executor, job, fetched, progress):
+        if job.then is None:
+            return None
+        try:
+            return await loop.run_in_executor(executor, job.then, job, fetched)
+        except Exception as e:
+            progress.failed.append((job, str(e)))
+            return None
+
+    def _is_current(self, job):
+        # A stat or verified-index error on one file means downloading it again, not ending the run
+        try:
+            return self.is_current(job)
+        except (OSError, sqlite3.Error):
+            return False
+
+    def _download(self, job):
+        os.makedirs(os.path.dirname(job.path), exist_ok=True)
+        size = self.downloader.fetch(job.url, job.path, job.sha1, job.size)
+        if self.on_fetched:
+            self.on_fetched(job)
+        return size
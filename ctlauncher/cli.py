@@ -0,0 +1,238 @@
+"""Headless ``ctlauncher`` command line: ``sync``, ``launch``, ``verify``, ``java``, ``store`` and ``mirror``.
+
+Every command prints JSON lines on stdout, one event per line::
+
+    {"event": "log", "message": "..."}
+    {"event": "progress", "done": 120, "total": 3400, "bytes": 1048576, "failed": 0}
+    {"event": "result", ...}
+    {"event": "error", "message": "..."}
+
+and exits non-zero after an ``error`` event. Only argparse is imported up
+front; the launcher core is imported by the command that needs it, so
+``--help`` stays fast.
+"""
+
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+
+PROGRESS_INTERVAL = 0.1   # seconds between progress events (~10 Hz)
+DEFAULT_ROOT = os.path.join("~", ".ctlauncher")
+
+
+class _Emitter:
+    """Write events as JSON lines; thread-safe, progress events rate limited."""
+
+    def __init__(self, stream=None, interval=PROGRESS_INTERVAL):
+        self.stream = stream or sys.stdout
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._last_progress = 0.0
+
+    def emit(self, event, **fields):
+        line = json.dumps(dict(event=event, **fields), default=str)
+        with self._lock:
+            self.stream.write(line + "\n")
+            self.stream.flush()
+
+    def log(self, message):
+        self.emit("log", message=message)
+
+    def progress(self, progress, force=False):
+        now = time.monotonic()
+        if not force and now - self._last_progress < self.interval:
+            return
+        self._last_progress = now
+        self.emit("progress", done=progress.done, total=progress.total, bytes=progress.bytes,
+                  failed=len(progress.failed))
+
+
+def _store(args):
+    from .store import DEFAULT_STORE, STORE_ENV, ContentStore
+    return ContentStore(os.path.expanduser(args.store or os.environ.get(STORE_ENV) or DEFAULT_STORE))
+
+
+def _core(args, out):
+    from .core import LauncherCore
+    from .mirror import Mirror
+    return LauncherCore(os.path.expanduser(args.root), log=out.log, on_progress=out.progress,
+                        deep_verify=getattr(args, "deep", False), manifest_url=args.manifest_url,
+                        assets_url=args.assets_url, store=_store(args) if args.store else None,
+                        mirror=Mirror(args.mirror) if args.mirror else None)
+
+
+def _sync(core, version_id, out):
+    result = core.sync(version_id)
+    out.progress(result, force=True)
+    return result
+
+
+def cmd_sync(args, out):
+    core = _core(args, out)
+    version_id = core.resolve(args.version)
+    result = _sync(core, version_id, out)
+    out.emit("result", version=version_id, downloaded=result.downloaded, skipped=result.skipped,
+             bytes=result.bytes, failed=[{"name": job.name, "error": error} for job, error in result.failed])
+    return 0 if result.ok else 1
+
+
+def cmd_verify(args, out):
+    core = _core(args, out)
+    version_id = core.resolve(args.version)
+    checked, problems = core.verify(version_id)
+    out.emit("result", version=version_id, checked=checked,
+             problems=[{"name": job.name, "path": job.path, "problem": problem} for job, problem in problems])
+    return 1 if problems else 0
+
+
+def cmd_java(args, out):
+    core = _core(args, out)
+    if args.for_version:
+        from .runtimes import required_major
+        major = required_major(core.version_data(core.resolve(args.for_version)))
+    elif args.major:
+        major = args.major
+    else:
+        raise ValueError("give a Java major version or --for VERSION")
+    java_bin = core.java(major, install=args.install)
+    out.emit("result", major=major, java=java_bin)
+    return 0 if java_bin else 1
+
+
+def cmd_launch(args, out):
+    core = _core(args, out)
+    version_id = core.resolve(args.version)
+    if not args.no_sync:
+        _sync(core, version_id, out)
+    if args.dry_run:
+        # Show the command without installing a runtime for it
+        plan = core.launch_plan(version_id)
+        java_bin = core.java(plan["java_major"], install=False) or "java"
+        out.emit("result", version=version_id,
+                 command=core.command(version_id, args.username, args.ram, java_bin, plan=plan))
+        return 0
+    command = core.command(version_id, args.username, args.ram)
+    process = core.launch(version_id, command=command)
+    out.emit("result", version=version_id, pid=process.pid, command=command)
+    return 0
+
+
+def cmd_store(args, out):
+    store = _store(args)
+    if args.action == "import":
+        totals = {}
+        for root in args.roots or [args.root]:
+            root = os.path.expanduser(root)
+            stats = store.import_tree(root)
+            out.log(f"Imported {root}: {stats['files']} files, {stats['saved'] / 1048576:.1f} MB deduplicated")
+            for key, value in stats.items():
+                totals[key] = totals.get(key, 0) + value
+        out.emit("result", store=store.root, modes=store.modes, **totals)
+    else:
+        out.emit("result", store=store.root, dry_run=args.dry_run, **store.gc(dry_run=args.dry_run))
+    store.close()
+    return 0
+
+
+def cmd_mirror_build(args, out):
+    from .mirror import MirrorBuilder
+    from .net import Downloader
+    from .verifyindex import VerifiedIndex
+    directory = os.path.abspath(os.path.expanduser(args.directory))
+    platforms = [tuple(p.split("/", 1)) for p in args.java_platform] if args.java_platform else None
+    if args.no_java:
+        platforms = []
+    verified = VerifiedIndex(os.path.join(directory, ".verified.sqlite3"))
+    kwargs = {"manifest_url": args.manifest_url} if args.manifest_url else {}
+    if args.assets_url:
+        kwargs["assets_url"] = args.assets_url
+    builder = MirrorBuilder(Downloader(verified=verified), directory, java_platforms=platforms,
+                            store=_store(args) if args.store else None, log=out.log, on_progress=out.progress,
+                            **kwargs)
+    result = builder.build(args.versions, args.url)
+    out.emit("result", directory=directory, **result)
+    return 1 if result["failed"] else 0
+
+
+def cmd_mirror_serve(args, out):
+    from .mirror import MirrorServer
+    server = MirrorServer(os.path.expanduser(args.directory), args.bind, args.port, quiet=not args.verbose)
+    out.emit("serving", url=server.url, directory=server.directory)
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
+    return 0
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="ctlauncher", description="Headless CTLauncher: JSON lines on stdout.")
+    parser.add_argument("--root", default=DEFAULT_ROOT, help="game directory (default: %(default)s)")
+    parser.add_argument("--manifest-url", help="version manifest to use instead of Mojang's")
+    parser.add_argument("--assets-url", help="asset object server to use instead of Mojang's")
+    parser.add_argument("--store", help="shared content store to link files from (default: $CTLAUNCHER_STORE)")
+    parser.add_argument("--mirror", help="mirror server to fetch everything from (default: $CTLAUNCHER_MIRROR)")
+    commands = parser.add_subparsers(dest="command", required=True, metavar="COMMAND")
+
+    sync = commands.add_parser("sync", help="download everything a version needs")
+    sync.add_argument("version", help="version id, or latest / release / snapshot")
+    sync.set_defaults(func=cmd_sync)
+
+    launch = commands.add_parser("launch", help="sync a version, then start it")
+    launch.add_argument("version", help="version id, or latest / release / snapshot")
+    launch.add_argument("--username", default="Player")
+    launch.add_argument("--ram", type=int, default=2, help="max heap in GB (default: %(default)s)")
+    launch.add_argument("--no-sync", action="store_true", help="start with whatever is installed")
+    launch.add_argument("--dry-run", action="store_true", help="print the command instead of running it")
+    launch.set_defaults(func=cmd_launch)
+
+    verify = commands.add_parser("verify", help="check an installed version against its checksums")
+    verify.add_argument("version", help="version id, or latest / release / snapshot")
+    verify.add_argument("--deep", action="store_true", help="rehash every file instead of trusting the index")
+    verify.set_defaults(func=cmd_verify)
+
+    java = commands.add_parser("java", help="find (or install) a Java runtime")
+    java.add_argument("major", type=int, nargs="?", help="Java major version, e.g. 21")
+    java.add_argument("--for", dest="for_version", metavar="VERSION", help="the major a game version needs")
+    java.add_argument("--install", action="store_true", help="install the runtime if it is missing")
+    java.set_defaults(func=cmd_java)
+
+    store = commands.add_parser("store", help="dedupe launcher roots into the shared store, or clean it up")
+    store.add_argument("action", choices=("import", "gc"))
+    store.add_argument("roots", nargs="*", metavar="ROOT", help="launcher roots to import (default: --root)")
+    store.add_argument("--dry-run", action="store_true", help="gc: report what would be removed")
+    store.set_defaults(func=cmd_store)
+
+    mirror = commands.add_parser("mirror", help="build or serve an offline mirror")
+    mirror_commands = mirror.add_subparsers(dest="mirror_command", required=True, metavar="ACTION")
+    build = mirror_commands.add_parser("build", help="snapshot versions (and their Java runtimes) into DIR")
+    build.add_argument("directory", metavar="DIR")
+    build.add_argument("versions", nargs="+", metavar="VERSION", help="version ids, or latest / release / snapshot")
+    build.add_argument("--url", action="append", default=[], help="also mirror this URL (e.g. a Forge installer)")
+    build.add_argument("--java-platform", action="append", metavar="OS/ARCH",
+                       help="Adoptium os/arch to mirror Java for, e.g. windows/x64 (default: this machine)")
+    build.add_argument("--no-java", action="store_true", help="do not mirror Java runtimes")
+    build.set_defaults(func=cmd_mirror_build)
+    serve = mirror_commands.add_parser("serve", help="serve DIR over HTTP")
+    serve.add_argument("directory", metavar="DIR")
+    serve.add_argument("--bind", default="0.0.0.0", help="address to listen on (default: %(default)s)")
+    serve.add_argument("--port", type=int, default=8000)
+    serve.add_argument("--verbose", action="store_true", help="log every request on stderr")
+    serve.set_defaults(func=cmd_mirror_serve)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    out = _Emitter()
+    try:
+        return args.func(args, out)
+    except KeyboardInterrupt:
+        out.emit("error", message="interrupted")
+        return 130
+    except Exception as e:
+        out.emit("error", message=str(e), type=type(e).__name__)
+        return 1
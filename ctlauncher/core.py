@@ -0,0 +1,378 @@
+"""GUI-free launcher core: install, verify and launch versions under one game directory."""
+
+import hashlib
+import json
+import os
+import subprocess
+import zipfile
+
+from .assetindex import AssetIndex
+from .assetplan import AssetPlanner
+from .assetsync import ASSETS_BASE_URL, LIBRARY_BASE_URL, AssetSync, DownloadJob
+from .javaprobe import JavaRegistry
+from .launchplan import LaunchPlanCache, render
+from .manifest import VERSION_MANIFEST_URL, ManifestCache, VersionIndex
+from .mirror import Mirror
+from .natives import NativesCache
+from .net import DOWNLOAD_TIMEOUT, USER_AGENT, DownloadError, Downloader
+from .rules import RuleEngine
+from .runtimes import RuntimeManager, required_major
+from .scheduler import Scheduler
+from .store import ContentStore
+from .verifyindex import VerifiedIndex
+
+DEFAULT_ROOT = os.path.expanduser("~/.ctlauncher")
+LAUNCHER_NAME = "CTLauncher"
+LAUNCHER_VERSION = "1.0"
+ALIASES = ("latest", "release", "snapshot")
+# Metadata the store does not share; like ContentStore.import_tree, only jars and asset objects go there
+UNSHARED_JOBS = ("asset index ", "log config ")
+
+
+def _parse_version(path):
+    with open(path, "rb") as f:
+        raw = f.read()
+    return json.loads(raw), hashlib.sha1(raw).hexdigest()
+
+
+def offline_uuid(username):
+    """Offline-mode UUID for ``username``, formatted from the MD5 of ``OfflinePlayer:<name>``."""
+    h = hashlib.md5(f"OfflinePlayer:{username}".encode("utf-8")).hexdigest()
+    return f"{h[:8]}-{h[8:12]}-{h[12:16]}-{h[16:20]}-{h[20:32]}"
+
+
+class LauncherCore:
+    """Everything a launch needs, with no GUI: the directory layout, caches, downloads and the command line.
+
+    ``log(message)`` receives human-readable lines, possibly from download
+    worker threads; ``on_progress(progress)`` gets the
+    :class:`~ctlauncher.assetsync.SyncProgress` of a running sync on the
+    calling thread. Failures raise (``DownloadError``,
+    ``LookupError``) instead of showing dialogs, so front ends decide how to
+    surface them. ``env`` is the :class:`~ctlauncher.rules.Environment`
+    rules are evaluated against (this machine by default). ``store`` is a
+    :class:`~ctlauncher.store.ContentStore` shared with other roots; by
+    default the one named by ``$CTLAUNCHER_STORE``, if any. ``mirror``, a
+    :class:`~ctlauncher.mirror.Mirror` (default: ``$CTLAUNCHER_MIRROR``),
+    sends every request to a local mirror server instead.
+    """
+
+    def __init__(self, root=DEFAULT_ROOT, log=None, on_progress=None, deep_verify=False,
+                 user_agent=USER_AGENT, timeout=DOWNLOAD_TIMEOUT, verify=True, manifest_url=None, assets_url=None,
+                 env=None, store=None, mirror=None):
+        self.root = root
+        self.versions_dir = os.path.join(root, "versions")
+        self.libraries_dir = os.path.join(root, "libraries")
+        self.assets_dir = os.path.join(root, "assets")
+        self.cache_dir = os.path.join(root, "cache")
+        self.log = log or (lambda message: None)
+        self.on_progress = on_progress
+        self.assets_url = assets_url or ASSETS_BASE_URL
+        self.verified = VerifiedIndex(os.path.join(root, "verified.sqlite3"), deep=deep_verify)
+        self.mirror = mirror if mirror is not None else Mirror.from_env()
+        self.scheduler = Scheduler()   # per-host windows learned in one sync carry over to the next
+        self.downloader = Downloader(user_agent=user_agent, timeout=timeout, verify=verify, verified=self.verified,
+                                     rewrite=self.mirror.rewrite if self.mirror else None)
+        self.manifest_cache = ManifestCache(self.downloader, self.cache_dir, manifest_url or VERSION_MANIFEST_URL)
+        self.asset_planner = AssetPlanner(self.assets_dir, deep=deep_verify)
+        self.natives = NativesCache(os.path.join(root, "natives"), self.versions_dir)
+        self.launch_plans = LaunchPlanCache(os.path.join(self.cache_dir, "launch_plans"))
+        self.java_probes = JavaRegistry(os.path.join(self.cache_dir, "java_runtimes.json"))
+        self.runtimes = RuntimeManager(self.downloader, os.path.join(root, "java"), self.java_probes,
+                                       scheduler=self.scheduler)
+        self.rules = RuleEngine(env)
+        self.store = store if store is not None else ContentStore.from_env()
+        self.version_index = None   # a GUI sets this from its own (background) manifest refresh
+
+    # Versions
+
+    def index(self):
+        """The :class:`VersionIndex`, revalidating the manifest on first use (cached copy when offline)."""
+        if self.version_index is None:
+            self.version_index = VersionIndex(self.manifest_cache.load())
+        return self.version_index
+
+    def resolve(self, version):
+        """Map ``latest`` / ``release`` / ``snapshot`` to a version id; other ids pass through."""
+        if version not in ALIASES:
+            return version
+        latest = self.index().latest
+        return latest.get("snapshot" if version == "snapshot" else "release")
+
+    def version_dir(self, version_id):
+        return os.path.join(self.versions_dir, version_id)
+
+    def version_json_path(self, version_id):
+        return os.path.join(self.version_dir(version_id), f"{version_id}.json")
+
+    def version_data(self, version_id):
+        """The version JSON, downloaded on first use."""
+        return self.version_json(version_id)[0]
+
+    def version_json(self, version_id):
+        """``(data, digest)``: the version JSON and the SHA-1 of its file, which keys the memoized rules."""
+        path = self.version_json_path(version_id)
+        if not os.path.exists(path):
+            entry = self.index().get(version_id)
+            if entry is None:
+                raise LookupError(f"Version {version_id} not found in manifest")
+            os.makedirs(self.version_dir(version_id), exist_ok=True)
+            self.downloader.fetch(entry["url"], path, entry.get("sha1"))
+        return _parse_version(path)
+
+    # Downloads
+
+    def client_job(self, version_id, data):
+        client = data["downloads"]["client"]
+        return DownloadJob(client["url"], os.path.join(self.version_dir(version_id), f"{version_id}.jar"),
+                           client["sha1"], client.get("size"), f"client {version_id}")
+
+    def native_classifier(self, lib):
+        """The classifier download holding ``lib``'s natives for this OS, or None."""
+        key = self.rules.native_classifier(lib)
+        return lib.get("downloads", {}).get("classifiers", {}).get(key) if key else None
+
+    def library_jobs(self, data, digest=None):
+        for lib in self.rules.libraries(data, digest):
+            if "downloads" not in lib:
+                continue
+            name = lib.get("name", "unknown")
+            artifact = lib["downloads"].get("artifact")
+            if artifact:
+                yield self._library_job(artifact, f"library {name}")
+            native = self.native_classifier(lib)
+            if native:
+                yield self._library_job(native, f"native {name}")
+
+    def _library_job(self, info, name):
+        path = info["path"]
+        return DownloadJob(info.get("url") or LIBRARY_BASE_URL + path, os.path.join(self.libraries_dir, path),
+                           info.get("sha1"), info.get("size"), name)
+
+    def asset_index_job(self, data, objects=True):
+        """The asset index; with ``objects`` its new objects are queued as soon as it lands."""
+        asset_index = data["assetIndex"]
+        path = os.path.join(self.assets_dir, "indexes", f"{asset_index['id']}.json")
+
+        def queue_objects(job, fetched):
+            index = AssetIndex.load(job.path)
+            missing, size = self.asset_planner.plan(index)
+            self.log(f"{len(missing)}/{len(index)} asset objects are new (~{size / 1048576:.1f} MB)")
+            return missing.jobs(os.path.join(self.assets_dir, "objects"), self.assets_url)
+
+        return DownloadJob(asset_index["url"], path, asset_index["sha1"], asset_index.get("size"),
+                           f"asset index {asset_index['id']}", queue_objects if objects else None)
+
+    def log_config_job(self, data):
+        file_info = data["logging"]["client"]["file"]
+        return DownloadJob(file_info["url"], os.path.join(self.assets_dir, "log_configs", file_info["id"]),
+                           file_info["sha1"], file_info.get("size"), f"log config {file_info['id']}")
+
+    def jobs(self, version_id, data, objects=True, digest=None):
+        """Client jar, libraries and natives, asset index (-> objects) and log config; ``digest`` as for rules."""
+        jobs = [self.client_job(version_id, data)]
+        jobs.extend(self.library_jobs(data, digest))
+        if "assetIndex" in data:
+            jobs.append(self.asset_index_job(data, objects))
+        if "logging" in data:
+            jobs.append(self.log_config_job(data))
+        return jobs
+
+    def _shared(self, job):
+        return self.store is not None and job.sha1 and not job.name.startswith(UNSHARED_JOBS)
+
+    def is_current(self, job):
+        """Whether the file on disk can be kept, linking it from the store if needed; safe from worker threads."""
+        if os.path.exists(job.path) and (job.sha1 is None or self.verified.verify(job.path, job.sha1)):
+            if self._shared(job) and not self.store.is_referenced(job.path):
+                self.adopt(job)     # installed before the store was in use, or prefetched
+            return True
+        if not self._shared(job):
+            return False
+        try:
+            linked = self.store.materialize(job.sha1, job.path)
+        except OSError as e:
+            self.log(f"Could not link {job.name} from the store: {e}")
+            return False
+        if linked:
+            self.verified.record(job.path, job.sha1)
+        return bool(linked)
+
+    def adopt(self, job):
+        """Hand a verified file over to the store (or link it to the store's copy)."""
+        if not self._shared(job):
+            return
+        try:
+            self.store.adopt(job.path, job.sha1)
+        except OSError as e:
+            self.log(f"Could not add {job.name} to the store: {e}")
+            return
+        self.verified.record(job.path, job.sha1)
+
+    def sync(self, version_id):
+        """Download whatever ``version_id`` is missing and extract its natives; returns the SyncProgress.
+
+        Raises :class:`DownloadError` if the version cannot run (client jar
+        failed); other failures are reported in ``progress.failed``.
+        """
+        data, digest = self.version_json(version_id)
+        jobs = self.jobs(version_id, data, digest=digest)
+        client_path = jobs[0].path
+        self.log(f"Syncing {version_id}: {len(jobs)} files, then asset objects")
+        result = AssetSync(self.downloader, scheduler=self.scheduler, is_current=self.is_current,
+                           on_progress=self.on_progress, on_fetched=self.adopt).run(jobs, total=len(jobs))
+        self.verified.flush()
+        if self.store is not None:
+            self.store.flush()
+        failed = dict((job.path, error) for job, error in result.failed)
+        if client_path in failed:
+            raise DownloadError(f"Client jar for {version_id} failed: {failed[client_path]}")
+        if result.ok and "assetIndex" in data:
+            self.asset_planner.mark_complete(data["assetIndex"]["id"])
+        natives = [(job.path, job.sha1) for job in jobs
+                   if job.name.startswith("native ") and job.path not in failed]
+        if natives:
+            extracted = self.natives.extracted
+            try:
+                natives_dir = self.natives.extract(version_id, natives)
+            except (OSError, zipfile.BadZipFile) as e:
+                self.log(f"Failed to extract natives: {e}")
+            else:
+                if self.natives.extracted > extracted:
+                    self.log(f"Extracted {len(natives)} native jars to {natives_dir}")
+        return result
+
+    def fetch_file(self, url, path, sha1=None, name=None):
+        """Download one file outside a version sync (e.g. a mod loader installer); returns the SyncProgress.
+
+        It goes through the same scheduler as syncs, so retries wait on its
+        timers and honour Retry-After. Without ``sha1`` the file is always
+        fetched again.
+        """
+        job = DownloadJob(url, path, sha1, None, name or os.path.basename(path))
+        return AssetSync(self.downloader, scheduler=self.scheduler,
+                         is_current=self.is_current if sha1 else (lambda job: False),
+                         on_progress=self.on_progress).run([job])
+
+    def verify(self, version_id):
+        """``(checked, problems)``: every installed file of a version checked against its SHA-1."""
+        data, digest = self.version_json(version_id)
+        jobs = self.jobs(version_id, data, objects=False, digest=digest)
+        if "assetIndex" in data:
+            index_path = os.path.join(self.assets_dir, "indexes", f"{data['assetIndex']['id']}.json")
+            try:
+                jobs.extend(AssetIndex.load(index_path).jobs(os.path.join(self.assets_dir, "objects"),
+                                                             self.assets_url))
+            except (OSError, ValueError, KeyError):
+                pass
+        problems = []
+        checked = set()
+        for job in jobs:
+            if job.path in checked:
+                continue
+            checked.add(job.path)
+            if not os.path.exists(job.path):
+                problems.append((job, "missing"))
+            elif job.sha1 and not self.verified.verify(job.path, job.sha1):
+                problems.append((job, "checksum mismatch"))
+        self.verified.flush()
+        return len(checked), problems
+
+    def prefetch_jobs(self, version_id):
+        """Prefetch plan: the version JSON, then its client, libraries and asset index.
+
+        Asset objects are left to the foreground sync. Nothing is planned
+        until ``version_index`` is set.
+        """
+        entry = self.version_index.get(version_id) if self.version_index else None
+        if entry is None:
+            return []
+
+        def queue_files(job, fetched):
+            data, digest = _parse_version(job.path)
+            return self.jobs(version_id, data, objects=False, digest=digest)
+
+        return [DownloadJob(entry["url"], self.version_json_path(version_id), entry.get("sha1"), None,
+                            f"version {version_id}", queue_files)]
+
+    # Java and launch
+
+    def java(self, major, install=True):
+        """A java binary for exactly ``major``, installing it if needed (or None with ``install=False``)."""
+        if install:
+            return self.runtimes.ensure(major, log=self.log)
+        return self.runtimes.find(major)
+
+    def build_launch_plan(self, version_id, data, extra_jvm_args=(), extra_classpath=(), digest=None):
+        """Classpath and arguments; player name, UUID, RAM and natives directory stay ``${...}`` placeholders.
+
+        ``extra_jvm_args`` go right after ``-Xmx`` and ``extra_classpath``
+        (e.g. mod loader jars) before the client jar.
+        """
+        version_dir = self.version_dir(version_id)
+        classpath = [job.path for job in self.library_jobs(data, digest) if job.name.startswith("library ")]
+        classpath.extend(extra_classpath)
+        classpath.append(os.path.join(version_dir, f"{version_id}.jar"))
+        asset_index = data.get("assetIndex", {}).get("id", "legacy")
+        values = {
+            "version_name": version_id,
+            "game_directory": self.root,
+            "assets_root": self.assets_dir,
+            "game_assets": self.assets_dir,
+            "assets_index_name": asset_index,
+            "auth_access_token": "0",
+            "auth_session": "0",
+            "auth_xuid": "0",
+            "clientid": "0",
+            "user_type": "legacy",
+            "user_properties": "{}",
+            "version_type": data.get("type", "release"),
+            "launcher_name": LAUNCHER_NAME,
+            "launcher_version": LAUNCHER_VERSION,
+            "classpath": os.pathsep.join(classpath),
+            "classpath_separator": os.pathsep,
+            "library_directory": self.libraries_dir,
+        }
+        if "arguments" in data:
+            jvm_args = list(self.rules.arguments(data["arguments"].get("jvm", []), digest, "jvm"))
+            game_args = list(self.rules.arguments(data["arguments"].get("game", []), digest, "game"))
+        else:
+            jvm_args = ["-Djava.library.path=${natives_directory}", "-cp", "${classpath}"]
+            if self.rules.env.name == "osx":
+                jvm_args.insert(0, "-XstartOnFirstThread")
+            game_args = data.get("minecraftArguments", "").split()
+        jvm_args = ["-Xmx${ram_gb}G", *extra_jvm_args] + jvm_args
+        if "logging" in data:
+            client_logging = data["logging"]["client"]
+            config_path = os.path.join(self.assets_dir, "log_configs", client_logging["file"]["id"])
+            jvm_args.append(client_logging["argument"].replace("${path}", config_path))
+        return {
+            "main_class": data.get("mainClass", "net.minecraft.client.main.Main"),
+            "java_major": required_major(data),
+            "jvm_args": render(jvm_args, values),
+            "game_args": render(game_args, values),
+        }
+
+    def launch_plan(self, version_id, loader="vanilla", extra_jvm_args=(), extra_classpath=()):
+        """The cached plan, keyed by ``loader`` and by the extras, so front ends sharing a root never mix plans."""
+        if extra_jvm_args or extra_classpath:
+            extras = json.dumps([list(extra_jvm_args), list(extra_classpath)]).encode()
+            loader = f"{loader}.{hashlib.sha1(extras).hexdigest()[:8]}"
+        return self.launch_plans.load(version_id, self.version_json_path(version_id),
+                                      lambda data, digest: self.build_launch_plan(version_id, data, extra_jvm_args,
+                                                                                  extra_classpath, digest),
+                                      env=self.rules.env, loader=loader)
+
+    def command(self, version_id, username="Player", ram_gb=2, java_bin=None, plan=None, **values):
+        """The full command line for a synced version; ``values`` fill any extra placeholders."""
+        plan = plan or self.launch_plan(version_id)
+        java_bin = java_bin or self.java(plan["java_major"])
+        natives_dir = self.natives.directory(version_id) or os.path.join(self.version_dir(version_id), "natives")
+        values.update(auth_player_name=username, auth_uuid=offline_uuid(username), ram_gb=ram_gb,
+                      natives_directory=natives_dir)
+        return [java_bin] + render(plan["jvm_args"], values) + [plan["main_class"]] + \
+            render(plan["game_args"], values)
+
+    def launch(self, version_id, username="Player", ram_gb=2, command=None, **popen_args):
+        """Start the game and return its :class:`subprocess.Popen`; ``command`` skips rebuilding the command line."""
+        return subprocess.Popen(command or self.command(version_id, username, ram_gb), cwd=self.root, **popen_args)
@@ -0,0 +1,93 @@
+"""Java runtime registry: probe each binary once, remember the answer across launches."""
+
+import json
+import os
+import re
+import shutil
+import subprocess
+import threading
+from collections import namedtuple
+
+from .net import _write_atomic
+
+PROBE_TIMEOUT = 10
+
+JavaInfo = namedtuple("JavaInfo", "path major version vendor arch")
+
+_PROPERTY_RE = re.compile(r"^\s*([\w.]+) = (.*)$", re.MULTILINE)
+_VERSION_RE = re.compile(r'version\s+"([^"]+)"')
+
+
+def _major(version):
+    numbers = re.findall(r"\d+", version)
+    return int(numbers[1] if numbers[0] == "1" and len(numbers) > 1 else numbers[0])
+
+
+def parse_probe(output):
+    """``(major, version, vendor, arch)`` from ``java -XshowSettings:properties -version`` output, or None."""
+    props = dict(_PROPERTY_RE.findall(output))
+    version = props.get("java.version")
+    if not version:
+        match = _VERSION_RE.search(output)
+        if not match:
+            return None
+        version = match.group(1)
+    spec = props.get("java.specification.version", version)
+    if not re.search(r"\d", spec):
+        return None
+    return _major(spec), version, props.get("java.vendor", ""), props.get("os.arch", "")
+
+
+class JavaRegistry:
+    """Cache of probed Java binaries keyed by resolved path, size and mtime.
+
+    ``probe("java")`` resolves the name on ``PATH``; the JVM is only spawned
+    when a binary has not been seen before or has changed on disk since. The
+    registry is persisted to ``cache_path`` so restarts reuse it too.
+    Binaries that run but report no version are remembered as unusable;
+    timeouts and spawn errors are not cached. Safe to call from worker threads.
+    """
+
+    def __init__(self, cache_path, timeout=PROBE_TIMEOUT):
+        self.cache_path = cache_path
+        self.timeout = timeout
+        self.hits = 0
+        self.probes = 0
+        self._lock = threading.Lock()
+        try:
+            with open(cache_path) as f:
+                self._entries = json.load(f)
+        except (OSError, ValueError):
+            self._entries = {}
+
+    def probe(self, java_bin):
+        """:class:`JavaInfo` for ``java_bin`` (a path or a name on PATH), or None if unusable."""
+        resolved = java_bin if os.path.dirname(java_bin) else shutil.which(java_bin)
+        if not resolved:
+            return None
+        path = os.path.realpath(resolved)
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        stamp = [st.st_size, st.st_mtime_ns]
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry is not None and entry["stat"] == stamp:
+                self.hits += 1
+                return JavaInfo(path, *entry["info"]) if entry["info"] else None
+        try:
+            result = subprocess.run([path, "-XshowSettings:properties", "-version"],
+                                    capture_output=True, text=True, timeout=self.timeout)
+        except (OSError, subprocess.SubprocessError):
+            return None
+        parsed = parse_probe(result.stderr + result.stdout)
+        with self._lock:
+            self.probes += 1
+            self._entries[path] = {"stat": stamp, "info": list(parsed) if parsed else None}
+            self._save_locked()
+        return JavaInfo(path, *parsed) if parsed else None
+
+    def _save_locked(self):
+        os.makedirs(os.path.dirname(os.path.abspath(self.cache_path)), exist_ok=True)
+        _write_atomic(self.cache_path, json.dumps(self._entries, indent=1).encode())
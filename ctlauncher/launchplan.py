@@ -0,0 +1,61 @@
+"""Launch plans: the resolved classpath and argument templates for a version, cached on disk."""
+
+import hashlib
+import json
+import os
+import re
+
+from .net import _write_atomic
+from .rules import current
+
+PLAN_FORMAT = 3   # 2: plans carry java_major; 3: classpath and natives dir rendered into jvm_args
+
+_PLACEHOLDER_RE = re.compile(r"\$\{(\w+)\}")
+
+
+def render(args, values):
+    """Fill ``${name}`` placeholders in ``args`` from ``values``; unknown names are left alone."""
+    def substitute(match):
+        value = values.get(match.group(1))
+        return match.group(0) if value is None else str(value)
+    return [_PLACEHOLDER_RE.sub(substitute, arg) for arg in args]
+
+
+class LaunchPlanCache:
+    """One serialized plan per (version, OS and arch, loader), invalidated by the version JSON's SHA-1.
+
+    A plan is whatever JSON-serialisable dict the front end's
+    ``build(version_data, digest)`` returns: typically the classpath, main
+    class and JVM / game argument lists, with per-launch values (player name,
+    RAM...) left as ``${...}`` placeholders for :func:`render`. ``load`` only
+    hashes the version JSON bytes on a hit; on a miss it is parsed and
+    ``build`` gets it with that SHA-1.
+    """
+
+    def __init__(self, cache_dir):
+        self.cache_dir = cache_dir
+        self.hits = 0
+        self.builds = 0
+
+    def _path(self, version_id, env, loader):
+        return os.path.join(self.cache_dir, f"{version_id}-{env.name}_{env.arch}-{loader}.json")
+
+    def load(self, version_id, json_path, build, env=None, loader="vanilla"):
+        """The plan for ``env`` (the :class:`~ctlauncher.rules.Environment` ``build`` evaluates rules for)."""
+        with open(json_path, "rb") as f:
+            raw = f.read()
+        digest = hashlib.sha1(raw).hexdigest()
+        path = self._path(version_id, env or current(), loader)
+        try:
+            with open(path) as f:
+                cached = json.load(f)
+            if cached.get("format") == PLAN_FORMAT and cached.get("version_sha1") == digest:
+                self.hits += 1
+                return cached["plan"]
+        except (OSError, ValueError):
+            pass
+        plan = build(json.loads(raw), digest)
+        os.makedirs(self.cache_dir, exist_ok=True)
+        _write_atomic(path, json.dumps({"format": PLAN_FORMAT, "version_sha1": digest, "plan": plan}).encode())
+        self.builds += 1
+        return plan
@@ -0,0 +1,66 @@
+"""Bounded log view over a Tk ``Text`` widget, with search over the rotating log file."""
+
+import collections
+
+from .progress import search_history
+
+LOG_CAPACITY = 2000     # lines kept in the widget
+TRIM_SLACK = 200        # trim in batches of at least this many lines
+
+
+class LogView:
+    """Keep at most ``capacity`` lines in ``text``; older ones live only in the log file.
+
+    ``append(lines)`` inserts a batch with one call and, once the widget is
+    ``slack`` lines over capacity, deletes the oldest lines in one range, so
+    memory and per-append cost stay flat over a long session. The same lines
+    are kept in a ring buffer. ``search(query)`` replaces the view with the
+    matching lines from the full history in ``history_path`` (the
+    :func:`~ctlauncher.progress.rotating_log` file). An empty query goes back
+    to the live tail. The widget only needs the Tk ``Text`` methods, so this
+    module does not import tkinter.
+    """
+
+    def __init__(self, text, capacity=LOG_CAPACITY, history_path=None, slack=TRIM_SLACK):
+        self.text = text
+        self.capacity = capacity
+        self.history_path = history_path
+        self.slack = slack
+        self.lines = collections.deque(maxlen=capacity)
+        self.query = None
+
+    def append(self, lines):
+        self.lines.extend(lines)
+        if self.query is None:
+            self._insert(lines)
+
+    def search(self, query):
+        """Show history lines containing ``query``; an empty query restores the live view."""
+        query = query.strip()
+        self.query = query or None
+        self._clear()
+        if self.query is None:
+            self._insert(self.lines)
+            return 0
+        matches = search_history(self.history_path, query, self.capacity) if self.history_path else \
+            [line for line in self.lines if query.lower() in line.lower()]
+        self._insert([f"— {len(matches)} lines matching {query!r} (clear the search to resume) —"] + matches)
+        return len(matches)
+
+    def _clear(self):
+        state = self.text.cget("state")
+        self.text.config(state="normal")
+        self.text.delete("1.0", "end")
+        self.text.config(state=state)
+
+    def _insert(self, lines):
+        if not lines:
+            return
+        state = self.text.cget("state")
+        self.text.config(state="normal")
+        self.text.insert("end", "\n".join(lines) + "\n")
+        shown = int(self.text.index("end-1c").split(".")[0]) - 1
+        if shown > self.capacity + self.slack:
+            self.text.delete("1.0", f"{shown - self.capacity + 1}.0")
+        self.text.config(state=state)
+        self.text.see("end")
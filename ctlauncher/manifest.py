@@ -0,0 +1,141 @@
+"""Version manifest cache with conditional (ETag / Last-Modified) revalidation."""
+
+import bisect
+import json
+import os
+
+from .net import DownloadError, _write_atomic
+
+VERSION_MANIFEST_URL = "https://launchermeta.mojang.com/mc/game/version_manifest.json"
+
+
+class ManifestCache:
+    """Keep the last ``version_manifest.json`` body and its validators on disk.
+
+    ``cached()`` returns the stored copy without touching the network, so a
+    front end can fill its version list immediately. ``refresh()`` sends
+    ``If-None-Match`` / ``If-Modified-Since`` and only re-parses on a 200.
+    ``load()`` prefers a fresh copy but falls back to the cache when offline.
+    """
+
+    def __init__(self, downloader, cache_dir, url=VERSION_MANIFEST_URL, name="version_manifest"):
+        self.downloader = downloader
+        self.url = url
+        self.path = os.path.join(cache_dir, name + ".json")
+        self.meta_path = os.path.join(cache_dir, name + ".meta.json")
+        self.offline = False
+        self._manifest = None
+        self._meta = None
+
+    def cached(self):
+        """The cached manifest, or None if there is no usable copy on disk."""
+        if self._manifest is None:
+            try:
+                with open(self.path, "rb") as f:
+                    self._manifest = json.load(f)
+                with open(self.meta_path) as f:
+                    self._meta = json.load(f)
+            except (OSError, ValueError):
+                self._manifest, self._meta = None, None
+        return self._manifest
+
+    def refresh(self):
+        """Revalidate against the server; returns ``(manifest, changed)``."""
+        cached = self.cached()
+        headers = {}
+        if cached is not None:
+            if self._meta.get("etag"):
+                headers["If-None-Match"] = self._meta["etag"]
+            if self._meta.get("last_modified"):
+                headers["If-Modified-Since"] = self._meta["last_modified"]
+        with self.downloader.open(self.url, headers) as response:
+            body = response.read()
+            if response.status == 304 and cached is not None:
+                self.offline = False
+                return cached, False
+            meta = {"url": self.url,
+                    "etag": response.getheader("ETag"),
+                    "last_modified": response.getheader("Last-Modified")}
+        manifest = json.loads(body)
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        _write_atomic(self.path, body)
+        _write_atomic(self.meta_path, json.dumps(meta).encode())
+        self._manifest, self._meta = manifest, meta
+        self.offline = False
+        return manifest, True
+
+    def load(self):
+        """Fresh manifest if the server is reachable, otherwise the cached copy."""
+        try:
+            return self.refresh()[0]
+        except (DownloadError, ValueError):
+            if self.cached() is None:
+                raise
+            self.offline = True
+            return self._manifest
+
+
+CATEGORIES = ("Latest Release", "Latest Snapshot", "Release", "Snapshot", "Old Beta", "Old Alpha")
+
+
+class VersionIndex:
+    """Query structure built once per manifest.
+
+    Holds an id -> entry map, ids ordered newest-first by ``releaseTime``,
+    per-type buckets in that order, and a sorted id list for prefix search.
+    """
+
+    def __init__(self, manifest):
+        versions = manifest.get("versions", [])
+        self.latest = manifest.get("latest", {})
+        self.by_id = {v["id"]: v for v in versions}
+        self.ordered = [v["id"] for v in sorted(versions, key=lambda v: v.get("releaseTime", ""), reverse=True)]
+        self._rank = {version_id: i for i, version_id in enumerate(self.ordered)}
+        self._sorted_ids = sorted(self.by_id)
+        self.by_type = {}
+        for version_id in self.ordered:
+            self.by_type.setdefault(self.by_id[version_id].get("type"), []).append(version_id)
+        self._categories = None
+
+    def __len__(self):
+        return len(self.by_id)
+
+    def __contains__(self, version_id):
+        return version_id in self.by_id
+
+    def get(self, version_id):
+        return self.by_id.get(version_id)
+
+    def url(self, version_id):
+        entry = self.by_id.get(version_id)
+        return entry["url"] if entry else None
+
+    def of_type(self, version_type):
+        return self.by_type.get(version_type, [])
+
+    def search(self, prefix, types=None, limit=None):
+        """Ids starting with ``prefix``, newest first, optionally restricted to ``types``."""
+        if not prefix:
+            matches = self.ordered
+        else:
+            lo = bisect.bisect_left(self._sorted_ids, prefix)
+            hi = bisect.bisect_left(self._sorted_ids, prefix + "\uffff", lo)
+            matches = sorted(self._sorted_ids[lo:hi], key=self._rank.__getitem__)
+        if types:
+            matches = [v for v in matches if self.by_id[v].get("type") in types]
+        return matches[:limit] if limit else list(matches)
+
+    def categories(self):
+        """The launcher's category buckets (see ``CATEGORIES``), computed once."""
+        if self._categories is None:
+            release = self.latest.get("release")
+            snapshot = self.latest.get("snapshot")
+            self._categories = {
+                "Latest Release": [release] if release in self.by_id else [],
+                "Latest Snapshot": [snapshot] if snapshot in self.by_id else [],
+                "Release": [v for v in self.of_type("release") if v != release],
+                "Snapshot": [v for v in self.of_type("snapshot") if v != snapshot],
+                "Old Beta": list(self.of_type("old_beta")),
+                "Old Alpha": list(self.of_type("old_alpha")),
+            }
+        return self._categories
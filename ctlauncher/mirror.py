@@ -0,0 +1,239 @@
+"""Offline mirrors: snapshot upstream files into a directory tree, serve it, and point launchers at it.
+
+A mirror tree stores every upstream URL at ``<host>/<path>`` (a query string
+is appended as ``@<query>``), so the same mapping turns any URL a launcher
+would fetch, including the ones embedded in version JSONs and Adoptium
+responses, into a URL on the mirror server.
+"""
+
+import http.server
+import json
+import os
+import urllib.parse
+
+from .assetindex import AssetIndex, JobFeed
+from .assetsync import ASSETS_BASE_URL, LIBRARY_BASE_URL, AssetSync, DownloadJob
+from .manifest import VERSION_MANIFEST_URL
+from .net import _write_atomic
+from .runtimes import adoptium_url, current_platform, required_major
+from .scheduler import Scheduler
+
+MIRROR_ENV = "CTLAUNCHER_MIRROR"
+INFO_FILE = "mirror.json"
+
+_SAFE = "/@=&,+"
+
+
+def mirror_path(url):
+    """Where ``url`` lives inside a mirror tree, as a relative ``/``-separated path."""
+    parts = urllib.parse.urlsplit(url)
+    path = parts.netloc.lower().replace(":", "_") + (parts.path or "/")
+    if path.endswith("/"):
+        path += "index"
+    if parts.query:
+        path += "@" + parts.query
+    return urllib.parse.unquote(path)
+
+
+class Mirror:
+    """Rewrite upstream URLs to a mirror server at ``base_url``; URLs already on the mirror pass through."""
+
+    def __init__(self, base_url):
+        self.base_url = base_url.rstrip("/")
+
+    @classmethod
+    def from_env(cls):
+        """The mirror named by ``$CTLAUNCHER_MIRROR``, or None when it is unset."""
+        base_url = os.environ.get(MIRROR_ENV)
+        return cls(base_url) if base_url else None
+
+    def rewrite(self, url):
+        if url.startswith(self.base_url + "/") or not urllib.parse.urlsplit(url).netloc:
+            return url
+        return f"{self.base_url}/{urllib.parse.quote(mirror_path(url), safe=_SAFE)}"
+
+
+def _library_downloads(lib):
+    """Every artifact and natives classifier of a library, whatever its rules (the mirror serves all OSes)."""
+    downloads = lib.get("downloads", {})
+    if downloads.get("artifact"):
+        yield downloads["artifact"]
+    yield from downloads.get("classifiers", {}).values()
+
+
+def _latest(entries):
+    return max(entries, key=lambda v: v.get("releaseTime", ""))["id"] if entries else None
+
+
+class MirrorBuilder:
+    """Fetch everything the selected versions need into a mirror tree.
+
+    That is the version manifest (cut down to the mirrored versions), their
+    version JSONs, client jars, libraries and natives for every OS, asset
+    indexes and objects, log configs, and the Java runtimes they ask for,
+    for each ``(os, arch)`` in ``java_platforms``. Files already in the tree
+    are kept if their checksum matches, so a rebuild only fetches what is
+    new. With ``store``, a :class:`~ctlauncher.store.ContentStore`, files are
+    linked from it instead of downloaded, and new downloads are added to it.
+    """
+
+    def __init__(self, downloader, directory, manifest_url=VERSION_MANIFEST_URL, assets_url=ASSETS_BASE_URL,
+                 java_platforms=None, image_type="jdk", store=None, log=None, on_progress=None):
+        self.downloader = downloader
+        self.directory = directory
+        self.manifest_url = manifest_url
+        self.assets_url = assets_url
+        self.java_platforms = [current_platform()] if java_platforms is None else java_platforms
+        self.image_type = image_type
+        self.store = store
+        self.log = log or (lambda message: None)
+        self.on_progress = on_progress
+        self.scheduler = Scheduler()
+
+    def path(self, url):
+        return os.path.join(self.directory, *mirror_path(url).split("/"))
+
+    def job(self, url, sha1=None, size=None, name=None, then=None):
+        return DownloadJob(url, self.path(url), sha1, size, name or url, then)
+
+    def _write_json(self, url, data):
+        path = self.path(url)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        _write_atomic(path, json.dumps(data).encode())
+
+    def _is_current(self, job):
+        if os.path.exists(job.path):
+            if job.sha1 is None:
+                return job.size is None or os.path.getsize(job.path) == job.size
+            return self.downloader.verified is not None and self.downloader.verified.verify(job.path, job.sha1)
+        return bool(self.store is not None and job.sha1 and self.store.materialize(job.sha1, job.path))
+
+    def version_jobs(self, entry, majors):
+        """The version JSON, whose ``then`` queues the version's files and notes its Java major."""
+        def queue_files(job, fetched):
+            with open(job.path) as f:
+                data = json.load(f)
+            majors.add(required_major(data))
+            jobs = []
+            client = data.get("downloads", {}).get("client")
+            if client:
+                jobs.append(self.job(client["url"], client["sha1"], client.get("size"), f"client {entry['id']}"))
+            for lib in data.get("libraries", []):
+                for info in _library_downloads(lib):
+                    url = info.get("url") or LIBRARY_BASE_URL + info["path"]
+                    jobs.append(self.job(url, info.get("sha1"), info.get("size"), f"library {lib.get('name')}"))
+            if "assetIndex" in data:
+                index = data["assetIndex"]
+                jobs.append(self.job(index["url"], index["sha1"], index.get("size"),
+                                     f"asset index {index['id']}", self._queue_objects))
+            if "logging" in data:
+                file_info = data["logging"]["client"]["file"]
+                jobs.append(self.job(file_info["url"], file_info["sha1"], file_info.get("size"),
+                                     f"log config {file_info['id']}"))
+            return jobs
+
+        return self.job(entry["url"], entry.get("sha1"), None, f"version {entry['id']}", queue_files)
+
+    def _queue_objects(self, job, fetched):
+        index = AssetIndex.load(job.path, keep_names=False).select()
+
+        def make():
+            for _, h, size in index.entries():
+                yield self.job(f"{self.assets_url}/{h[:2]}/{h}", h, size, f"asset {h}")
+        return JobFeed(len(index), make)
+
+    def java_jobs(self, majors):
+        """Adoptium responses are saved as they are; their packages become jobs."""
+        jobs = []
+        for major in sorted(majors):
+            for os_name, arch in self.java_platforms:
+                url = adoptium_url(major, os_name, arch, self.image_type)
+                releases = self.downloader.get_json(url)
+                if not releases:
+                    self.log(f"No Java {major} {self.image_type} build for {os_name}/{arch}; skipped")
+                    continue
+                self._write_json(url, releases[:1])
+                package = releases[0]["binary"]["package"]
+                jobs.append(self.job(package["link"], None, package.get("size"), f"java {major} {os_name}/{arch}"))
+        return jobs
+
+    def _adopt(self, job):
+        if job.sha1:
+            self.store.adopt(job.path, job.sha1)
+
+    def _run(self, jobs):
+        return AssetSync(self.downloader, scheduler=self.scheduler, is_current=self._is_current,
+                         on_progress=self.on_progress,
+                         on_fetched=self._adopt if self.store is not None else None).run(jobs)
+
+    def build(self, versions, extra_urls=()):
+        """Mirror ``versions`` (ids or ``latest`` / ``release`` / ``snapshot``) plus any ``extra_urls``.
+
+        Returns ``{"versions", "java", "files", "downloaded", "bytes", "failed"}``.
+        """
+        manifest = self.downloader.get_json(self.manifest_url)
+        by_id = {v["id"]: v for v in manifest.get("versions", [])}
+        latest = manifest.get("latest", {})
+        selected = []
+        for version in versions:
+            version = latest.get("release") if version == "latest" else latest.get(version, version)
+            if version not in by_id:
+                raise LookupError(f"Version {version} not found in manifest")
+            if version not in selected:
+                selected.append(version)
+
+        majors = set()
+        jobs = [self.version_jobs(by_id[v], majors) for v in selected]
+        jobs.extend(self.job(url) for url in extra_urls)
+        self.log(f"Mirroring {', '.join(selected)} into {self.directory}")
+        result = self._run(jobs)
+        java = self._run(self.java_jobs(majors)) if majors and self.java_platforms else None
+        failed = result.failed + (java.failed if java else [])
+        if self.downloader.verified is not None:
+            self.downloader.verified.flush()
+
+        entries = [by_id[v] for v in selected]
+        releases = [e for e in entries if e.get("type") == "release"]
+        snapshots = [e for e in entries if e.get("type") == "snapshot"]
+        self._write_json(self.manifest_url, {
+            "latest": {"release": _latest(releases) or _latest(entries),
+                       "snapshot": _latest(snapshots) or _latest(entries)},
+            "versions": entries,
+        })
+        info = {"versions": selected, "java": sorted(majors), "manifest_url": self.manifest_url,
+                "java_platforms": [list(p) for p in self.java_platforms]}
+        _write_atomic(os.path.join(self.directory, INFO_FILE), json.dumps(info, indent=1).encode())
+        return {"versions": selected, "java": sorted(majors),
+                "files": result.done + (java.done if java else 0),
+                "downloaded": result.downloaded + (java.downloaded if java else 0),
+                "bytes": result.bytes + (java.bytes if java else 0),
+                "failed": [(job.name, error) for job, error in failed]}
+
+
+class _Handler(http.server.SimpleHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"   # keep-alive, so launchers reuse one connection per host
+
+    def copyfile(self, source, outputfile):
+        # Headers are already on the socket (wfile is unbuffered); sendfile() falls back to send() itself
+        self.connection.sendfile(source)
+
+    def log_message(self, format, *args):
+        if self.server.quiet:
+            return
+        super().log_message(format, *args)
+
+
+class MirrorServer(http.server.ThreadingHTTPServer):
+    """Serve a mirror tree over HTTP, one thread per connection; ``port=0`` picks a free port."""
+
+    daemon_threads = True
+
+    def __init__(self, directory, host="0.0.0.0", port=8000, quiet=False):
+        self.directory = directory
+        self.quiet = quiet
+        super().__init__((host, port), lambda *args: _Handler(*args, directory=directory))
+
+    @property
+    def url(self):
+        host, port = self.server_address[:2]
+        return f"http://{'localhost' if host in ('0.0.0.0', '::') else host}:{port}"
@@ -0,0 +1,125 @@
+"""Content-addressed natives extraction shared across installed versions."""
+
+import hashlib
+import json
+import os
+import re
+import shutil
+import zipfile
+
+from .net import _write_atomic, sha1_file
+
+MARKER = ".complete"
+REFS_FILE = "refs.json"
+EXCLUDE = ("META-INF/",)
+
+_KEY_RE = re.compile(r"^[0-9a-f]{40}$")
+_TEMP_RE = re.compile(r"^\.([0-9a-f]{40})\.(\d+)\.tmp$")
+
+
+class NativesCache:
+    """Extract each distinct set of native jars once, into ``root/<key>``.
+
+    The key is the SHA-1 over the jars' own SHA-1s, so versions sharing the
+    same natives share one directory and a warm launch does no zip work at
+    all. A directory is only used once its marker file exists; extraction
+    happens in a temporary directory that is renamed into place. ``refs.json``
+    maps version ids to keys, and directories no version references any more
+    are removed. With ``versions_dir`` set, references from versions whose
+    directory has been deleted are dropped as well.
+    """
+
+    def __init__(self, root, versions_dir=None, exclude=EXCLUDE):
+        self.root = root
+        self.versions_dir = versions_dir
+        self.exclude = exclude
+        self.refs_path = os.path.join(root, REFS_FILE)
+        self.extracted = 0
+
+    @staticmethod
+    def key(jars):
+        """Cache key for an iterable of ``(path, sha1)`` native jars; a missing SHA-1 is taken from the jar itself.
+
+        Old version JSONs and some mirrors list classifiers without a ``sha1``.
+        """
+        digest = hashlib.sha1()
+        for sha1 in sorted((sha1 or sha1_file(path)).lower() for path, sha1 in jars):
+            digest.update(sha1.encode() + b"\n")
+        return digest.hexdigest()
+
+    def directory(self, version_id):
+        """The extracted natives directory recorded for ``version_id``, or None."""
+        key = self._load_refs().get(version_id)
+        if key and os.path.exists(os.path.join(self.root, key, MARKER)):
+            return os.path.join(self.root, key)
+        return None
+
+    def extract(self, version_id, jars):
+        """Return the natives directory for ``jars``, extracting only if it is not cached yet."""
+        jars = list(jars)
+        key = self.key(jars)
+        target = os.path.join(self.root, key)
+        if not os.path.exists(os.path.join(target, MARKER)):
+            self._extract(jars, key, target)
+        refs = self._load_refs()
+        if refs.get(version_id) != key:
+            refs[version_id] = key
+            self._save_refs(refs)
+            self.gc(refs)
+        return target
+
+    def _extract(self, jars, key, target):
+        os.makedirs(self.root, exist_ok=True)
+        temp_dir = os.path.join(self.root, f".{key}.{os.getpid()}.tmp")
+        shutil.rmtree(temp_dir, ignore_errors=True)
+        os.makedirs(temp_dir)
+        try:
+            for path, _ in jars:
+                with zipfile.ZipFile(path) as archive:
+                    for name in archive.namelist():
+                        if not name.endswith("/") and not name.startswith(self.exclude):
+                            archive.extract(name, temp_dir)
+            open(os.path.join(temp_dir, MARKER), "w").close()
+            # A half-extracted directory without a marker (e.g. from a crash) is replaced
+            shutil.rmtree(target, ignore_errors=True)
+            os.replace(temp_dir, target)
+        except OSError:
+            if not os.path.exists(os.path.join(target, MARKER)):
+                raise
+            # Another launcher process finished the same key first
+        finally:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+        self.extracted += 1
+
+    def gc(self, refs=None):
+        """Remove natives directories (and stale temp dirs) that no version references."""
+        if refs is None:
+            refs = self._load_refs()
+        if self.versions_dir is not None:
+            live = {v: k for v, k in refs.items() if os.path.isdir(os.path.join(self.versions_dir, v))}
+            if live != refs:
+                refs = live
+                self._save_refs(refs)
+        keep = set(refs.values())
+        removed = 0
+        try:
+            entries = os.listdir(self.root)
+        except FileNotFoundError:
+            return 0
+        for entry in entries:
+            temp = _TEMP_RE.match(entry)
+            if (_KEY_RE.match(entry) and entry not in keep) or (temp and int(temp.group(2)) != os.getpid()):
+                shutil.rmtree(os.path.join(self.root, entry), ignore_errors=True)
+                removed += 1
+        return removed
+
+    def _load_refs(self):
+        try:
+            with open(self.refs_path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save_refs(self, refs):
+        os.makedirs(self.root, exist_ok=True)
+        _write_atomic(self.refs_path, json.dumps(refs, indent=1, sort_keys=True).encode())
@@ -0,0 +1,409 @@
+"""Pooled HTTP(S) client shared by every download path of a launcher instance."""
+
+import email.utils
+import hashlib
+import http.client
+import json
+import os
+import ssl
+import threading
+import time
+import urllib.parse
+
+USER_AGENT = "CTLauncher/1.0"
+DOWNLOAD_TIMEOUT = 60
+CHUNK_SIZE = 64 * 1024
+POOL_SIZE = 8        # idle keep-alive connections kept per host
+MAX_REDIRECTS = 5
+REDIRECT_CODES = (301, 302, 303, 307, 308)
+
+
+class DownloadError(Exception):
+    """Raised when a URL cannot be fetched."""
+
+
+class HTTPError(DownloadError):
+    """Raised for an HTTP error status; ``status`` holds the code, ``retry_after`` the seconds a server asked for."""
+
+    def __init__(self, message, status, retry_after=None):
+        super().__init__(message)
+        self.status = status
+        self.retry_after = retry_after
+
+
+class ChecksumError(DownloadError):
+    """Raised when downloaded bytes do not match the expected SHA-1 or size."""
+
+
+def sha1_file(path):
+    """SHA-1 of a file on disk, read in fixed-size chunks."""
+    digest = hashlib.sha1()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _remove(*paths):
+    for path in paths:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+
+def _write_atomic(path, data):
+    temp_path = path + ".tmp"
+    with open(temp_path, "wb") as f:
+        f.write(data)
+    os.replace(temp_path, path)
+
+
+def _resumable(part_path, journal_path, journal):
+    """Bytes already in a part file left by an identical request, plus its validator.
+
+    ``journal`` holds what identifies the request (``url``, ``size`` and a
+    checksum); the part is kept only if the saved journal agrees on all of it.
+    """
+    try:
+        with open(journal_path) as f:
+            previous = json.load(f)
+        offset = os.path.getsize(part_path)
+    except (OSError, ValueError):
+        previous, offset = None, 0
+    if previous is None or any(previous.get(k) != v for k, v in journal.items()) \
+            or (journal["size"] is not None and offset >= journal["size"]):
+        _remove(part_path, journal_path)
+        return 0, None
+    return offset, previous.get("etag") or previous.get("last_modified")
+
+
+def _retry_after(value):
+    """Seconds from a ``Retry-After`` header (delta-seconds or HTTP-date), or None."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, email.utils.parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def _content_range_start(value):
+    # "bytes 1000-4999/5000"
+    try:
+        return int(value.split()[1].split("-")[0])
+    except (AttributeError, IndexError, ValueError):
+        return None
+
+
+def _hash_prefix(digest, path, length):
+    with open(path, "rb") as f:
+        while length > 0:
+            chunk = f.read(min(CHUNK_SIZE, length))
+            if not chunk:
+                break
+            digest.update(chunk)
+            length -= len(chunk)
+
+
+class HostPool:
+    """Keep-alive connections to a single scheme://host:port."""
+
+    def __init__(self, scheme, host, port, ssl_context, timeout, maxsize):
+        self.scheme = scheme
+        self.host = host
+        self.port = port
+        self.ssl_context = ssl_context
+        self.timeout = timeout
+        self.maxsize = maxsize
+        self.connects = 0
+        self.requests = 0
+        self._idle = []
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        with self._lock:
+            self.requests += 1
+            if self._idle:
+                return self._idle.pop()
+        if self.scheme == "https":
+            return http.client.HTTPSConnection(self.host, self.port, timeout=self.timeout,
+                                               context=self.ssl_context)
+        return http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+
+    def connect(self, conn):
+        """Open the socket (and TLS session) for a fresh or dropped connection."""
+        conn.close()
+        conn.connect()
+        with self._lock:
+            self.connects += 1
+
+    def release(self, conn):
+        with self._lock:
+            if len(self._idle) < self.maxsize:
+                self._idle.append(conn)
+                return
+        conn.close()
+
+    def close(self):
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for conn in idle:
+            conn.close()
+
+
+class Response:
+    """A streamed response whose connection goes back to the pool on close."""
+
+    def __init__(self, pool, conn, resp, url):
+        self._pool = pool
+        self._conn = conn
+        self._resp = resp
+        self.url = url
+        self.status = resp.status
+        self.headers = resp.headers
+
+    def getheader(self, name, default=None):
+        return self._resp.getheader(name, default)
+
+    def read(self, amt=None):
+        return self._resp.read(amt)
+
+    def iter_content(self, chunk_size=CHUNK_SIZE):
+        while True:
+            chunk = self._resp.read(chunk_size)
+            if not chunk:
+                break
+            yield chunk
+        # http.client returns b"" instead of raising when the peer hangs up early.
+        if self._resp.length:
+            raise DownloadError(f"Connection closed with {self._resp.length} bytes missing from {self.url}")
+
+    def close(self):
+        if self._conn is None:
+            return
+        if self._resp.isclosed() and not self._resp.will_close and not self._resp.length:
+            self._pool.release(self._conn)
+        else:
+            self._conn.close()
+        self._conn = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class Downloader:
+    """One per launcher instance; holds a keep-alive pool for every host it talks to."""
+
+    def __init__(self, user_agent=USER_AGENT, timeout=DOWNLOAD_TIMEOUT, verify=True,
+                 cafile=None, pool_size=POOL_SIZE, verified=None, rewrite=None):
+        self.user_agent = user_agent
+        self.timeout = timeout
+        self.pool_size = pool_size
+        self.verified = verified    # optional VerifiedIndex fed by checked fetches
+        self.rewrite = rewrite      # optional url -> url applied to every request (mirror mode)
+        self.ssl_context = ssl.create_default_context(cafile=cafile)
+        if not verify:
+            self.ssl_context.check_hostname = False
+            self.ssl_context.verify_mode = ssl.CERT_NONE
+        self._pools = {}
+        self._paths = {}    # path -> [lock, fetches holding or waiting for it]
+        self._lock = threading.Lock()
+
+    def _pool_for(self, parts):
+        scheme = parts.scheme.lower()
+        if scheme not in ("http", "https"):
+            raise DownloadError(f"Unsupported URL scheme: {parts.scheme}")
+        port = parts.port or (443 if scheme == "https" else 80)
+        key = (scheme, parts.hostname, port)
+        with self._lock:
+            pool = self._pools.get(key)
+            if pool is None:
+                pool = HostPool(scheme, parts.hostname, port, self.ssl_context,
+                                self.timeout, self.pool_size)
+                self._pools[key] = pool
+            return pool
+
+    def _send(self, pool, conn, method, path, headers):
+        reused = conn.sock is not None
+        try:
+            if not reused:
+                pool.connect(conn)
+            conn.request(method, path, headers=headers)
+            return conn.getresponse()
+        except OSError:
+            # The server dropped an idle keep-alive socket; one fresh attempt.
+            if not reused:
+                raise
+            pool.connect(conn)
+            conn.request(method, path, headers=headers)
+            return conn.getresponse()
+
+    def open(self, url, headers=None, method="GET"):
+        """Send a request and return a streamed :class:`Response`, following redirects."""
+        request_headers = {"User-Agent": self.user_agent, "Accept-Encoding": "identity"}
+        request_headers.update(headers or {})
+        if self.rewrite is not None:
+            url = self.rewrite(url)
+        for _ in range(MAX_REDIRECTS + 1):
+            parts = urllib.parse.urlsplit(url)
+            pool = self._pool_for(parts)
+            path = parts.path or "/"
+            if parts.query:
+                path += "?" + parts.query
+            conn = pool.acquire()
+            try:
+                resp = self._send(pool, conn, method, path, request_headers)
+            except (OSError, http.client.HTTPException) as e:
+                conn.close()
+                raise DownloadError(f"{url}: {e}") from e
+            response = Response(pool, conn, resp, url)
+            location = resp.getheader("Location")
+            if resp.status in REDIRECT_CODES and location:
+                resp.read()
+                response.close()
+                url = urllib.parse.urljoin(url, location)
+                continue
+            if resp.status >= 400:
+                resp.read()
+                response.close()
+                raise HTTPError(f"HTTP {resp.status} {resp.reason} for {url}", resp.status,
+                                _retry_after(resp.getheader("Retry-After")))
+            return response
+        raise DownloadError(f"Too many redirects for {url}")
+
+    def get_bytes(self, url, headers=None):
+        with self.open(url, headers) as response:
+            return response.read()
+
+    def get_text(self, url, headers=None):
+        return self.get_bytes(url, headers).decode("utf-8", errors="replace")
+
+    def get_json(self, url, headers=None):
+        return json.loads(self.get_bytes(url, headers))
+
+    def _claim(self, path):
+        """Wait for exclusive use of ``path`` (and its part file); True if another fetch held it first."""
+        key = os.path.abspath(path)
+        with self._lock:
+            entry = self._paths.setdefault(key, [threading.Lock(), 0])
+            entry[1] += 1
+        if entry[0].acquire(blocking=False):
+            return False
+        entry[0].acquire()
+        return True
+
+    def _unclaim(self, path):
+        key = os.path.abspath(path)
+        with self._lock:
+            entry = self._paths[key]
+            entry[0].release()
+            entry[1] -= 1
+            if not entry[1]:
+                del self._paths[key]
+
+    def _is_current(self, path, sha1):
+        if not os.path.exists(path):
+            return False
+        if self.verified is not None:
+            return self.verified.verify(path, sha1)
+        return sha1_file(path) == sha1.lower()
+
+    def fetch(self, url, path, sha1=None, size=None, progress=None):
+        """Stream ``url`` into ``path``, hashing each chunk as it arrives.
+
+        Bytes land in ``path + ".part"`` next to a small JSON journal (URL,
+        expected digest, server validators). If a previous attempt or launcher
+        run left a matching part behind, the transfer resumes with a ``Range``
+        request guarded by ``If-Range``. The digest (and ``size``, when given)
+        is checked before the part is renamed over ``path``, so the payload is
+        never read back except for the already-downloaded prefix on resume.
+        ``progress(done, total)`` is called after every chunk. Returns the
+        number of bytes in the finished file.
+
+        Fetches of one path are serialized (a foreground sync and a
+        prefetch that did not yield in time would otherwise append to the
+        same part); one that waited skips the download if the file the
+        other left is already the right one.
+        """
+        waited = self._claim(path)
+        try:
+            if waited and sha1 and self._is_current(path, sha1):
+                return os.path.getsize(path)
+            return self._fetch(url, path, sha1, size, progress)
+        finally:
+            self._unclaim(path)
+
+    def _fetch(self, url, path, sha1, size, progress):
+        part_path = path + ".part"
+        journal_path = part_path + ".json"
+        journal = {"url": url, "sha1": sha1, "size": size}
+        offset, validator = _resumable(part_path, journal_path, journal)
+        headers = {}
+        if offset:
+            headers["Range"] = f"bytes={offset}-"
+            if validator:
+                headers["If-Range"] = validator
+        digest = hashlib.sha1() if sha1 else None
+        try:
+            with self.open(url, headers) as response:
+                length = int(response.getheader("Content-Length") or 0)
+                if offset and response.status == 206:
+                    start = _content_range_start(response.getheader("Content-Range"))
+                    if start != offset:
+                        raise DownloadError(f"Unexpected Content-Range for {url}: "
+                                            f"{response.getheader('Content-Range')}")
+                    if digest:
+                        _hash_prefix(digest, part_path, offset)
+                    mode, done = "ab", offset
+                else:
+                    mode, done = "wb", 0
+                total = done + length if length else 0
+                journal["etag"] = response.getheader("ETag")
+                journal["last_modified"] = response.getheader("Last-Modified")
+                with open(journal_path, "w") as f:
+                    json.dump(journal, f)
+                with open(part_path, mode) as f:
+                    for chunk in response.iter_content():
+                        f.write(chunk)
+                        if digest:
+                            digest.update(chunk)
+                        done += len(chunk)
+                        if progress:
+                            progress(done, total)
+            if size is not None and done != size:
+                raise ChecksumError(f"Size mismatch for {url}: expected {size}, got {done}")
+            if digest and digest.hexdigest() != sha1.lower():
+                raise ChecksumError(f"SHA1 mismatch for {url}: expected {sha1}, got {digest.hexdigest()}")
+            os.replace(part_path, path)
+            _remove(journal_path)
+            if digest and self.verified is not None:
+                self.verified.record(path, sha1)
+        except (ChecksumError, HTTPError):
+            # Bad bytes or a rejected range: the next attempt starts from zero.
+            _remove(part_path, journal_path)
+            raise
+        return done
+
+    def stats(self):
+        """Connection/handshake counters summed over all hosts."""
+        with self._lock:
+            pools = list(self._pools.values())
+        return {
+            "hosts": len(pools),
+            "connects": sum(p.connects for p in pools),
+            "requests": sum(p.requests for p in pools),
+        }
+
+    def close(self):
+        with self._lock:
+            pools, self._pools = list(self._pools.values()), {}
+        for pool in pools:
+            pool.close()
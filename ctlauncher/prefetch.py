@@ -0,0 +1,165 @@
+"""Low-priority background prefetch of the versions a user is likely to launch next."""
+
+import collections
+import json
+import os
+import threading
+import time
+
+from .net import _write_atomic
+
+PREFETCH_RATE = 512 * 1024    # bytes per second; None for no cap
+YIELD_TIMEOUT = 2             # how long pause() waits for the transfer in flight to stop
+RECENT_LIMIT = 3
+
+
+class _Yielded(Exception):
+    """Raised inside a transfer to hand the network back to a foreground launch."""
+
+
+class RecentVersions:
+    """Most recently launched version ids, newest first, persisted as a small JSON list."""
+
+    def __init__(self, path, limit=RECENT_LIMIT):
+        self.path = path
+        self.limit = limit
+
+    def list(self):
+        try:
+            with open(self.path) as f:
+                return json.load(f)[:self.limit]
+        except (OSError, ValueError):
+            return []
+
+    def touch(self, version_id):
+        versions = [version_id] + [v for v in self.list() if v != version_id]
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        _write_atomic(self.path, json.dumps(versions[:self.limit]).encode())
+
+
+class Prefetcher:
+    """Fetch job graphs one file at a time on a background thread, under a bandwidth cap.
+
+    ``plan(version_id)`` returns the jobs to prefetch for a version, typically
+    the version JSON whose ``then`` yields the client JAR, libraries and asset
+    index. ``plan``, ``then`` and ``is_current`` run on the prefetch thread.
+    ``pause()`` stops the transfer in flight at its next chunk and returns
+    once the thread is idle; pauses nest, each ``resume()`` undoing one. The
+    part file and its resume journal stay behind, so a foreground fetch of
+    the same file continues with a Range request. Failures are only logged,
+    because the foreground launch fetches anything still missing.
+    """
+
+    def __init__(self, downloader, plan, rate=PREFETCH_RATE, is_current=None, log=None):
+        self.downloader = downloader
+        self.plan = plan
+        self.rate = rate
+        self.is_current = is_current or (lambda job: os.path.exists(job.path))
+        self.log = log
+        self.fetched = 0
+        self.skipped = 0
+        self.bytes = 0
+        self._versions = collections.deque()
+        self._jobs = collections.deque()
+        self._seen = set()
+        self._cond = threading.Condition()
+        self._holds = 0     # outstanding pause() calls
+        self._busy = False
+        self._closed = False
+        self._thread = None
+
+    def add(self, *version_ids):
+        """Queue versions for prefetching; each is planned at most once per instance."""
+        with self._cond:
+            for version_id in version_ids:
+                if version_id and version_id not in self._seen:
+                    self._seen.add(version_id)
+                    self._versions.append(version_id)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._worker, name="prefetch", daemon=True)
+                self._thread.start()
+            self._cond.notify_all()
+
+    def pause(self, timeout=YIELD_TIMEOUT):
+        """Stop prefetching; True once nothing is in flight (False if ``timeout`` ran out first)."""
+        with self._cond:
+            self._holds += 1
+            self._cond.notify_all()
+            return self._cond.wait_for(lambda: not self._busy, timeout)
+
+    def resume(self):
+        with self._cond:
+            self._holds = max(0, self._holds - 1)
+            self._cond.notify_all()
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+    @property
+    def idle(self):
+        with self._cond:
+            return not (self._busy or self._jobs or self._versions)
+
+    def _stopping(self):
+        return self._holds or self._closed
+
+    def _worker(self):
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._closed or
+                                    (not self._holds and (self._jobs or self._versions)))
+                if self._closed:
+                    return
+                job = self._jobs.popleft() if self._jobs else None
+                version_id = None if job else self._versions.popleft()
+                self._busy = True
+            try:
+                if job is None:
+                    jobs = list(self.plan(version_id))
+                    with self._cond:
+                        self._jobs.extend(jobs)
+                else:
+                    self._run(job)
+            except _Yielded:
+                with self._cond:
+                    self._jobs.appendleft(job)
+            except Exception as e:
+                if self.log:
+                    self.log(f"Prefetch of {job.name if job else version_id} failed: {e}")
+            finally:
+                with self._cond:
+                    self._busy = False
+                    self._cond.notify_all()
+
+    def _run(self, job):
+        fetched = not self.is_current(job)
+        if fetched:
+            os.makedirs(os.path.dirname(job.path), exist_ok=True)
+            self.bytes += self.downloader.fetch(job.url, job.path, job.sha1, job.size, self._throttle())
+            self.fetched += 1
+        else:
+            self.skipped += 1
+        if job.then:
+            more = list(job.then(job, fetched) or ())
+            with self._cond:
+                # Depth first, so one version is complete before the next one starts
+                self._jobs.extendleft(reversed(more))
+
+    def _throttle(self):
+        """A ``fetch`` progress callback that paces the transfer and aborts it on pause."""
+        start = []
+
+        def progress(done, total):
+            now = time.monotonic()
+            if not start:
+                start.extend((now, done))    # a resumed transfer starts past zero
+            with self._cond:
+                if self._stopping():
+                    raise _Yielded()
+                if self.rate:
+                    delay = start[0] + (done - start[1]) / self.rate - now
+                    if delay > 0 and self._cond.wait_for(self._stopping, delay):
+                        raise _Yielded()
+        return progress
@@ -0,0 +1,146 @@
+"""Progress channel between download workers and a Tk UI thread, plus the rotating launcher log."""
+
+import collections
+import logging
+import logging.handlers
+import os
+import queue
+import threading
+import time
+
+DRAIN_INTERVAL = 0.1          # seconds between UI refreshes (~10 Hz)
+LOG_MAX_BYTES = 1024 * 1024
+LOG_BACKUPS = 3
+RATE_SMOOTHING = 0.3          # weight of the newest sample in the displayed transfer rate
+
+
+def rotating_log(path, max_bytes=LOG_MAX_BYTES, backups=LOG_BACKUPS):
+    """A logger writing to ``path``, rolled over at ``max_bytes`` with ``backups`` old files kept."""
+    logger = logging.getLogger(f"ctlauncher.{os.path.abspath(path)}")
+    if not logger.handlers:
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        handler = logging.handlers.RotatingFileHandler(path, maxBytes=max_bytes, backupCount=backups,
+                                                       encoding="utf-8")
+        handler.setFormatter(logging.Formatter("%(asctime)s %(threadName)s %(message)s"))
+        logger.addHandler(handler)
+        logger.setLevel(logging.DEBUG)
+        logger.propagate = False
+    return logger
+
+
+class ProgressBus:
+    """Thread-safe channel that workers post to and a UI thread drains at a fixed rate.
+
+    ``log(message)`` queues a line for the UI (and the log file);
+    ``detail(message)`` goes to the log file only, for per-file chatter.
+    ``progress(done, total, nbytes, failed)`` just replaces the current
+    counters, so any number of updates between two refreshes costs one
+    render. ``attach(root, on_lines, on_status)`` drains on the Tk timer
+    every ``interval``; code that blocks the Tk thread can call ``poll()``
+    itself, which is rate limited the same way and a no-op on other threads.
+    """
+
+    def __init__(self, logger=None, interval=DRAIN_INTERVAL):
+        self.logger = logger
+        self.interval = interval
+        self._lines = queue.SimpleQueue()
+        self._lock = threading.Lock()
+        self._counters = None
+        self._changed = False
+        self._last_poll = 0.0
+        self._last_sample = None      # (time, bytes) of the previous render
+        self._rate = 0.0
+        self._root = None
+        self._renderers = None
+        self._ui_thread = None
+
+    def log(self, message):
+        self._lines.put(message)
+        if self.logger:
+            self.logger.info(message)
+
+    def detail(self, message):
+        if self.logger:
+            self.logger.debug(message)
+
+    def progress(self, done, total, nbytes=0, failed=0):
+        with self._lock:
+            self._counters = (done, total, nbytes, failed)
+            self._changed = True
+
+    def drain(self):
+        """``(lines, status)``: queued lines and the status text, or None if the counters did not change."""
+        lines = []
+        while True:
+            try:
+                lines.append(self._lines.get_nowait())
+            except queue.Empty:
+                break
+        with self._lock:
+            counters, changed = self._counters, self._changed
+            self._changed = False
+        return lines, (self._status(*counters) if changed else None)
+
+    def _status(self, done, total, nbytes, failed):
+        now = time.monotonic()
+        if self._last_sample and now > self._last_sample[0] and nbytes >= self._last_sample[1]:
+            sample = (nbytes - self._last_sample[1]) / (now - self._last_sample[0])
+            self._rate += RATE_SMOOTHING * (sample - self._rate)
+        self._last_sample = (now, nbytes)
+        text = f"{done}/{total or '?'} files · {nbytes / 1048576:.1f} MB · {self._rate / 1048576:.1f} MB/s"
+        return text + (f" · {failed} failed" if failed else "")
+
+    def attach(self, root, on_lines, on_status):
+        """Drain on ``root``'s Tk timer; call from the Tk thread."""
+        self._root = root
+        self._renderers = (on_lines, on_status)
+        self._ui_thread = threading.get_ident()
+        self._tick()
+
+    def _tick(self):
+        self.poll(force=True)
+        self._root.after(int(self.interval * 1000), self._tick)
+
+    def poll(self, force=False):
+        """Render pending lines and status if ``interval`` has passed; True if it rendered."""
+        if self._renderers is None or threading.get_ident() != self._ui_thread:
+            return False
+        now = time.monotonic()
+        if not force and now - self._last_poll < self.interval:
+            return False
+        self._last_poll = now
+        lines, status = self.drain()
+        on_lines, on_status = self._renderers
+        if lines:
+            on_lines(lines)
+        if status is not None:
+            on_status(status)
+        return bool(lines or status)
+
+
+def search_history(path, query, limit=500):
+    """The last ``limit`` lines of the rotating log at ``path`` (backups included) containing ``query``.
+
+    Matching ignores case; files are streamed oldest first, so memory stays
+    bounded by ``limit`` however long the history is.
+    """
+    needle = query.lower()
+    matches = collections.deque(maxlen=limit)
+    backups = sorted(_backups(path), key=lambda name: -int(name.rsplit(".", 1)[1]))
+    for name in backups + [path]:
+        try:
+            with open(name, encoding="utf-8", errors="replace") as f:
+                matches.extend(line.rstrip("\n") for line in f if needle in line.lower())
+        except OSError:
+            continue
+    return list(matches)
+
+
+def _backups(path):
+    directory, base = os.path.split(os.path.abspath(path))
+    try:
+        names = os.listdir(directory)
+    except OSError:
+        return []
+    return [os.path.join(directory, name) for name in names
+            if name.startswith(base + ".") and name[len(base) + 1:].isdigit()]
@@ -0,0 +1,175 @@
+"""Version-JSON ``rules``, evaluated against one environment snapshot and memoized per version JSON.
+
+The machine is queried once, into an :class:`Environment`. A
+:class:`RuleEngine` checks each rules list straight against it and
+remembers which libraries and argument entries of a version JSON apply,
+keyed by the JSON's digest, so the sync and the launch plan of the same
+version (or a re-parsed copy of it) only evaluate its rules once.
+"""
+
+import platform
+import re
+
+MEMO_SIZE = 64     # version JSONs remembered before the memo starts over
+
+_OS_NAMES = {"Windows": "windows", "Darwin": "osx", "Linux": "linux"}
+_ARCHES = {"x86_64": "x64", "amd64": "x64", "aarch64": "arm64", "arm64": "arm64"}
+_CURRENT = None
+
+
+def os_name():
+    """The running OS in version-JSON rule naming: ``windows``, ``osx`` or ``linux``."""
+    return _OS_NAMES.get(platform.system(), platform.system().lower())
+
+
+def os_arch(machine=None):
+    """``machine`` (default: this one) in rule naming: ``x86``, ``x64``, ``arm64``, else lowercased as is."""
+    machine = (platform.machine() if machine is None else machine).lower()
+    if machine in _ARCHES:
+        return _ARCHES[machine]
+    return "x86" if machine.endswith("86") else machine
+
+
+class Environment:
+    """What rules are tested against: OS name, arch (``x86``/``x64``/``arm64``), OS version and enabled feature flags.
+
+    Defaults are read from this machine once, at construction. ``bits`` is
+    what ``${arch}`` in a natives classifier expands to.
+    """
+
+    __slots__ = ("name", "arch", "version", "bits", "features")
+
+    def __init__(self, name=None, arch=None, version=None, bits=None, features=None):
+        machine = platform.machine()
+        self.name = name or os_name()
+        self.arch = arch or os_arch(machine)
+        self.version = platform.release() if version is None else version
+        self.bits = bits or ("64" if machine.endswith("64") else "32")
+        self.features = frozenset(flag for flag, enabled in (features or {}).items() if enabled)
+
+    def __repr__(self):
+        return (f"Environment(name={self.name!r}, arch={self.arch!r}, version={self.version!r}, "
+                f"bits={self.bits!r}, features={sorted(self.features)!r})")
+
+
+def current():
+    """The shared snapshot of this machine, no feature flags enabled."""
+    global _CURRENT
+    if _CURRENT is None:
+        _CURRENT = Environment()
+    return _CURRENT
+
+
+def _matches(rule, env):
+    os_rule = rule.get("os")
+    if os_rule:
+        name, arch, version = os_rule.get("name"), os_rule.get("arch"), os_rule.get("version")
+        if name and name != env.name:
+            return False
+        if arch and arch != env.arch:
+            return False
+        if version and not re.search(version, env.version):   # re caches the compiled pattern
+            return False
+    features = rule.get("features")
+    return not features or all((flag in env.features) == bool(value) for flag, value in features.items())
+
+
+def evaluate(rules, env):
+    """Whether ``rules`` allow ``env``: the last matching rule wins, nothing matching means disallowed."""
+    if not rules:
+        return True
+    allowed = False
+    for rule in rules:
+        if _matches(rule, env):
+            allowed = rule.get("action", "allow") == "allow"
+    return allowed
+
+
+def compile_rules(rules):
+    """A predicate ``allows(env)`` for a rules list, for one list tested against many environments."""
+    if not rules:
+        return lambda env: True
+    compiled = []
+    for rule in rules:
+        os_rule = rule.get("os", {})
+        version = os_rule.get("version")
+        compiled.append((rule.get("action", "allow") == "allow", os_rule.get("name"), os_rule.get("arch"),
+                         re.compile(version) if version else None, tuple(rule.get("features", {}).items())))
+    compiled = tuple(compiled)
+
+    def allows(env):
+        allowed = False
+        for allow, name, arch, version, features in compiled:
+            if name and name != env.name:
+                continue
+            if arch and arch != env.arch:
+                continue
+            if version and not version.search(env.version):
+                continue
+            if any((flag in env.features) != bool(value) for flag, value in features):
+                continue
+            allowed = allow
+        return allowed
+    return allows
+
+
+def rules_allow(rules, features=None):
+    """Evaluate a ``rules`` list for this machine; prefer a :class:`RuleEngine` when evaluating many."""
+    return evaluate(rules, Environment(features=features) if features else current())
+
+
+def _allowed_entries(engine, entries):
+    return tuple(i for i, entry in enumerate(entries) if isinstance(entry, str) or engine.allows(entry.get("rules")))
+
+
+class RuleEngine:
+    """Rules evaluated for one :class:`Environment`, memoized per version JSON.
+
+    ``libraries(data, digest)`` and ``arguments(entries, digest)`` remember
+    which positions of the JSON apply under ``digest`` (the SHA-1 of the
+    version JSON file); another parse of the same file then costs one tuple
+    lookup. Without a digest nothing is remembered.
+    """
+
+    def __init__(self, env=None):
+        self.env = env or current()
+        self._versions = {}   # (digest, part) -> positions allowed here
+
+    def allows(self, rules):
+        return evaluate(rules, self.env)
+
+    def _positions(self, digest, part, entries):
+        if digest is None:
+            return _allowed_entries(self, entries)
+        key = (digest, part)
+        positions = self._versions.get(key)
+        if positions is None:
+            if len(self._versions) >= MEMO_SIZE:
+                self._versions.clear()
+            positions = self._versions[key] = _allowed_entries(self, entries)
+        return positions
+
+    def libraries(self, data, digest=None):
+        """The version's libraries that apply here, as a tuple."""
+        libraries = data.get("libraries")
+        if not libraries:
+            return ()
+        return tuple(libraries[i] for i in self._positions(digest, "libraries", libraries))
+
+    def arguments(self, entries, digest=None, part=None):
+        """Flatten ``arguments.jvm`` / ``arguments.game``, keeping plain strings and allowed values.
+
+        ``part`` names the list within the version JSON (``"jvm"`` or ``"game"``) when ``digest`` is given.
+        """
+        for i in self._positions(digest, part, entries):
+            entry = entries[i]
+            if isinstance(entry, str):
+                yield entry
+            else:
+                value = entry["value"]
+                yield from ([value] if isinstance(value, str) else value)
+
+    def native_classifier(self, lib):
+        """The classifier key holding ``lib``'s natives here (``${arch}`` expanded), or None."""
+        key = lib.get("natives", {}).get(self.env.name)
+        return key.replace("${arch}", self.env.bits) if key else None
@@ -0,0 +1,299 @@
+"""Side-by-side Java runtimes, installed from Adoptium and indexed by major version, OS and arch."""
+
+import hashlib
+import http.client
+import json
+import os
+import platform
+import shutil
+import tarfile
+import time
+import zipfile
+import zlib
+
+from .net import CHUNK_SIZE, ChecksumError, DownloadError, HTTPError, _content_range_start, _remove, _resumable, \
+    _write_atomic
+from .scheduler import Scheduler
+
+ADOPTIUM_API = "https://api.adoptium.net/v3/assets/latest/{major}/hotspot"
+INDEX_FILE = "runtimes.json"
+DEFAULT_MAJOR = 8   # version JSONs without a javaVersion block predate 1.17
+
+_OS_NAMES = {"Windows": "windows", "Linux": "linux", "Darwin": "mac"}
+_ARCH_NAMES = {"x86_64": "x64", "amd64": "x64", "aarch64": "aarch64", "arm64": "aarch64",
+               "i386": "x86", "i686": "x86", "x86": "x86"}
+
+
+def current_platform():
+    """``(os, arch)`` in Adoptium's naming, e.g. ``("linux", "x64")``."""
+    return (_OS_NAMES.get(platform.system(), platform.system().lower()),
+            _ARCH_NAMES.get(platform.machine().lower(), platform.machine().lower()))
+
+
+def adoptium_url(major, os_name, arch, image_type="jdk"):
+    """The Adoptium API query for the newest ``major`` build of ``image_type`` on ``os_name``/``arch``."""
+    return ADOPTIUM_API.format(major=major) + f"?image_type={image_type}&os={os_name}&architecture={arch}"
+
+
+def required_major(version_data):
+    """The Java major version a version JSON asks for."""
+    return int(version_data.get("javaVersion", {}).get("majorVersion", DEFAULT_MAJOR))
+
+
+class _SpoolingReader:
+    """File-like view of a response that hashes every byte and appends it to the open ``part`` file.
+
+    The first ``offset`` bytes are replayed from ``part`` (kept by an
+    interrupted attempt) before reading on from the response.
+    """
+
+    def __init__(self, response, part, offset, algorithm="sha256"):
+        self._response = response
+        self._part = part
+        self._replay = offset
+        self.digest = hashlib.new(algorithm)
+        self.size = 0
+
+    def read(self, amt=None):
+        if self._replay:
+            data = self._part.read(self._replay if amt is None or amt < 0 else min(amt, self._replay))
+            self._replay -= len(data)
+        else:
+            try:
+                data = self._response.read(amt)
+            except (OSError, http.client.HTTPException) as e:
+                raise DownloadError(f"{self._response.url}: {e}") from e
+            self._part.write(data)
+        self.digest.update(data)
+        self.size += len(data)
+        return data
+
+    def drain(self):
+        """Read (and hash) whatever the consumer left behind, e.g. tar padding."""
+        while self.read(CHUNK_SIZE):
+            pass
+
+
+def _file_digest(path, algorithm="sha256"):
+    digest = hashlib.new(algorithm)
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _java_in(home):
+    exe = "java.exe" if platform.system() == "Windows" else "java"
+    for bin_dir in (os.path.join(home, "bin"), os.path.join(home, "Contents", "Home", "bin"),
+                    os.path.join(home, "jre", "bin")):
+        if os.path.exists(os.path.join(bin_dir, exe)):
+            return os.path.join(bin_dir, exe)
+    return None
+
+
+def _extract_stream(archive, path):
+    # The "data" filter (3.11.4+) refuses absolute paths, ".." and links out of ``path``
+    if hasattr(tarfile, "data_filter"):
+        archive.extractall(path, filter="data")
+    else:
+        archive.extractall(path)
+
+
+class RuntimeManager:
+    """Install several JDKs next to each other under ``java_dir/<major>-<os>-<arch>``.
+
+    ``runtimes.json`` maps that key to the runtime's home and java binary, so
+    ``find(major)`` at launch time is a dict lookup plus one ``stat``. A
+    system ``java`` is accepted when its (cached) probe reports exactly the
+    requested major: a version JSON names the major it was built for, and
+    newer ones break older versions (pre-1.17 LaunchWrapper fails on
+    anything past 8). ``image_type="jre"`` installs the smaller JRE builds,
+    which are enough to run the game. JDKs unpacked by older launcher builds (``jdk-*`` and
+    similar directories) are adopted into the index the first time it is
+    created. Failed installs are retried by ``scheduler``'s policy.
+    """
+
+    def __init__(self, downloader, java_dir, registry=None, image_type="jdk", scheduler=None):
+        self.downloader = downloader
+        self.java_dir = java_dir
+        self.registry = registry
+        self.image_type = image_type
+        self.scheduler = scheduler or Scheduler()
+        self.os_name, self.arch = current_platform()
+        self.index_path = os.path.join(java_dir, INDEX_FILE)
+        try:
+            with open(self.index_path) as f:
+                self.index = json.load(f)
+        except (OSError, ValueError):
+            self.index = {}
+            self._adopt_existing()
+
+    def key(self, major):
+        return f"{major}-{self.os_name}-{self.arch}"
+
+    def find(self, major):
+        """Path of a java binary for exactly ``major`` (never a newer one), or None if none is installed."""
+        entry = self.index.get(self.key(major))
+        if entry and os.path.exists(entry["java"]):
+            return entry["java"]
+        if self.registry is not None:
+            info = self.registry.probe("java")
+            if info is not None and info.major == major:
+                return info.path
+        return None
+
+    def ensure(self, major, log=None):
+        """``find(major)``, installing the runtime first if needed."""
+        return self.find(major) or self.install(major, log)
+
+    def latest_release(self, major):
+        """``(package, version)`` of the newest Adoptium build for this platform.
+
+        ``package`` is Adoptium's package dict: ``link``, ``name``, ``size`` and
+        the SHA-256 ``checksum`` of the archive.
+        """
+        releases = self.downloader.get_json(adoptium_url(major, self.os_name, self.arch, self.image_type))
+        if not releases:
+            raise LookupError(f"No Java {major} {self.image_type} build for {self.os_name}/{self.arch}")
+        return releases[0]["binary"]["package"], releases[0]["version"]["openjdk_version"]
+
+    def install(self, major, log=None):
+        """Download and unpack Java ``major`` side by side with the others; returns its java binary.
+
+        A failed attempt is retried after the scheduler's backoff; the last
+        error is raised once it gives up.
+        """
+        attempt = 0
+        while True:
+            try:
+                return self._install(major, log)
+            except DownloadError as e:
+                delay = self.scheduler.retry_in(e, attempt)
+                if delay is None:
+                    raise
+                if log:
+                    log(f"Java {major} download failed ({e}); retrying in {delay:.0f}s...")
+                time.sleep(delay)
+                attempt += 1
+
+    def _install(self, major, log):
+        """One download-and-unpack attempt.
+
+        A ``.tar.gz`` is decompressed straight from the socket into a staging
+        directory while its bytes are kept in a ``.part`` file, so a retry
+        (or the next launcher run) replays what it has and fetches only the
+        rest. Zips need their central directory, so they are spooled through
+        ``Downloader.fetch``, which resumes the same way. Either way the
+        SHA-256 and size are checked before the staging directory is renamed
+        into place; bytes that fail them are thrown away.
+        """
+        package, version = self.latest_release(major)
+        name = package["name"]
+        key = self.key(major)
+        if log:
+            log(f"Downloading Java {version} ({key})...")
+        os.makedirs(self.java_dir, exist_ok=True)
+        archive_path = os.path.join(self.java_dir, f".{key}-{name}")
+        part_path = archive_path + ".part"
+        staging = os.path.join(self.java_dir, f".{key}.staging")
+        target = os.path.join(self.java_dir, key)
+        shutil.rmtree(staging, ignore_errors=True)
+        try:
+            if name.endswith(".zip"):
+                self.downloader.fetch(package["link"], archive_path, size=package.get("size"))
+                size, digest = os.path.getsize(archive_path), _file_digest(archive_path)
+            else:
+                reader = self._stream_tar(package, part_path, staging)
+                size, digest = reader.size, reader.digest.hexdigest()
+            expected = package.get("size")
+            if expected is not None and size < expected:
+                raise DownloadError(f"Connection closed with {expected - size} bytes missing from {name}")
+            if expected is not None and size != expected:
+                raise ChecksumError(f"Size mismatch for {name}: expected {expected}, got {size}")
+            if package.get("checksum") and digest != package["checksum"].lower():
+                raise ChecksumError(f"SHA-256 mismatch for {name}: expected {package['checksum']}, got {digest}")
+            if name.endswith(".zip"):
+                with zipfile.ZipFile(archive_path) as archive:
+                    archive.extractall(staging)
+            entries = os.listdir(staging)
+            home = os.path.join(staging, entries[0]) if len(entries) == 1 else staging
+            shutil.rmtree(target, ignore_errors=True)
+            os.replace(home, target)
+            _remove(part_path, part_path + ".json")
+        except ChecksumError:
+            _remove(part_path, part_path + ".json")
+            raise
+        finally:
+            shutil.rmtree(staging, ignore_errors=True)
+            _remove(archive_path)
+        return self._register(major, target, version)
+
+    def _stream_tar(self, package, part_path, staging):
+        """Unpack the tarball into ``staging`` as it arrives; returns the reader (size and SHA-256).
+
+        Resumes like ``Downloader.fetch``: a ``Range`` request guarded by
+        ``If-Range``, after the part already on disk has been replayed.
+        Truncated or corrupt archives raise :class:`DownloadError`.
+        """
+        journal_path = part_path + ".json"
+        journal = {"url": package["link"], "sha256": package.get("checksum"), "size": package.get("size")}
+        offset, validator = _resumable(part_path, journal_path, journal)
+        headers = {}
+        if offset:
+            headers["Range"] = f"bytes={offset}-"
+            if validator:
+                headers["If-Range"] = validator
+        try:
+            response = self.downloader.open(package["link"], headers)
+        except HTTPError:
+            _remove(part_path, journal_path)    # e.g. 416: start over next time
+            raise
+        with response:
+            if offset and (response.status != 206
+                           or _content_range_start(response.getheader("Content-Range")) != offset):
+                offset = 0  # the whole file is coming
+            journal["etag"] = response.getheader("ETag")
+            journal["last_modified"] = response.getheader("Last-Modified")
+            with open(journal_path, "w") as f:
+                json.dump(journal, f)
+            try:
+                with open(part_path, "r+b" if offset else "wb") as part:
+                    part.truncate(offset)
+                    reader = _SpoolingReader(response, part, offset)
+                    with tarfile.open(fileobj=reader, mode="r|gz") as archive:
+                        _extract_stream(archive, staging)
+                    reader.drain()
+            except (tarfile.ReadError, EOFError, zlib.error) as e:
+                if reader.size <= offset:
+                    _remove(part_path, journal_path)    # failed inside the replayed part: the part itself is bad
+                raise DownloadError(f"Truncated or corrupt {package['name']}: {e}") from e
+        return reader
+
+    def _register(self, major, home, version):
+        java = _java_in(home)
+        if java is None:
+            raise FileNotFoundError(f"No java binary under {home}")
+        if platform.system() != "Windows":
+            os.chmod(java, 0o755)
+        self.index[self.key(major)] = {"major": major, "version": version, "os": self.os_name,
+                                       "arch": self.arch, "home": home, "java": java}
+        self._save()
+        return java
+
+    def _adopt_existing(self):
+        """One-off migration: index runtimes unpacked into ``java_dir`` by earlier launchers."""
+        if self.registry is None or not os.path.isdir(self.java_dir):
+            return
+        for entry in sorted(os.listdir(self.java_dir)):
+            home = os.path.join(self.java_dir, entry)
+            java = _java_in(home) if os.path.isdir(home) and not entry.startswith(".") else None
+            info = self.registry.probe(java) if java else None
+            if info is not None and self.key(info.major) not in self.index:
+                self.index[self.key(info.major)] = {"major": info.major, "version": info.version,
+                                                    "os": self.os_name, "arch": info.arch or self.arch,
+                                                    "home": home, "java": java}
+        self._save()
+
+    def _save(self):
+        os.makedirs(self.java_dir, exist_ok=True)
+        _write_atomic(self.index_path, json.dumps(self.index, indent=1, sort_keys=True).encode())
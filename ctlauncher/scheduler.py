@@ -0,0 +1,194 @@
+"""Per-host adaptive concurrency and retry timing for the bulk download engine.
+
+Each host gets an AIMD window: every success widens it by about one request
+per window's worth of successes, every transient failure halves it. Growth
+pauses while latency per KiB is well above the best the host has shown, so
+the window settles where the link is full rather than where the server
+starts failing. ``Retry-After`` (429/503) closes a host for the time asked.
+"""
+
+import asyncio
+import collections
+import random
+import threading
+import time
+
+from .net import HTTPError
+
+ATTEMPTS = 4
+RETRY_DELAY = 1.0       # first backoff in seconds, doubled per attempt
+MAX_RETRY_DELAY = 60.0
+INITIAL_LIMIT = 4       # requests in flight per host before anything is known about it
+MIN_LIMIT = 1
+MAX_LIMIT = 16
+DECREASE = 0.5
+LATENCY_RISE = 2.0      # hold the window while latency is this many times the best seen
+EWMA_WEIGHT = 0.2
+RETRYABLE_STATUS = (408, 425, 429, 500, 502, 503, 504)
+
+_MIN_COST_BYTES = 16 * 1024     # small files are dominated by the round trip; don't divide by tiny sizes
+
+
+def is_permanent(error):
+    """HTTP errors a retry cannot fix (404, 403, ...); everything else is worth another attempt."""
+    return isinstance(error, HTTPError) and error.status not in RETRYABLE_STATUS
+
+
+def backoff(attempt, retry_after=None, base=RETRY_DELAY):
+    """Seconds to wait before retry number ``attempt + 1``; jittered, never shorter than ``retry_after``.
+
+    Never longer than ``MAX_RETRY_DELAY`` either, whatever the server asked for.
+    """
+    delay = min(MAX_RETRY_DELAY, base * (2 ** attempt)) * random.uniform(0.5, 1.0)
+    return min(MAX_RETRY_DELAY, max(delay, retry_after or 0))
+
+
+def _wake(waiter):
+    if not waiter.done():
+        waiter.set_result(None)
+
+
+class HostState:
+    """The AIMD window, latency and error rate of one host.
+
+    One state is shared by every sync of a launcher, and concurrent syncs
+    each run their own event loop on their own thread, so everything is
+    guarded by a lock and a parked request is woken on the loop it waits on.
+    """
+
+    def __init__(self, host, limit=INITIAL_LIMIT, minimum=MIN_LIMIT, maximum=MAX_LIMIT):
+        self.host = host
+        self.limit = float(limit)
+        self.minimum = minimum
+        self.maximum = maximum
+        self.in_flight = 0
+        self.blocked_until = 0.0
+        self.decreased_at = 0.0
+        self.latency = None     # EWMA of seconds per KiB
+        self.best = None
+        self.error_rate = 0.0   # EWMA of failures per request
+        self.requests = 0
+        self.errors = 0
+        self._lock = threading.Lock()
+        self._waiters = collections.deque()     # (loop, future)
+
+    @property
+    def capacity(self):
+        return max(self.minimum, int(self.limit))
+
+    async def acquire(self):
+        """Wait for a free slot in the window (and for any ``Retry-After`` to pass)."""
+        loop = asyncio.get_running_loop()
+        while True:
+            with self._lock:
+                wait = self.blocked_until - time.monotonic()
+                if wait <= 0:
+                    if self.in_flight < self.capacity:
+                        self.in_flight += 1
+                        return
+                    waiter = loop.create_future()
+                    self._waiters.append((loop, waiter))
+            if wait > 0:
+                await asyncio.sleep(wait)
+                continue
+            try:
+                await waiter
+            except asyncio.CancelledError:
+                with self._lock:
+                    try:
+                        self._waiters.remove((loop, waiter))
+                    except ValueError:
+                        self._wake_locked()     # it was woken already; pass the wake on
+                raise
+
+    def abandon(self):
+        """Give a slot back without judging the host (the request was cancelled)."""
+        with self._lock:
+            self.requests -= 1
+            self._release_locked()
+
+    def _release_locked(self):
+        self.in_flight -= 1
+        self.requests += 1
+        self._wake_locked()
+
+    def _wake_locked(self):
+        # Woken waiters re-check, so waking one too many is harmless
+        woken = 0
+        while self._waiters and woken < self.capacity - self.in_flight:
+            loop, waiter = self._waiters.popleft()
+            try:
+                loop.call_soon_threadsafe(_wake, waiter)
+            except RuntimeError:
+                continue    # that sync's loop has already closed
+            woken += 1
+
+    def success(self, seconds, size):
+        cost = seconds / max(size, _MIN_COST_BYTES) * 1024
+        with self._lock:
+            self.latency = cost if self.latency is None else self.latency + EWMA_WEIGHT * (cost - self.latency)
+            self.best = self.latency if self.best is None else min(self.best, self.latency)
+            self.error_rate *= 1 - EWMA_WEIGHT
+            if self.latency <= self.best * LATENCY_RISE:
+                self.limit = min(self.maximum, self.limit + 1 / self.limit)
+            self._release_locked()
+
+    def failure(self, error, started):
+        """Record a failed request that was sent at ``started`` (``time.monotonic()``)."""
+        with self._lock:
+            self.errors += 1
+            self.error_rate += EWMA_WEIGHT * (1 - self.error_rate)
+            # Requests already in flight when the window last shrank belong to the same burst; halve once per burst
+            if not is_permanent(error) and started >= self.decreased_at:
+                self.limit = max(self.minimum, self.limit * DECREASE)
+                self.decreased_at = time.monotonic()
+            retry_after = getattr(error, "retry_after", None)
+            if retry_after:
+                self.blocked_until = max(self.blocked_until, time.monotonic() + min(retry_after, MAX_RETRY_DELAY))
+            self._release_locked()
+
+    def stats(self):
+        with self._lock:
+            return {"limit": round(self.limit, 2), "requests": self.requests, "errors": self.errors,
+                    "error_rate": round(self.error_rate, 3),
+                    "ms_per_kib": None if self.latency is None else round(self.latency * 1000, 3)}
+
+
+class Scheduler:
+    """Per-host windows plus the retry policy, shared by every sync of a launcher so what was learned carries over.
+
+    ``initial``/``minimum``/``maximum`` bound each host's window; a failed
+    job is retried up to ``attempts`` times in all, after :func:`backoff`.
+    """
+
+    def __init__(self, initial=INITIAL_LIMIT, minimum=MIN_LIMIT, maximum=MAX_LIMIT, attempts=ATTEMPTS,
+                 retry_delay=RETRY_DELAY):
+        self.initial = initial
+        self.minimum = minimum
+        self.maximum = maximum
+        self.attempts = attempts
+        self.retry_delay = retry_delay
+        self._hosts = {}
+        self._lock = threading.Lock()
+
+    def host(self, host):
+        with self._lock:
+            state = self._hosts.get(host)
+            if state is None:
+                state = self._hosts[host] = HostState(host, self.initial, self.minimum, self.maximum)
+            return state
+
+    def retry_in(self, error, attempt):
+        """Seconds until attempt ``attempt + 1`` of a failed job, or None if it should not be retried.
+
+        A server asking to be left alone for longer than ``MAX_RETRY_DELAY``
+        fails the job now (a later sync retries it) rather than stalling this one.
+        """
+        retry_after = getattr(error, "retry_after", None)
+        if is_permanent(error) or attempt + 1 >= self.attempts or (retry_after or 0) > MAX_RETRY_DELAY:
+            return None
+        return backoff(attempt, retry_after, self.retry_delay)
+
+    def stats(self):
+        with self._lock:
+            return {host: state.stats() for host, state in self._hosts.items()}
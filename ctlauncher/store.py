@@ -0,0 +1,300 @@
+"""Content-addressed file store shared by launcher roots: one copy per SHA-1, linked into each root."""
+
+import os
+import re
+import shutil
+import sqlite3
+import stat
+import sys
+import threading
+
+from .net import sha1_file
+
+try:
+    import fcntl
+except ImportError:     # Windows
+    fcntl = None
+
+STORE_ENV = "CTLAUNCHER_STORE"
+DEFAULT_STORE = os.path.expanduser("~/.ctlauncher-store")
+# Only immutable artifacts: version JSONs, asset indexes, java/runtimes.json and runtime trees get rewritten,
+# and must not become read-only inodes shared with other roots
+IMPORT_DIRS = ("libraries", os.path.join("assets", "objects"), "versions")
+SKIP_SUFFIXES = (".part", ".part.json", ".tmp")
+FLUSH_EVERY = 500
+FICLONE = 0x40049409    # linux/fs.h: _IOW(0x94, 9, int)
+
+_TMP = ".store.tmp"
+_SHA1_RE = re.compile(r"[0-9a-f]{40}")
+
+
+def _importable(top, dirpath, filename):
+    """Whether ``filename`` is an artifact the store may share: a library jar, an asset object or a client jar."""
+    name = os.path.basename(top)
+    if name == "objects":
+        return bool(_SHA1_RE.fullmatch(filename)) and os.path.basename(dirpath) == filename[:2]
+    if name == "versions":
+        # versions/<id>/<id>.jar; the JSON next to it is metadata
+        return os.path.dirname(dirpath) == top and filename == os.path.basename(dirpath) + ".jar"
+    return filename.endswith(".jar")
+
+
+def _reflink(src, dest):
+    if fcntl is None or not sys.platform.startswith("linux"):
+        raise OSError("reflinks are not supported here")
+    with open(src, "rb") as s, open(dest, "wb") as d:
+        try:
+            fcntl.ioctl(d.fileno(), FICLONE, s.fileno())
+        except OSError:
+            d.close()
+            os.remove(dest)
+            raise
+
+
+def _read_only(path):
+    # Objects are shared by every root linking them; keep them from being edited in place.
+    # (Not on Windows, where read-only files cannot be replaced or deleted.)
+    if os.name != "nt":
+        mode = os.stat(path).st_mode
+        os.chmod(path, stat.S_IMODE(mode) & ~(stat.S_IWUSR | stat.S_IWGRP | stat.S_IWOTH))
+
+
+class ContentStore:
+    """Files keyed by SHA-1 under ``root/objects/<hh>/<sha1>``, referenced from any number of launcher roots.
+
+    A reference is a file inside a root with the object's content: a
+    hardlink when root and store share a filesystem, else a reflink where
+    the filesystem supports it, else a plain copy. References are recorded
+    (path, size, mtime, inode) in ``root/refs.sqlite3``; :meth:`gc` drops the
+    ones whose file was deleted or replaced and removes objects nobody
+    references any more. Objects are read-only, and roots only ever replace
+    files (downloads rename into place), so an object never changes under
+    another root. Several launcher processes may share one store; a race
+    between ``gc`` and a concurrent adopt can only cost dedup, not data.
+    Safe to call from worker threads.
+    """
+
+    def __init__(self, root=DEFAULT_STORE):
+        self.root = root
+        self.objects_dir = os.path.join(root, "objects")
+        self.modes = {"hardlink": 0, "reflink": 0, "copy": 0}
+        self._lock = threading.Lock()
+        self._pending = {}
+        os.makedirs(self.objects_dir, exist_ok=True)
+        self._db = sqlite3.connect(os.path.join(root, "refs.sqlite3"), check_same_thread=False, timeout=30)
+        self._db.execute("CREATE TABLE IF NOT EXISTS refs ("
+                         "path TEXT PRIMARY KEY, sha1 TEXT NOT NULL, size INTEGER NOT NULL, "
+                         "mtime_ns INTEGER NOT NULL, ino INTEGER NOT NULL)")
+        self._db.execute("CREATE INDEX IF NOT EXISTS refs_sha1 ON refs (sha1)")
+        self._refs = {row[0]: row[1:] for row in
+                      self._db.execute("SELECT path, sha1, size, mtime_ns, ino FROM refs")}
+
+    @classmethod
+    def from_env(cls):
+        """The store named by ``$CTLAUNCHER_STORE``, or None when it is unset."""
+        root = os.environ.get(STORE_ENV)
+        return cls(os.path.expanduser(root)) if root else None
+
+    def object_path(self, sha1):
+        sha1 = sha1.lower()
+        return os.path.join(self.objects_dir, sha1[:2], sha1)
+
+    def has(self, sha1):
+        return os.path.exists(self.object_path(sha1))
+
+    def _link(self, src, dest, copy=True):
+        """Put ``src``'s content at ``dest`` (atomically replacing it); returns the mode used.
+
+        With ``copy=False`` nothing happens (and None is returned) when the
+        content cannot be shared.
+        """
+        temp = dest + _TMP
+        try:
+            os.remove(temp)
+        except FileNotFoundError:
+            pass
+        try:
+            os.link(src, temp)
+            mode = "hardlink"
+        except OSError:
+            try:
+                _reflink(src, temp)
+                mode = "reflink"
+            except OSError:
+                if not copy:
+                    return None
+                shutil.copyfile(src, temp)
+                mode = "copy"
+            # Private copies stay writable like any other file in the root
+            os.chmod(temp, stat.S_IMODE(os.stat(src).st_mode) | stat.S_IWUSR)
+        os.replace(temp, dest)
+        with self._lock:
+            self.modes[mode] += 1
+        return mode
+
+    def materialize(self, sha1, dest):
+        """Link object ``sha1`` to ``dest``; returns the mode, or None if the store does not have it."""
+        src = self.object_path(sha1)
+        if not os.path.exists(src):
+            return None
+        os.makedirs(os.path.dirname(dest), exist_ok=True)
+        try:
+            mode = self._link(src, dest)
+        except FileNotFoundError:
+            return None     # collected between the check and the link
+        self._record(dest, sha1)
+        return mode
+
+    def adopt(self, path, sha1):
+        """Move a verified file into the store, or replace it with a link if the store already has it.
+
+        Returns the number of bytes this saved (0 when ``path`` became the
+        object itself).
+        """
+        sha1 = sha1.lower()
+        obj = self.object_path(sha1)
+        src_stat = os.stat(path)
+        if not os.path.exists(obj):
+            os.makedirs(os.path.dirname(obj), exist_ok=True)
+            try:
+                os.link(path, obj)
+                _read_only(obj)
+                self._record(path, sha1)
+                return 0
+            except FileExistsError:
+                pass    # another process adopted the same content first
+            except OSError:
+                # Store on another filesystem: keep a private copy of our own
+                temp = f"{obj}.{os.getpid()}.{threading.get_ident()}{_TMP}"
+                shutil.copyfile(path, temp)
+                shutil.copymode(path, temp)
+                _read_only(temp)
+                os.replace(temp, obj)
+        obj_stat = os.stat(obj)
+        if (obj_stat.st_dev, obj_stat.st_ino) == (src_stat.st_dev, src_stat.st_ino):
+            self._record(path, sha1)
+            return 0
+        mode = self._link(obj, path, copy=False)
+        self._record(path, sha1)
+        return src_stat.st_size if mode else 0
+
+    def is_referenced(self, path):
+        """Whether ``path`` was linked from or adopted into the store (as far as this process knows)."""
+        with self._lock:
+            return os.path.abspath(path) in self._refs
+
+    def _record(self, path, sha1):
+        path = os.path.abspath(path)
+        st = os.stat(path)
+        entry = (sha1.lower(), st.st_size, st.st_mtime_ns, st.st_ino)
+        with self._lock:
+            self._refs[path] = entry
+            self._pending[path] = entry
+            if len(self._pending) >= FLUSH_EVERY:
+                self._flush_locked()
+
+    def _is_current(self, path, entry):
+        try:
+            st = os.stat(path)
+        except OSError:
+            return False
+        return entry[1:] == (st.st_size, st.st_mtime_ns, st.st_ino)
+
+    def refcount(self, sha1):
+        """Live references to ``sha1`` recorded by any process (after flushing ours)."""
+        self.flush()
+        rows = self._db.execute("SELECT path, sha1, size, mtime_ns, ino FROM refs WHERE sha1 = ?",
+                                (sha1.lower(),)).fetchall()
+        return sum(self._is_current(row[0], row[1:]) for row in rows)
+
+    def import_tree(self, root, dirs=IMPORT_DIRS, on_file=None):
+        """Dedupe an existing launcher root into the store in one pass over its files.
+
+        Library jars, asset objects and client jars under ``root/<dir>`` are
+        hashed once (files already referenced and unchanged are skipped
+        without reading) and adopted; an asset object whose content does not
+        match its name is left alone.
+        ``on_file(path, saved)`` is called per adopted file. Returns
+        ``{"files", "skipped", "bytes", "saved"}``.
+        """
+        stats = {"files": 0, "skipped": 0, "bytes": 0, "saved": 0}
+        for name in dirs:
+            top = os.path.join(root, name)
+            for dirpath, dirnames, filenames in os.walk(top):
+                # Dot entries are in-progress work (runtime staging dirs, archives being downloaded)
+                dirnames[:] = sorted(d for d in dirnames if not d.startswith("."))
+                for filename in sorted(filenames):
+                    path = os.path.abspath(os.path.join(dirpath, filename))
+                    if (filename.startswith(".") or filename.endswith(SKIP_SUFFIXES) or os.path.islink(path)
+                            or not _importable(top, dirpath, filename)):
+                        continue
+                    with self._lock:
+                        entry = self._refs.get(path)
+                    if entry is not None and self._is_current(path, entry) and self.has(entry[0]):
+                        stats["skipped"] += 1
+                        continue
+                    try:
+                        sha1 = sha1_file(path)
+                        if os.path.basename(top) == "objects" and sha1 != filename:
+                            continue    # corrupt; the next sync replaces it
+                        saved = self.adopt(path, sha1)
+                    except OSError:
+                        continue    # vanished or unreadable: leave it alone
+                    stats["files"] += 1
+                    stats["bytes"] += os.path.getsize(path)
+                    stats["saved"] += saved
+                    if on_file:
+                        on_file(path, saved)
+        self.flush()
+        return stats
+
+    def gc(self, dry_run=False):
+        """Drop stale references and remove unreferenced objects.
+
+        Returns ``{"refs", "dropped", "objects", "removed", "freed"}``.
+        """
+        self.flush()
+        rows = self._db.execute("SELECT path, sha1, size, mtime_ns, ino FROM refs").fetchall()
+        live, stale = set(), []
+        for row in rows:
+            if self._is_current(row[0], row[1:]):
+                live.add(row[1])
+            else:
+                stale.append(row[0])
+        result = {"refs": len(rows) - len(stale), "dropped": len(stale), "objects": 0, "removed": 0, "freed": 0}
+        for dirpath, _, filenames in os.walk(self.objects_dir):
+            for filename in filenames:
+                path = os.path.join(dirpath, filename)
+                result["objects"] += 1
+                if filename in live:
+                    continue
+                result["removed"] += 1
+                try:
+                    result["freed"] += os.path.getsize(path)
+                    if not dry_run:
+                        os.remove(path)
+                except OSError:
+                    pass
+        if not dry_run and stale:
+            with self._lock, self._db:
+                self._db.executemany("DELETE FROM refs WHERE path = ?", [(path,) for path in stale])
+                for path in stale:
+                    self._refs.pop(path, None)
+        return result
+
+    def flush(self):
+        with self._lock:
+            self._flush_locked()
+
+    def _flush_locked(self):
+        if not self._pending:
+            return
+        with self._db:
+            self._db.executemany("INSERT OR REPLACE INTO refs (path, sha1, size, mtime_ns, ino) "
+                                 "VALUES (?, ?, ?, ?, ?)",
+                                 [(path,) + entry for path, entry in self._pending.items()])
+        self._pending.clear()
+
+    def close(self):
+        self.flush()
+        self._db.close()
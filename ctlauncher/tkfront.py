@@ -0,0 +1,236 @@
+"""Glue shared by the Tk front ends: status log, version manifest, downloads and launching.
+
+Downloads, rules, caches and the command line are shared with the other
+launchers and the CLI through :class:`~ctlauncher.core.LauncherCore`; a front
+end mixes :class:`TkFrontEnd` into its ``tk.Tk`` window and only lays out its
+widgets. This is the one module of the package that imports tkinter, so it is
+not among the lazy exports of :mod:`ctlauncher`.
+"""
+
+import os
+import subprocess
+import threading
+import tkinter as tk
+from tkinter import messagebox
+
+from .core import LauncherCore
+from .logview import LogView
+from .manifest import VersionIndex
+from .net import DownloadError
+from .prefetch import PREFETCH_RATE, Prefetcher, RecentVersions
+from .progress import ProgressBus, rotating_log
+
+
+class TkFrontEnd:
+    """Mixin for a ``tk.Tk`` launcher window; list it before ``tk.Tk`` in the bases.
+
+    ``init_launcher`` sets up the core, the progress bus and the idle
+    prefetcher. The window's ``init_ui`` creates ``category_combo``,
+    ``version_combo``, ``username_input``, ``ram_scale`` and
+    ``progress_label``, calls ``build_status_log`` and then
+    ``load_version_manifest``; its play button calls ``prepare_and_launch``.
+    """
+
+    ERROR_TITLE = "CTLauncher Error"
+    # Where the game's stdout/stderr go; DEVNULL rather than an unread PIPE, which can block the game
+    GAME_OUTPUT = subprocess.DEVNULL
+    # Refuse to launch when assets failed; otherwise log it and launch anyway
+    STRICT_ASSETS = True
+
+    def init_launcher(self, root, log_file, manifest_url, user_agent, timeout, deep_verify=False,
+                      prefetch_rate=PREFETCH_RATE):
+        """Create the core, the status channel and the background prefetcher for launcher dir ``root``."""
+        self.log_file = log_file
+        self.bus = ProgressBus(rotating_log(log_file))
+        self.core = LauncherCore(root, log=self.log_status, on_progress=self.report_progress,
+                                 deep_verify=deep_verify, user_agent=user_agent, timeout=timeout,
+                                 verify=False, manifest_url=manifest_url)
+        self.recent_versions = RecentVersions(os.path.join(root, "cache", "recent_versions.json"))
+        self.prefetcher = Prefetcher(self.core.downloader, self.core.prefetch_jobs, rate=prefetch_rate,
+                                     is_current=self.core.is_current,
+                                     log=lambda message: self.bus.log(f"⚠️ {message}"))
+        self.version_index = VersionIndex({})
+        self.version_categories = self.version_index.categories()
+
+    def build_status_log(self, parent, theme):
+        """Pack the log search box and the status text area into ``parent``."""
+        # Enter searches the full log history; an empty search returns to the live tail
+        self.log_search = tk.Entry(parent, bg=theme['input_bg'], fg=theme['text'],
+                                   insertbackground=theme['text'], bd=0)
+        self.log_search.pack(fill="x", pady=(5, 0))
+        self.log_search.bind("<Return>", lambda event: self.log_view.search(self.log_search.get()))
+
+        self.status_text = tk.Text(parent, bg=theme['input_bg'], fg=theme['text'],
+                                   wrap=tk.WORD, width=50, height=15, bd=0)
+        self.status_text.pack(fill="both", expand=True, pady=(10, 0))
+        self.status_text.config(state=tk.DISABLED)
+        self.log_view = LogView(self.status_text, history_path=self.log_file)  # bounded; older lines stay in the file
+
+    def log_status(self, message):
+        """Queue a message for the status text area (safe from any thread)."""
+        self.bus.log(message)
+        # Downloads run on the Tk thread, so the timer cannot fire meanwhile: render from here too
+        self.bus.poll()
+
+    def render_status(self, lines):
+        """Append queued messages to the status text area in one insert."""
+        self.log_view.append(lines)
+        self.update_idletasks()
+
+    def render_progress(self, text):
+        """Show the aggregated file / byte / rate counters."""
+        self.progress_label.config(text=text)
+        self.update_idletasks()
+
+    def report_progress(self, progress):
+        """Show a sync's aggregated counters; called on the Tk thread while the sync runs."""
+        self.bus.progress(progress.done, progress.total, progress.bytes, len(progress.failed))
+        self.bus.poll()
+
+    def update_version_list(self, event=None):
+        """Update the version list based on selected category."""
+        category = self.category_combo.get()
+        if self.version_categories[category]:
+            self.version_combo['values'] = self.version_categories[category]
+            self.version_combo.current(0)
+
+    def load_version_manifest(self):
+        """Load the list of available Minecraft versions (cached copy first, then revalidate)."""
+        cached = self.core.manifest_cache.cached()
+        if cached:
+            self.apply_version_manifest(cached)
+            self.log_status("✅ Version manifest loaded from cache, checking for updates...")
+        else:
+            self.log_status("📡 Loading version manifest...")
+        threading.Thread(target=self.refresh_version_manifest, daemon=True).start()
+
+    def refresh_version_manifest(self):
+        """Revalidate the manifest in the background with If-None-Match / If-Modified-Since."""
+        try:
+            manifest, changed = self.core.manifest_cache.refresh()
+        except Exception as e:
+            self.after(0, self.manifest_refresh_failed, e)
+            return
+        if changed:
+            self.after(0, self.apply_version_manifest, manifest)
+            self.after(0, self.log_status, "✅ Version manifest loaded successfully!")
+
+    def manifest_refresh_failed(self, error):
+        """Keep the cached list when offline; only complain if there is nothing to show."""
+        if self.core.manifest_cache.cached():
+            self.log_status(f"⚠️ Offline, using cached version manifest ({error})")
+            return
+        self.log_status(f"❌ Error loading version manifest: {error}")
+        messagebox.showerror(self.ERROR_TITLE, f"Failed to load version manifest: {str(error)}")
+
+    def apply_version_manifest(self, manifest):
+        """Index a parsed manifest and show its categories."""
+        self.version_index = self.core.version_index = VersionIndex(manifest)
+        self.version_categories = self.version_index.categories()
+        self.update_version_list()
+        # While idle, fetch what the next launch will most likely need
+        self.prefetcher.add(self.version_index.latest.get("release"), *self.recent_versions.list())
+
+    def install_java_if_needed(self, major=21):
+        """Make sure a Java ``major`` runtime is installed; each major version gets its own directory."""
+        if self.core.runtimes.find(major):
+            self.log_status(f"✅ Java {major} is already installed!")
+            return True
+
+        self.log_status(f"⬇️ Installing OpenJDK {major}...")
+        try:
+            self.core.runtimes.install(major, log=self.log_status)
+        except Exception as e:
+            self.log_status(f"❌ Failed to install Java {major}: {e}")
+            messagebox.showerror(self.ERROR_TITLE, f"Failed to install Java {major}: {str(e)}")
+            return False
+
+        self.log_status(f"✅ Java {major} installed locally!")
+        return True
+
+    def download_version_files(self, version_id):
+        """Download the version JSON, JAR, libraries, natives and assets."""
+        self.log_status(f"⬇️ Downloading version files for {version_id}...")
+        try:
+            result = self.core.sync(version_id)
+        except DownloadError as e:  # the version JSON or the client JAR
+            self.log_status(f"❌ {e}")
+            messagebox.showerror(self.ERROR_TITLE, f"Failed to download version {version_id}: {str(e)}")
+            return False
+        except (OSError, ValueError, KeyError) as e:
+            self.log_status(f"❌ Failed to read version JSON: {e}")
+            messagebox.showerror(self.ERROR_TITLE, f"Cannot read version {version_id} JSON: {str(e)}")
+            return False
+
+        assets_failed = 0
+        for job, error in result.failed:
+            if job.name.startswith(("library ", "native ")):
+                self.log_status(f"⚠️ Failed to download {job.name}, continuing...")
+            else:
+                assets_failed += 1
+                self.bus.detail(f"⚠️ Error downloading asset {job.name}: {error}")
+
+        self.log_status(f"✅ {result.done} files ready ({result.downloaded} downloaded), {assets_failed} assets failed")
+        if assets_failed > 0:
+            if not self.STRICT_ASSETS:
+                self.log_status("⚠️ Some assets failed to download, but continuing...")
+                return True
+            messagebox.showwarning("CTLauncher Warning",
+                                   f"Failed to download {assets_failed} assets. The game may not run correctly.")
+            return False
+
+        self.log_status("✅ Download complete! Ready to play!")
+        return True
+
+    def build_launch_command(self, version, username, ram):
+        """Construct the command to launch Minecraft from the cached launch plan."""
+        try:
+            plan = self.core.launch_plan(version)
+        except Exception as e:
+            self.log_status(f"❌ Failed to read version JSON: {e}")
+            messagebox.showerror(self.ERROR_TITLE, f"Cannot read version {version} JSON: {str(e)}")
+            return []
+
+        java_major = plan["java_major"]
+        if not self.install_java_if_needed(java_major):
+            return []
+        return self.core.command(version, username, ram, self.core.runtimes.find(java_major), plan=plan)
+
+    def prepare_and_launch(self):
+        """Wrapper function to handle setup before launching."""
+        # The Java runtime is installed once the version's javaVersion is known (build_launch_command)
+        self.prefetcher.pause()  # a launch gets the whole connection; partial prefetches are resumed
+        try:
+            self.download_and_launch()
+        finally:
+            self.prefetcher.resume()
+
+    def download_and_launch(self):
+        """Handle the download and launch process."""
+        version = self.version_combo.get()
+        if not version:
+            messagebox.showerror(self.ERROR_TITLE, "No version selected.")
+            return
+
+        username = self.username_input.get() or "Player"
+        ram = int(self.ram_scale.get())
+        if version not in self.version_index:
+            messagebox.showerror(self.ERROR_TITLE, f"Version {version} URL not found.")
+            return
+
+        if not self.download_version_files(version):
+            return
+
+        launch_cmd = self.build_launch_command(version, username, ram)
+        if not launch_cmd:
+            return
+        self.recent_versions.touch(version)
+
+        self.log_status("🚀 Launching Minecraft...")
+        self.log_status("Have fun gaming!")
+
+        try:
+            subprocess.Popen(launch_cmd, stdout=self.GAME_OUTPUT, stderr=self.GAME_OUTPUT)
+        except Exception as e:
+            self.log_status(f"❌ Failed to launch Minecraft: {e}")
+            messagebox.showerror(self.ERROR_TITLE, f"Failed to launch Minecraft: {str(e)}")
@@ -0,0 +1,92 @@
+"""Persistent record of files whose SHA-1 has been verified, keyed by path and stat."""
+
+import os
+import sqlite3
+import threading
+
+from .net import sha1_file
+
+FLUSH_EVERY = 500
+
+
+class VerifiedIndex:
+    """Skip re-hashing files whose size and mtime are unchanged since they were verified.
+
+    Entries are loaded into memory once; new verifications are written back in
+    batches. ``deep=True`` ignores recorded entries and re-hashes every file
+    (the ``--deep-verify`` escape hatch), refreshing the index as it goes.
+    Safe to call from worker threads.
+    """
+
+    def __init__(self, db_path, deep=False):
+        self.db_path = db_path
+        self.deep = deep
+        self.hits = 0
+        self.hashed = 0
+        self._lock = threading.Lock()
+        self._pending = {}
+        os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        self._db = sqlite3.connect(db_path, check_same_thread=False)
+        self._db.execute("CREATE TABLE IF NOT EXISTS verified ("
+                         "path TEXT PRIMARY KEY, size INTEGER NOT NULL, "
+                         "mtime_ns INTEGER NOT NULL, sha1 TEXT NOT NULL)")
+        self._entries = {row[0]: row[1:] for row in
+                         self._db.execute("SELECT path, size, mtime_ns, sha1 FROM verified")}
+
+    def verify(self, path, sha1):
+        """True if ``path`` exists and has SHA-1 ``sha1``; hashes only when the stat changed."""
+        path = os.path.abspath(path)
+        sha1 = sha1.lower()
+        try:
+            st = os.stat(path)
+        except OSError:
+            return False
+        if not self.deep:
+            with self._lock:
+                if self._entries.get(path) == (st.st_size, st.st_mtime_ns, sha1):
+                    self.hits += 1
+                    return True
+        try:
+            actual = sha1_file(path)
+        except OSError:
+            return False
+        with self._lock:
+            self.hashed += 1
+        if actual != sha1:
+            return False
+        self._store(path, st, sha1)
+        return True
+
+    def record(self, path, sha1):
+        """Remember a file that was just written and verified (e.g. by a download)."""
+        path = os.path.abspath(path)
+        try:
+            st = os.stat(path)
+        except OSError:
+            return
+        self._store(path, st, sha1.lower())
+
+    def _store(self, path, st, sha1):
+        entry = (st.st_size, st.st_mtime_ns, sha1)
+        with self._lock:
+            self._entries[path] = entry
+            self._pending[path] = entry
+            if len(self._pending) >= FLUSH_EVERY:
+                self._flush_locked()
+
+    def flush(self):
+        with self._lock:
+            self._flush_locked()
+
+    def _flush_locked(self):
+        if not self._pending:
+            return
+        with self._db:
+            self._db.executemany("INSERT OR REPLACE INTO verified (path, size, mtime_ns, sha1) "
+                                 "VALUES (?, ?, ?, ?)",
+                                 [(path,) + entry for path, entry in self._pending.items()])
+        self._pending.clear()
+
+    def close(self):
+        self.flush()
+        self._db.close()
@@ -0,0 +1,88 @@
+"""Resumable downloads: ``.part`` files, their journal, and ``Range`` / ``If-Range`` on the next attempt.
+
+Run with ``python -m unittest discover tests`` from the repository root.
+"""
+
+import hashlib
+import os
+import random
+import sys
+import tempfile
+import unittest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "benchmarks"))
+
+from ctlauncher.net import ChecksumError, Downloader, DownloadError  # noqa: E402
+from localcdn import LocalCDN  # noqa: E402
+
+MIB = 1 << 20
+
+
+class ResumeTest(unittest.TestCase):
+    def setUp(self):
+        self.body = random.Random(0).randbytes(3 * MIB)
+        self.sha1 = hashlib.sha1(self.body).hexdigest()
+        self.cdn = LocalCDN(tls=False).start()
+        self.addCleanup(self.cdn.stop)
+        self.url = self.cdn.add("/client.jar", self.body)
+        self.downloader = Downloader()
+        self.addCleanup(self.downloader.close)
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.path = os.path.join(tmp.name, "client.jar")
+
+    def interrupted_fetch(self, sent=MIB, sha1=True):
+        self.cdn.drop_after["/client.jar"] = sent
+        with self.assertRaises(DownloadError):
+            self.downloader.fetch(self.url, self.path, self.sha1 if sha1 else None, len(self.body))
+        self.assertFalse(os.path.exists(self.path))
+        self.assertEqual(os.path.getsize(self.path + ".part"), sent)
+        self.assertTrue(os.path.exists(self.path + ".part.json"))
+        self.cdn.reset_counters()
+
+    def assert_installed(self, body):
+        with open(self.path, "rb") as f:
+            self.assertEqual(f.read(), body)
+        self.assertFalse(os.path.exists(self.path + ".part"))
+        self.assertFalse(os.path.exists(self.path + ".part.json"))
+
+    def test_retry_fetches_only_the_missing_bytes(self):
+        self.interrupted_fetch()
+        size = self.downloader.fetch(self.url, self.path, self.sha1, len(self.body))
+        self.assertEqual(size, len(self.body))
+        self.assertEqual(self.cdn.bytes_sent, 2 * MIB)
+        self.assert_installed(self.body)
+
+    def test_changed_file_is_fetched_whole(self):
+        # No checksum to tell the versions apart: only If-Range protects the part
+        self.interrupted_fetch(sha1=False)
+        body = random.Random(1).randbytes(len(self.body))
+        self.cdn.files["/client.jar"] = body
+        self.downloader.fetch(self.url, self.path, None, len(body))
+        self.assertEqual(self.cdn.bytes_sent, len(body))
+        self.assert_installed(body)
+
+    def test_corrupt_part_is_discarded(self):
+        self.interrupted_fetch()
+        with open(self.path + ".part", "r+b") as f:
+            f.write(b"\0" * 16)
+        with self.assertRaises(ChecksumError):
+            self.downloader.fetch(self.url, self.path, self.sha1, len(self.body))
+        self.assertFalse(os.path.exists(self.path + ".part"))
+        self.downloader.fetch(self.url, self.path, self.sha1, len(self.body))
+        self.assert_installed(self.body)
+
+    def test_part_for_another_checksum_is_not_resumed(self):
+        self.interrupted_fetch()
+        body = random.Random(2).randbytes(len(self.body))
+        self.cdn.files["/client.jar"] = body
+        # The journal names the old SHA-1, so the old bytes are dropped before any request
+        self.downloader.fetch(self.url, self.path, hashlib.sha1(body).hexdigest(), len(body))
+        self.assertEqual(self.cdn.bytes_sent, len(body))
+        self.assert_installed(body)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,70 @@
+"""Scheduler regressions: state shared by syncs that run at the same time, Retry-After handling.
+
+Run with ``python -m unittest discover tests`` from the repository root.
+"""
+
+import os
+import sys
+import tempfile
+import threading
+import time
+import unittest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "benchmarks"))
+
+from ctlauncher.assetsync import AssetSync, asset_jobs  # noqa: E402
+from ctlauncher.net import Downloader, HTTPError  # noqa: E402
+from ctlauncher.scheduler import MAX_RETRY_DELAY, HostState, Scheduler, backoff  # noqa: E402
+from localcdn import LocalCDN, add_asset_index  # noqa: E402
+
+TIMEOUT = 30
+
+
+class ConcurrentSyncTest(unittest.TestCase):
+    def test_two_syncs_share_one_scheduler(self):
+        # Each AssetSync.run() has its own event loop; parked requests must be woken on theirs
+        scheduler = Scheduler(initial=1, maximum=2)
+        results = {}
+        with LocalCDN(tls=False, latency=0.002) as cdn, tempfile.TemporaryDirectory() as root:
+            objects = add_asset_index(cdn, 200, min_size=64, max_size=256)["objects"]
+            downloader = Downloader()
+
+            def sync(name):
+                jobs = list(asset_jobs(objects, os.path.join(root, name), cdn.base_url))
+                results[name] = AssetSync(downloader, concurrency=8, scheduler=scheduler).run(jobs)
+
+            threads = [threading.Thread(target=sync, args=(name,), daemon=True) for name in ("a", "b")]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join(TIMEOUT)
+            self.assertFalse(any(thread.is_alive() for thread in threads), "a sync hung")
+            downloader.close()
+            host = scheduler.host(cdn.base_url.split("://", 1)[1])
+        for name in ("a", "b"):
+            self.assertTrue(results[name].ok, results[name].failed)
+            self.assertEqual(results[name].downloaded, len(objects))
+        self.assertEqual(host.in_flight, 0)
+
+
+class RetryAfterTest(unittest.TestCase):
+    def test_long_retry_after_fails_the_job_instead_of_waiting(self):
+        error = HTTPError("HTTP 429 Too Many Requests", 429, retry_after=3600)
+        self.assertIsNone(Scheduler().retry_in(error, 0))
+
+    def test_retry_after_within_the_cap_is_honoured(self):
+        error = HTTPError("HTTP 503 Service Unavailable", 503, retry_after=5)
+        self.assertGreaterEqual(Scheduler(retry_delay=0.01).retry_in(error, 0), 5)
+
+    def test_backoff_and_host_block_are_capped(self):
+        self.assertLessEqual(backoff(0, retry_after=3600), MAX_RETRY_DELAY)
+        host = HostState("example.com")
+        host.in_flight = 1
+        host.failure(HTTPError("HTTP 503 Service Unavailable", 503, retry_after=3600), 0.0)
+        self.assertLessEqual(host.blocked_until - time.monotonic(), MAX_RETRY_DELAY)
+
+
+if __name__ == "__main__":
+    unittest.main()
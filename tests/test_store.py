@@ -0,0 +1,105 @@
+"""Content store: importing launcher roots, dedupe across roots, reference counts and garbage collection.
+
+Run with ``python -m unittest discover tests`` from the repository root.
+"""
+
+import hashlib
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from ctlauncher.store import ContentStore  # noqa: E402
+
+LIBRARY = b"library jar"
+CLIENT = b"client jar"
+ASSET = b"asset object"
+ASSET_SHA1 = hashlib.sha1(ASSET).hexdigest()
+METADATA = ("versions/1.0/1.0.json", "java/runtimes.json", "assets/indexes/1.json")
+
+
+def _write(root, relpath, data):
+    path = os.path.join(root, *relpath.split("/"))
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(data)
+    return path
+
+
+class StoreTest(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.tmp = tmp.name
+        self.store = ContentStore(os.path.join(self.tmp, "store"))
+        self.addCleanup(self.store.close)
+
+    def make_root(self, name):
+        root = os.path.join(self.tmp, name)
+        _write(root, "libraries/org/example/lib/1.0/lib-1.0.jar", LIBRARY)
+        _write(root, "versions/1.0/1.0.jar", CLIENT)
+        _write(root, f"assets/objects/{ASSET_SHA1[:2]}/{ASSET_SHA1}", ASSET)
+        for relpath in METADATA:
+            _write(root, relpath, b"{}")
+        return root
+
+    def test_import_adopts_only_immutable_artifacts(self):
+        root = self.make_root("a")
+        stats = self.store.import_tree(root)
+        self.assertEqual(stats["files"], 3)
+        self.assertEqual(stats["bytes"], len(LIBRARY) + len(CLIENT) + len(ASSET))
+        for data in (LIBRARY, CLIENT, ASSET):
+            self.assertTrue(self.store.has(hashlib.sha1(data).hexdigest()))
+        for relpath in METADATA:
+            path = os.path.join(root, *relpath.split("/"))
+            self.assertFalse(self.store.is_referenced(path), relpath)
+            self.assertTrue(os.access(path, os.W_OK), relpath)
+
+    def test_misnamed_asset_object_is_left_alone(self):
+        root = os.path.join(self.tmp, "a")
+        path = _write(root, f"assets/objects/{ASSET_SHA1[:2]}/{ASSET_SHA1}", b"truncated")
+        self.assertEqual(self.store.import_tree(root)["files"], 0)
+        self.assertFalse(self.store.is_referenced(path))
+
+    def test_second_root_is_linked_to_the_same_objects(self):
+        a, b = self.make_root("a"), self.make_root("b")
+        self.assertEqual(self.store.import_tree(a)["saved"], 0)
+        stats = self.store.import_tree(b)
+        self.assertEqual(stats["saved"], len(LIBRARY) + len(CLIENT) + len(ASSET))
+        relpath = ("versions", "1.0", "1.0.jar")
+        self.assertTrue(os.path.samefile(os.path.join(a, *relpath), os.path.join(b, *relpath)))
+        self.assertEqual(self.store.refcount(hashlib.sha1(CLIENT).hexdigest()), 2)
+
+    def test_unchanged_files_are_skipped_on_reimport(self):
+        root = self.make_root("a")
+        self.store.import_tree(root)
+        stats = self.store.import_tree(root)
+        self.assertEqual((stats["files"], stats["skipped"]), (0, 3))
+
+    def test_gc_removes_objects_once_no_root_links_them(self):
+        a, b = self.make_root("a"), self.make_root("b")
+        self.store.import_tree(a)
+        self.store.import_tree(b)
+
+        shutil.rmtree(a)
+        result = self.store.gc()
+        self.assertEqual((result["dropped"], result["removed"]), (3, 0))
+        self.assertEqual(self.store.refcount(ASSET_SHA1), 1)
+
+        shutil.rmtree(b)
+        result = self.store.gc(dry_run=True)
+        self.assertEqual((result["dropped"], result["removed"]), (3, 3))
+        self.assertTrue(self.store.has(ASSET_SHA1))
+
+        result = self.store.gc()
+        self.assertEqual(result["freed"], len(LIBRARY) + len(CLIENT) + len(ASSET))
+        self.assertFalse(self.store.has(ASSET_SHA1))
+        self.assertEqual(self.store.gc()["refs"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()